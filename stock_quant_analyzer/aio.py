@@ -0,0 +1,174 @@
+# aio.py
+
+import asyncio
+import logging
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from config import ASYNC_DART_CONCURRENCY, ASYNC_KRX_CONCURRENCY, ASYNC_CPU_CONCURRENCY, ASYNC_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# 백엔드 이름 (세마포어 키). 여러 개를 잡을 때는 항상 이 순서로 잡아 교착을 막습니다.
+DART = "dart"
+KRX = "krx"
+CPU = "cpu"
+_ORDER = (DART, KRX, CPU)
+
+
+class AsyncAnalyzer:
+    """
+    블로킹 API(get_combined_data / find_corp_info / 지표·점수 계산)를 이벤트 루프를 막지 않고 호출하는 래퍼.
+    - 호출은 전용 스레드 풀에서 실행되고, 백엔드별 세마포어(dart/krx/cpu)로 동시 실행 수를 제한합니다.
+      대기 중인 호출은 스레드를 차지하지 않으므로 수천 개를 한 번에 띄워도 됩니다.
+    - timeout(초)은 세마포어 대기 시간을 포함하며, 넘으면 asyncio.TimeoutError.
+    - 취소·시간 초과 시 아직 시작하지 않은 작업은 실행되지 않습니다. 이미 실행 중인 블로킹 호출은 끝까지 돌고,
+      그동안 잡고 있던 슬롯은 실제로 끝난 뒤에 반납되어 한도가 지켜집니다.
+    세마포어는 처음 사용한 이벤트 루프에 묶이므로 루프마다 인스턴스를 따로 만드세요 (default_analyzer 참고).
+    get_combined_data 에 StatementStore 를 넘길 경우, 저장소가 스레드 안전하지 않으므로 dart=1 로 만드세요.
+    """
+
+    def __init__(
+        self,
+        dart: int = ASYNC_DART_CONCURRENCY,
+        krx: int = ASYNC_KRX_CONCURRENCY,
+        cpu: int = ASYNC_CPU_CONCURRENCY,
+        timeout: Optional[float] = ASYNC_TIMEOUT,
+    ):
+        self.limits = {DART: dart, KRX: krx, CPU: cpu}
+        self.timeout = timeout
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+        self._executor = ThreadPoolExecutor(max_workers=dart + krx + cpu, thread_name_prefix="aio")
+
+    def _sem(self, name: str) -> asyncio.Semaphore:
+        if name not in self._sems:
+            self._sems[name] = asyncio.Semaphore(self.limits[name])
+        return self._sems[name]
+
+    async def _call(self, backends: Iterable[str], fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """backends 슬롯을 잡고 fn 을 스레드 풀에서 실행합니다."""
+        return await asyncio.wait_for(
+            self._run(tuple(b for b in _ORDER if b in backends), functools.partial(fn, *args, **kwargs)),
+            self.timeout if timeout is None else timeout,
+        )
+
+    async def _run(self, backends: Tuple[str, ...], job: Callable) -> Any:
+        loop = asyncio.get_running_loop()
+        held = []
+        try:
+            for name in backends:
+                await self._sem(name).acquire()
+                held.append(name)
+        except BaseException:
+            for name in held:
+                self._sem(name).release()
+            raise
+
+        def release(_future) -> None:
+            # 작업 스레드에서 불리므로 루프 스레드로 넘겨 반납
+            for name in held:
+                try:
+                    loop.call_soon_threadsafe(self._sem(name).release)
+                except RuntimeError:   # 루프가 이미 닫힘
+                    pass
+
+        future = self._executor.submit(job)
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    # ------------------------------------------------------------------ #
+    async def find_corp_info(self, query: str, timeout: Optional[float] = None) -> dict:
+        from utils import find_corp_info
+        return await self._call((DART,), find_corp_info, query, timeout=timeout)
+
+    async def get_combined_data(self, code: str, year: int, timeout: Optional[float] = None, **kwargs) -> dict:
+        """get_combined_data 와 같은 인자. DART 와 KRX 를 모두 조회하므로 두 슬롯을 함께 잡습니다."""
+        from data_provider import get_combined_data
+        inputs = kwargs.get("inputs")
+        backends = (DART, KRX) if inputs is None or {"dart", "dart_prev"} & set(inputs) else (KRX,)
+        return await self._call(backends, get_combined_data, code, year, timeout=timeout, **kwargs)
+
+    async def score(
+        self, data: dict, only: Optional[Iterable[str]] = None, memo=None, timeout: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        get_combined_data 결과로 지표·점수를 계산합니다 (memo 가 주어지면 memo.Memo 로 재사용).
+        반환: {'metrics', 'score', 'comment', 'detail'}, 지표·점수 계산 실패 시 None.
+        """
+        return await self._call((CPU,), _score, data, only, memo, timeout=timeout)
+
+    async def analyze(self, symbol: str, year: int, timeout: Optional[float] = None, **kwargs) -> Optional[Dict]:
+        """종목명/코드 하나의 조회 → 수집 → 점수 (analyze.py 와 같은 흐름). 결과 저장소 행 형식으로 반환."""
+        from store import make_row
+        info = await self.find_corp_info(symbol, timeout=timeout)
+        if not info.get("corp_code"):
+            return None
+        data = await self.get_combined_data(info["corp_code"], year, timeout=timeout, **kwargs)
+        result = await self.score(data, timeout=timeout)
+        if result is None:
+            return None
+        return make_row(
+            info["corp_code"], year, result["metrics"], result["score"], result["comment"], result["detail"],
+            corp_name=info.get("corp_name"),
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _score(data: dict, only, memo) -> Optional[Dict[str, Any]]:
+    if memo is not None:
+        metrics = memo.metrics(data["dart"], data["price"], data["pykrx"], only=only)
+    else:
+        from metrics import calculate_metrics
+        metrics = calculate_metrics(data["dart"], data["price"], data["pykrx"], only=only)
+    if not metrics:
+        return None
+    if memo is not None:
+        result = memo.score(metrics)
+    else:
+        from scorer import calculate_score
+        result = calculate_score(metrics)
+    if not result or result[0] is None:
+        return None
+    score, comment, detail = result
+    return {"metrics": metrics, "score": score, "comment": comment, "detail": detail}
+
+
+# ---------------------------------------------------------------------- #
+# 모듈 수준 API (실행 중인 이벤트 루프마다 AsyncAnalyzer 하나)
+# ---------------------------------------------------------------------- #
+_analyzers: Dict[asyncio.AbstractEventLoop, AsyncAnalyzer] = {}
+_lock = threading.Lock()
+
+
+def default_analyzer() -> AsyncAnalyzer:
+    """현재 이벤트 루프의 공유 AsyncAnalyzer (config 의 ASYNC_* 한도)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        for other in [l for l in _analyzers if l.is_closed()]:
+            _analyzers.pop(other).close()
+        if loop not in _analyzers:
+            _analyzers[loop] = AsyncAnalyzer()
+        return _analyzers[loop]
+
+
+async def afind_corp_info(query: str, timeout: Optional[float] = None) -> dict:
+    """find_corp_info 의 비동기 버전."""
+    return await default_analyzer().find_corp_info(query, timeout=timeout)
+
+
+async def aget_combined_data(code: str, year: int, timeout: Optional[float] = None, **kwargs) -> dict:
+    """get_combined_data 의 비동기 버전 (인자 동일)."""
+    return await default_analyzer().get_combined_data(code, year, timeout=timeout, **kwargs)
+
+
+async def ascore(data: dict, only: Optional[Iterable[str]] = None, memo=None, timeout: Optional[float] = None):
+    """calculate_metrics → calculate_score 의 비동기 버전. 반환 형식은 AsyncAnalyzer.score 참고."""
+    return await default_analyzer().score(data, only=only, memo=memo, timeout=timeout)
+
+
+async def aanalyze(symbol: str, year: int, timeout: Optional[float] = None, **kwargs) -> Optional[Dict]:
+    """종목 하나의 조회 → 수집 → 점수를 비동기로 수행합니다."""
+    return await default_analyzer().analyze(symbol, year, timeout=timeout, **kwargs)
@@ -6,16 +6,39 @@ import sys
 import datetime
 import pandas as pd
 
+from backend import MODES, use
 from utils import find_corp_info
-from data_provider import get_combined_data
-from metrics import calculate_metrics
-from scorer import calculate_score
+from data_provider import get_combined_data, get_corp_list, get_sector_classifications
+from memo import Memo
+from metric_graph import plan
+from sector import load_industry_index, sector_stats
 from reporter import report_console
+from store import ResultStore, make_row
+from config import RESULTS_DB_PATH, DATA_BACKEND, DATA_ARCHIVE_PATH, MEMO_DB_PATH
 
 # 로거 설정
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
+def report_sector(info: dict, year: int, metrics: dict) -> None:
+    """배치가 만든 (year, 최신 as_of) 업종 분포로 업종 상대 지표를 출력합니다."""
+    with ResultStore() as store:
+        as_of = store.latest_as_of(year)
+        if as_of is None:
+            logger.warning(f"⚠️ {year}년 배치 결과가 없어 업종 비교를 건너뜁니다 (batch.py --sector 먼저 실행).")
+            return
+        index_date = as_of.replace("-", "")
+        index = load_industry_index(index_date, get_sector_classifications, get_corp_list)
+        stats = sector_stats(store, year, index, index_date)
+
+    sector = stats.sector_of(info["corp_code"])
+    sector_score, _ = stats.score(metrics, sector)
+    logger.info(f"\n업종: {sector} (기준일 {as_of})")
+    for name, rel in stats.relative(metrics, sector).items():
+        logger.info(f"  {name:<20} z={rel['z']:+.2f}  백분위={rel['pct']:.1f}")
+    if sector_score is not None:
+        logger.info(f"업종 상대 점수: {sector_score:.1f} / 100")
+
 def main():
     # 1) CLI 인자 파싱
     parser = argparse.ArgumentParser(description="한국 주식 퀀트 분석 CLI")
@@ -29,7 +52,25 @@ def main():
         default=None,
         help="사업보고서 기준 연도 (기본: 전년도)"
     )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help=f"결과를 저장소({RESULTS_DB_PATH})에 upsert"
+    )
+    parser.add_argument(
+        "--sector",
+        action="store_true",
+        help="배치 결과의 KRX 업종 분포 대비 지표별 z-score·백분위와 업종 상대 점수 출력"
+    )
+    parser.add_argument(
+        "--no-memo",
+        action="store_true",
+        help=f"지표·점수 메모 캐시({MEMO_DB_PATH})를 쓰지 않고 다시 계산"
+    )
+    parser.add_argument("--backend", default=DATA_BACKEND, choices=MODES, help="데이터 백엔드 (record/replay: 응답 아카이브)")
+    parser.add_argument("--archive", default=DATA_ARCHIVE_PATH, help="record/replay 아카이브 경로")
     args = parser.parse_args()
+    use(args.backend, args.archive)
 
     # 2) 연도 결정 (입력 없으면 현재 연도-1)
     year = args.year or datetime.datetime.now().year - 1
@@ -43,20 +84,22 @@ def main():
         sys.exit(1)
     logger.info(f"분석 대상: {corp_name} ({corp_code}), 기준 연도: {year}")
 
-    # 4) 데이터 수집
-    data = get_combined_data(corp_code, year)
+    # 4) 데이터 수집 (SCORING_WEIGHTS 에 필요한 입력만)
+    needed, inputs = plan()
+    data = get_combined_data(corp_code, year, inputs=inputs, metrics=needed)
     dart_data = data.get("dart", {})
     price_df  = data.get("price", pd.DataFrame())
     pkrx_f    = data.get("pykrx", {})
 
     # 5) 지표 계산
-    metrics = calculate_metrics(dart_data, price_df, pkrx_f)
+    memo = Memo(None if args.no_memo else MEMO_DB_PATH)
+    metrics = memo.metrics(dart_data, price_df, pkrx_f, only=needed)
     if not metrics:
         logger.error("⚠️ 지표 계산에 실패했습니다.")
         sys.exit(1)
 
     # 6) 점수 산출
-    score, comment, detail = calculate_score(metrics)
+    score, comment, detail = memo.score(metrics)
     if score is None:
         logger.error("⚠️ 종합 점수 계산에 실패했습니다.")
         sys.exit(1)
@@ -64,5 +107,15 @@ def main():
     # 7) 결과 출력
     report_console(detail, score, comment)
 
+    # 8) 업종 상대 비교 (선택, 배치 결과 필요)
+    if args.sector:
+        report_sector(info, year, metrics)
+
+    # 9) 결과 저장 (선택)
+    if args.save:
+        with ResultStore() as store:
+            store.upsert(make_row(corp_code, year, metrics, score, comment, detail, corp_name=corp_name))
+        logger.info(f"결과 저장 완료: {RESULTS_DB_PATH}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,16 @@
 # app.py
 
+import os
 import streamlit as st
 import datetime
+import pandas as pd
 from utils import find_corp_info
-from data_provider import get_combined_data
-from metrics import calculate_metrics
-from scorer import calculate_score
+from data_provider import get_combined_data, get_corp_list, get_price_history
+from backend import use
+from memo import default_memo
+from store import ResultStore
+from downsample import METHODS, ChartCache
+from config import RESULTS_DB_PATH, CHART_HISTORY_YEARS, CHART_WIDTH_PX, CHART_METHOD
 
 # Streamlit 페이지 설정
 st.set_page_config(
@@ -28,15 +33,86 @@ year = st.sidebar.number_input(
 )
 run_button = st.sidebar.button("분석 실행")
 
+st.sidebar.header("차트 설정")
+chart_width = st.sidebar.number_input("차트 해상도 (px)", min_value=200, max_value=4000, value=CHART_WIDTH_PX, step=100)
+chart_method = st.sidebar.selectbox("다운샘플링", METHODS, index=METHODS.index(CHART_METHOD))
+
+# 데이터 백엔드 (live 면 공유 HTTP 세션을 주입, 세션마다 다시 적용하지 않도록 프로세스당 한 번)
+@st.cache_resource
+def init_backend():
+    return use()
+
+init_backend()
+
 # 캐시 데이터 함수
+@st.cache_data(ttl=60*60)
+def load_corp_info(query: str) -> dict:
+    return find_corp_info(query)
+
 @st.cache_data(ttl=60*60)
 def load_data(code: str, year: int) -> dict:
     return get_combined_data(code, year)
 
+@st.cache_data(ttl=60*60)
+def load_price_history(ticker: str, start: str, end: str) -> pd.Series:
+    return get_price_history(ticker, start, end)
+
+@st.cache_data(ttl=24*60*60)
+def stock_code_of(corp_code: str):
+    corp_list = get_corp_list()
+    if corp_list.empty:
+        return None
+    matched = corp_list.loc[corp_list["corp_code"] == corp_code, "stock_code"]
+    code = str(matched.iloc[0]).strip() if len(matched) else ""
+    return code if len(code) == 6 else None
+
+# 다운샘플 결과는 세션 간 공유 ((종목, 구간, 해상도)별 LRU)
+@st.cache_resource
+def chart_cache() -> ChartCache:
+    return ChartCache()
+
+@st.cache_resource
+def open_store(path: str) -> ResultStore:
+    return ResultStore(path)
+
+def load_score_history(corp_code: str) -> pd.Series:
+    """배치 결과 저장소의 기준일별 종합 점수 (기준일마다 가장 최근 연도 결과)."""
+    if not os.path.exists(RESULTS_DB_PATH):
+        return pd.Series(dtype=float)
+    rows = open_store(RESULTS_DB_PATH).history(corp_code)
+    if rows.empty:
+        return pd.Series(dtype=float)
+    rows = rows.sort_values(["as_of", "year"]).drop_duplicates("as_of", keep="last")
+    return pd.Series(rows["score"].to_numpy(dtype=float), index=pd.to_datetime(rows["as_of"]), name="score")
+
+def zoomable_chart(title: str, key: str, ticker: str, series: pd.Series) -> None:
+    """
+    구간 슬라이더로 확대하면 선택 구간만 다시 다운샘플링해 그립니다.
+    브라우저로는 해상도 × CHART_POINTS_PER_PX 개 이하의 점만 보냅니다.
+    """
+    st.subheader(title)
+    series = series.dropna()
+    if series.empty:
+        st.info("표시할 데이터가 없습니다.")
+        return
+    first, last = series.index[0].date(), series.index[-1].date()
+    start, end = (first, last) if first == last else st.slider(
+        "표시 구간", min_value=first, max_value=last, value=(first, last), format="YYYY-MM-DD", key=key,
+    )
+    points = chart_cache().series(ticker, series, pd.Timestamp(start), pd.Timestamp(end), int(chart_width), chart_method)
+    st.line_chart(points, height=320)
+    st.caption(f"{len(series.loc[pd.Timestamp(start):pd.Timestamp(end)]):,}개 중 {len(points):,}개 점 표시 ({chart_method})")
+
+# 버튼을 누른 뒤에도 슬라이더 조작(재실행) 시 결과가 유지되도록 조회 대상을 세션에 보관
 if run_button:
+    st.session_state["target"] = (symbol, int(year))
+
+if "target" in st.session_state:
+    symbol, year = st.session_state["target"]
     # 1) 종목 정보 조회
     with st.spinner("기업 정보 조회 중…"):
-        corp_code, corp_name = find_corp_info(symbol)
+        info = load_corp_info(symbol)
+        corp_code, corp_name = info.get("corp_code"), info.get("corp_name")
     if not corp_code:
         st.error(f"❌ '{symbol}' 종목을 찾을 수 없습니다. 정확한 이름 또는 코드를 입력해 주세요.")
     else:
@@ -51,11 +127,11 @@ if run_button:
 
         # 3) 지표 계산
         with st.spinner("지표 계산 중…"):
-            metrics = calculate_metrics(dart, price, pkrx)
+            metrics = default_memo().metrics(dart, price, pkrx)
 
         # 4) 점수화
         with st.spinner("점수 계산 중…"):
-            score, comment, detail = calculate_score(metrics)
+            score, comment, detail = default_memo().score(metrics)
 
         # 5) 결과 출력
         st.metric(label="종합 퀀트 점수", value=f"{score:.1f}", delta=comment)
@@ -83,3 +159,14 @@ if run_button:
         col1.metric("EPS (원)", f"{eps:.0f}" if eps else "N/A")
         col2.metric("BPS (원)", f"{bps:.0f}" if bps else "N/A")
         col3.metric("시가총액 (원)", f"{mcap:,.0f}" if mcap else "N/A")
+
+        # 장기 시세 / 점수 이력 (서버에서 다운샘플링)
+        st.markdown("---")
+        ticker = symbol.strip() if symbol.strip().isdigit() and len(symbol.strip()) == 6 else stock_code_of(corp_code)
+        if ticker:
+            today = datetime.date.today()
+            start = (pd.Timestamp(today) - pd.DateOffset(years=CHART_HISTORY_YEARS)).strftime("%Y%m%d")
+            with st.spinner("장기 시세 조회 중…"):
+                history = load_price_history(ticker, start, today.strftime("%Y%m%d"))
+            zoomable_chart(f"일별 종가 (최근 {CHART_HISTORY_YEARS}년)", "price_range", ticker, history)
+        zoomable_chart("종합 점수 이력", "score_range", corp_code, load_score_history(corp_code))
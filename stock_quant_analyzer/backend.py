@@ -0,0 +1,266 @@
+# backend.py
+
+import os
+import json
+import atexit
+import pickle
+import hashlib
+import logging
+import zipfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import http_session
+from http_session import QuotaExceededError
+from config import DATA_BACKEND, DATA_ARCHIVE_PATH
+
+logger = logging.getLogger(__name__)
+
+# 백엔드 모드
+LIVE = "live"       # 실제 DART/KRX 조회
+RECORD = "record"   # 실제 조회 + 모든 응답을 압축 아카이브에 기록
+REPLAY = "replay"   # 아카이브에서만 응답 (네트워크 없음)
+MODES = (LIVE, RECORD, REPLAY)
+
+# 호출 키에서 제외하는 인자 (API 키가 달라도 같은 응답으로 재생되도록)
+_SECRET_PARAMS = ("crtfc_key",)
+
+# 마지막으로 use() 에 적용한 (모드, 아카이브 경로). 작업 프로세스가 같은 백엔드를 다시 열 때 사용
+_active: Tuple[str, Optional[str]] = (LIVE, None)
+
+
+class ReplayMissError(LookupError):
+    """replay 모드에서 아카이브에 없는 호출. 기록 당시와 다른 조회를 했다는 뜻입니다."""
+
+
+class JsonResponse:
+    """requests.Response 중 .json() 만 흉내 내는 응답."""
+
+    def __init__(self, payload: Dict):
+        self._payload = payload
+
+    def json(self) -> Dict:
+        return self._payload
+
+
+def call_key(namespace: str, name: str, args: Optional[tuple] = None, kwargs: Optional[Dict] = None) -> str:
+    """
+    (모듈, 함수, 인자) 로 만든 아카이브 키. 인자는 순서를 고정한 JSON 으로 직렬화합니다.
+    args=None 은 속성 조회(corp_codes 등)로, 인자 없는 호출(args=())과 구분됩니다.
+    """
+    payload = json.dumps(
+        [namespace, name, None if args is None else list(args), kwargs or {}],
+        sort_keys=True, default=str, ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class Archive:
+    """
+    호출 결과를 키별 pickle 항목으로 담는 zip(deflate) 아카이브.
+    - 'a' 모드: 기존 항목은 유지하고 새 키만 덧붙임 (같은 키는 처음 기록을 유지)
+    - 'r' 모드: 열 때 목록만 읽고, 항목은 처음 쓸 때 압축을 풀어 메모리에 둠
+    항목 내용: {'call': 설명 문자열, 'value': 반환값} 또는 {'call', 'error': 예외}
+    """
+
+    def __init__(self, path: str = DATA_ARCHIVE_PATH, mode: str = "r"):
+        if mode == "a":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.mode = mode
+        self._zip = zipfile.ZipFile(path, mode, compression=zipfile.ZIP_DEFLATED)
+        self._keys = {os.path.basename(n)[:-4]: n for n in self._zip.namelist() if n.endswith(".pkl")}
+        self._raw: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def load(self, key: str) -> Dict:
+        raw = self._raw.get(key)
+        if raw is None:
+            if key not in self._keys:
+                raise ReplayMissError(key)
+            with self._lock:
+                raw = self._raw[key] = self._zip.read(self._keys[key])
+        # 호출자가 DataFrame 을 수정해도 다음 재생에 영향이 없도록 매번 새로 복원
+        return pickle.loads(raw)
+
+    def save(self, key: str, namespace: str, call: str, **entry: Any) -> None:
+        if key in self._keys:
+            return
+        try:
+            data = pickle.dumps({"call": call, **entry}, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # pickle 할 수 없는 예외는 메시지만 보존
+            data = pickle.dumps({"call": call, "error": RuntimeError(repr(entry.get("error")))})
+        name = f"{namespace}/{key}.pkl"
+        with self._lock:
+            self._zip.writestr(name, data)
+            self._keys[key] = name
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _describe(namespace: str, name: str, args: tuple, kwargs: Dict) -> str:
+    parts = [repr(a) for a in args] + [f"{k}={v!r}" for k, v in sorted(kwargs.items())]
+    return f"{namespace}.{name}({', '.join(parts)})"
+
+
+class Recorder:
+    """target(OpenDartReader, pykrx.stock 등)의 호출을 그대로 실행하고 결과·예외를 archive 에 기록합니다."""
+
+    def __init__(self, target: Any, archive: Archive, namespace: str):
+        self._target = target
+        self._archive = archive
+        self._namespace = namespace
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = getattr(self._target, name)
+        if name == "api_key":
+            return value   # 키는 기록하지 않음
+        if not callable(value):
+            self._archive.save(call_key(self._namespace, name), self._namespace, f"{self._namespace}.{name}", value=value)
+            return value
+
+        def record(*args, **kwargs):
+            key = call_key(self._namespace, name, args, kwargs)
+            call = _describe(self._namespace, name, args, kwargs)
+            try:
+                result = value(*args, **kwargs)
+            except QuotaExceededError:
+                raise   # 일시적 상태는 기록하지 않음
+            except Exception as e:
+                self._archive.save(key, self._namespace, call, error=e)
+                raise
+            self._archive.save(key, self._namespace, call, value=result)
+            return result
+        return record
+
+
+class Replayer:
+    """Recorder 가 기록한 결과만으로 응답합니다. 기록에 없는 호출은 ReplayMissError."""
+
+    api_key = "replay"
+
+    def __init__(self, archive: Archive, namespace: str):
+        self._archive = archive
+        self._namespace = namespace
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = call_key(self._namespace, name)
+        if attr in self._archive:
+            return self._replay(attr)
+
+        def replay(*args, **kwargs):
+            return self._replay(call_key(self._namespace, name, args, kwargs))
+        return replay
+
+    def _replay(self, key: str):
+        try:
+            entry = self._archive.load(key)
+        except ReplayMissError:
+            raise ReplayMissError(f"아카이브에 없는 호출입니다: {self._namespace} ({key})") from None
+        if "error" in entry:
+            raise entry["error"]
+        return entry["value"]
+
+
+def _http_key(url: str, params: Optional[Dict]) -> Dict:
+    return {k: v for k, v in (params or {}).items() if k not in _SECRET_PARAMS}
+
+
+class SessionRecorder:
+    """공유 HTTP 세션의 GET 응답 본문(JSON)을 기록합니다 (data_provider._finstate_all 용)."""
+
+    def __init__(self, session, archive: Archive):
+        self._session = session
+        self._archive = archive
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> JsonResponse:
+        payload = self._session.get(url, params=params, **kwargs).json()
+        query = _http_key(url, params)
+        self._archive.save(call_key("http", url, (), query), "http", _describe("http", url, (), query), value=payload)
+        return JsonResponse(payload)
+
+
+class SessionReplayer:
+    def __init__(self, archive: Archive):
+        self._replayer = Replayer(archive, "http")
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> JsonResponse:
+        return JsonResponse(self._replayer._replay(call_key("http", url, (), _http_key(url, params))))
+
+
+# ---------------------------------------------------------------------- #
+# data_provider / utils 연결
+# ---------------------------------------------------------------------- #
+def install(dart: Any, session: Any, stock: Any) -> None:
+    """
+    data_provider·utils·metrics 의 원격 조회 지점(OpenDartReader, HTTP 세션, pykrx.stock)을 바꿉니다.
+    OpenDartReader 는 첫 사용 시 만들어지므로 조회 전에만 호출하면 네트워크를 쓰지 않습니다.
+    """
+    http_session.dart_reader = lambda: dart
+    http_session.get_session = lambda: session
+    import data_provider
+    import metrics
+    import utils
+
+    data_provider._dart = utils._dart = dart
+    data_provider.get_session = lambda: session
+    data_provider.stock = stock
+    data_provider.get_benchmark.cache_clear()
+    metrics.dart_reader = lambda: dart
+
+
+def active() -> Tuple[str, Optional[str]]:
+    """현재 프로세스에 use() 로 적용된 (모드, 아카이브 경로). use() 를 부르지 않았으면 (live, None)."""
+    return _active
+
+
+def use(mode: str = DATA_BACKEND, path: str = DATA_ARCHIVE_PATH) -> Optional[Archive]:
+    """
+    백엔드 모드를 적용합니다. record/replay 는 열린 Archive 를 반환하며, 프로세스 종료 시 자동으로 닫혀
+    (record 의 경우 zip 목록이 기록되어) 아카이브가 완성됩니다. live 는 None 을 반환합니다.
+    live 는 공유 HTTP 세션을 바로 만들어 OpenDartReader·pykrx 에 주입합니다
+    (DART 를 쓰지 않는 시세 전용 경로도 처음부터 같은 커넥션 풀을 쓰도록).
+    """
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 백엔드 모드: {mode} (가능: {', '.join(MODES)})")
+    global _active
+    _active = (mode, None if mode == LIVE else path)
+    if mode == LIVE:
+        http_session.get_session()
+        return None
+
+    if mode == REPLAY:
+        archive = Archive(path, "r")
+        atexit.register(archive.close)
+        install(Replayer(archive, "dart"), SessionReplayer(archive), Replayer(archive, "krx"))
+        logger.info(f"replay 백엔드: {path} ({len(archive)}건)")
+        return archive
+
+    from pykrx import stock
+    archive = Archive(path, "a")
+    atexit.register(archive.close)
+    install(
+        Recorder(http_session.dart_reader(), archive, "dart"),
+        SessionRecorder(http_session.get_session(), archive),
+        Recorder(stock, archive, "krx"),
+    )
+    logger.info(f"record 백엔드: {path} (기존 {len(archive)}건)")
+    return archive
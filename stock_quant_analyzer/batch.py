@@ -0,0 +1,479 @@
+# batch.py
+
+import argparse
+import logging
+import os
+import time
+import datetime
+import pandas as pd
+from collections import namedtuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from backend import MODES, RECORD, use
+from data_provider import (
+    QuotaExceededError, get_corp_list, get_combined_data, get_price_panel, get_benchmark, get_sector_classifications,
+    load_price_state, price_window,
+)
+from checkpoint import Checkpoint
+from negative_cache import NegativeCache
+from factors import compute_factors
+from metric_graph import plan
+from metrics import calculate_metrics
+from scorer import calculate_score
+from memo import Memo
+from pipeline import IDLE, Stage, stream
+from parallel import score_parallel
+from sector import SectorStats, load_industry_index, sector_stats
+from store import INFO_COLUMNS, KEY_COLUMNS, ResultStore, make_row
+from statement_store import ANNUAL, StatementStore
+from ttm import QUARTERS, latest_report
+from reporter import ResultWriter, TopN, open_writer, report_negative_cache, report_top_n
+from config import (
+    RESULTS_DB_PATH, STATEMENT_STORE_DIR, CHECKPOINT_DIR, QUOTA_WAIT_SECONDS, NEGATIVE_CACHE_PATH,
+    DATA_BACKEND, DATA_ARCHIVE_PATH, PIPELINE_MEMORY_MB, MEMO_DB_PATH, PARALLEL_WORKERS, PARALLEL_CHUNK_SIZE,
+    PRICE_STATE_PATH,
+)
+
+# 파이프라인으로 흘려보내는 종목 (디스크로 내려쓸 수 있도록 모듈 수준 namedtuple)
+Company = namedtuple("Company", ["corp_code", "corp_name", "stock_code"])
+
+# 결과가 이 시간(초) 동안 나오지 않으면(사용한도 대기 등) 모아 둔 결과를 먼저 저장
+PIPELINE_IDLE_SECONDS = 5.0
+
+# 로거 설정
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+
+def list_universe(limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    DART 고유번호 목록에서 6자리 종목코드가 있는 상장사만 골라 반환합니다.
+    반환 컬럼: corp_code, corp_name, stock_code
+    """
+    corp_list = get_corp_list()
+    if corp_list.empty:
+        return pd.DataFrame(columns=["corp_code", "corp_name", "stock_code"])
+
+    stock_code = corp_list["stock_code"].fillna("").astype(str).str.strip()
+    listed = corp_list[stock_code.str.len() == 6][["corp_code", "corp_name", "stock_code"]]
+    listed = listed.reset_index(drop=True)
+    return listed.head(limit) if limit else listed
+
+
+def fetch_company(
+    stock_code: str,
+    year: int,
+    statements: Optional[StatementStore] = None,
+    factors: Optional[Dict[str, float]] = None,
+    metric_plan: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+    reprt_code: str = ANNUAL,
+    negative: Optional[NegativeCache] = None,
+) -> Dict:
+    """
+    한 종목의 입력 수집 (get_combined_data, compact 스냅샷). factors 가 주어지면 가격 팩터를 덮어씁니다.
+    일시적 조회 실패는 부분 데이터로 채우지 않고 FetchError 로 올립니다 (strict).
+    """
+    only, inputs = metric_plan or (None, None)
+    data = get_combined_data(
+        stock_code, year, store=statements, compact=True, inputs=inputs, reprt_code=reprt_code, negative=negative,
+        strict=True, metrics=only,
+    )
+    if factors:
+        data["pykrx"].update(factors)
+    return data
+
+
+def score_data(
+    corp_code: str,
+    corp_name: str,
+    stock_code: str,
+    year: int,
+    data: Dict,
+    as_of: Optional[str] = None,
+    metric_plan: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+    memo: Optional[Memo] = None,
+    reprt_code: str = ANNUAL,
+) -> Optional[Dict]:
+    """
+    수집한 입력으로 지표 계산 → 점수 산출 후 결과 저장소의 한 행을 반환합니다. 실패 시 None.
+    memo(memo.Memo)가 주어지면 같은 입력·설정으로 계산해 둔 지표·점수를 재사용합니다.
+    reprt_code 는 입력을 수집한 기준 보고서로, 결과 행의 키에 들어갑니다.
+    """
+    only, _ = metric_plan or (None, None)
+    if memo is not None:
+        metrics = memo.metrics(data["dart"], data["price"], data["pykrx"], only=only)
+    else:
+        metrics = calculate_metrics(data["dart"], data["price"], data["pykrx"], only=only)
+    if not metrics:
+        return None
+
+    result = memo.score(metrics) if memo is not None else calculate_score(metrics)
+    if not result or result[0] is None:
+        return None
+    score, comment, detail = result
+
+    return make_row(
+        corp_code, year, metrics, score, comment, detail,
+        stock_code=stock_code, corp_name=corp_name, as_of=as_of, reprt_code=reprt_code,
+    )
+
+
+def score_company(
+    corp_code: str,
+    corp_name: str,
+    stock_code: str,
+    year: int,
+    as_of: Optional[str] = None,
+    statements: Optional[StatementStore] = None,
+    factors: Optional[Dict[str, float]] = None,
+    metric_plan: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+    reprt_code: str = ANNUAL,
+    negative: Optional[NegativeCache] = None,
+    memo: Optional[Memo] = None,
+) -> Optional[Dict]:
+    """
+    한 종목의 데이터 수집 → 지표 계산 → 점수 산출을 수행하고 결과 저장소의 한 행을 반환합니다.
+    factors 가 주어지면 (유니버스 패널로 미리 계산한 가격 팩터) 종목별 계산값 대신 사용합니다.
+    metric_plan(metric_graph.plan 결과)이 주어지면 필요한 입력만 수집하고 해당 지표만 계산합니다.
+    reprt_code 가 분기·반기 보고서면 해당 보고서 기준 TTM 재무로 계산합니다.
+    negative(NegativeCache)는 get_combined_data 로 전달해 결과가 없던 조회를 생략합니다.
+    memo(Memo)가 주어지면 지표·점수 계산 결과를 입력 지문·설정 해시 기준으로 재사용합니다.
+    지표·점수 계산 실패 시 None, 조회가 일시적으로 실패하면 FetchError.
+    """
+    data = fetch_company(stock_code, year, statements, factors, metric_plan, reprt_code, negative)
+    return score_data(corp_code, corp_name, stock_code, year, data, as_of, metric_plan, memo, reprt_code)
+
+
+def fetch_task(
+    item: Company,
+    factors: Optional[Dict[str, float]],
+    year: int,
+    statements: Optional[StatementStore] = None,
+    metric_plan: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+    reprt_code: str = ANNUAL,
+    negative: Optional[NegativeCache] = None,
+    quota_wait: float = QUOTA_WAIT_SECONDS,
+) -> Tuple[Company, Optional[Dict], Optional[Exception]]:
+    """
+    run_universe 의 수집 단계: fetch_company 결과를 (item, data, error) 로 반환합니다.
+    DART 사용한도 초과 시 quota_wait 초 대기 후 같은 종목을 다시 조회하고, 그 밖의 실패(FetchError 등)는 error 로 돌려줍니다.
+    error 가 있으면 score_task 가 점수를 매기지 않고 failed 로 표시하므로 --resume 에서 다시 조회됩니다.
+    """
+    while True:
+        try:
+            data = fetch_company(item.stock_code, year, statements, factors, metric_plan, reprt_code, negative)
+            return item, data, None
+        except QuotaExceededError as e:
+            # 소비자는 대기 중 IDLE 을 받아 그때까지의 결과를 저장함
+            logger.warning(f"DART 사용한도 초과({e}): {item.stock_code} 에서 {quota_wait:.0f}초 대기 후 재개합니다.")
+            time.sleep(quota_wait)
+        except Exception as e:
+            logger.error(f"[{item.stock_code}-{year}] 데이터 수집 실패: {e}", exc_info=True)
+            return item, None, e
+
+
+def score_task(
+    fetched: Tuple[Company, Optional[Dict], Optional[Exception]],
+    year: int,
+    as_of: Optional[str] = None,
+    metric_plan: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+    memo: Optional[Memo] = None,
+    reprt_code: str = ANNUAL,
+) -> Tuple[Company, Optional[Dict], str, Optional[Exception]]:
+    """run_universe 의 계산 단계: fetch_task 결과를 (item, row, status, error) 로 바꿉니다. status: done/empty/failed"""
+    item, data, error = fetched
+    if error is not None:
+        return item, None, "failed", error
+    try:
+        row = score_data(item.corp_code, item.corp_name, item.stock_code, year, data, as_of, metric_plan, memo, reprt_code)
+    except Exception as e:
+        logger.error(f"[{item.stock_code}-{year}] 점수 계산 실패: {e}", exc_info=True)
+        return item, None, "failed", e
+    return item, row, ("done" if row else "empty"), None
+
+
+def universe_factors(year: int) -> pd.DataFrame:
+    """
+    전 종목 시세 패널(get_price_panel)로 가격 팩터를 한 번에 계산합니다.
+    반환: index=종목코드, columns=factors.FACTORS
+    """
+    start, end = f"{year-1}0101", f"{year}1231"
+    panel = get_price_panel(start, end)
+    if panel["close"].empty:
+        return pd.DataFrame()
+    return compute_factors(panel["close"], panel["value"], get_benchmark(start, end))
+
+
+def with_price_state(factor_table: Optional[pd.DataFrame], path: str, end: str) -> Optional[pd.DataFrame]:
+    """
+    price_engine 상태(path)의 Mom12M/Volatility 를 가격 팩터 표에 더합니다. end(YYYYMMDD)는 시세 구간의 끝.
+    상태 파일이 없거나 그 시점 것이 아니면 이유를 오류로 남기고 factor_table 을 그대로 반환합니다 (종목별로 시세를 받아 계산).
+    """
+    try:
+        state = load_price_state(path, end)
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(f"--price-state 를 쓰지 않고 종목별 시세로 계산합니다 ({path}): {e}")
+        return factor_table
+    logger.info(f"가격 엔진 상태 사용: {len(state)}개 종목 ({end})")
+    return state if factor_table is None else factor_table.join(state, how="outer")
+
+
+def sector_pass(store: ResultStore, year: int, date: str, reprt_code: str = ANNUAL) -> Optional[SectorStats]:
+    """
+    배치 후처리: date(YYYYMMDD) 기준 KRX 업종으로 (year, reprt_code, 최신 as_of) 결과의 업종별 분포를 만들고
+    모든 행의 sector / sector_score 를 갱신합니다. 분포는 기준일별로 저장되어 단일 종목 조회(analyze.py --sector)가 재사용합니다.
+    """
+    index = load_industry_index(date, get_sector_classifications, get_corp_list)
+    stats = sector_stats(store, year, index, date, reprt_code=reprt_code)
+    if stats is None:
+        return None
+    rows = store.latest_rows(year, reprt_code=reprt_code)
+    updated = store.update_sectors(rows[list(KEY_COLUMNS)].join(stats.score_frame(rows)))
+    logger.info(f"업종 상대 점수 갱신: {updated}개 종목")
+    return stats
+
+
+def export_latest(
+    store: ResultStore,
+    year: int,
+    universe: pd.DataFrame,
+    writer: Optional[ResultWriter] = None,
+    top: Optional[TopN] = None,
+    reprt_code: str = ANNUAL,
+) -> int:
+    """
+    저장소에 있는 유니버스 기업별 (year, reprt_code) 최신 결과로 내보내기 파일과 상위 N 을 채웁니다. 내보낸 행 수를 반환합니다.
+    --resume 실행은 이번에 다시 계산한 종목만 스트리밍하므로, 이전 실행에서 끝난 종목까지 포함하도록 끝에서 다시 만듭니다.
+    """
+    columns = list(KEY_COLUMNS) + list(INFO_COLUMNS) + store.metric_columns()
+    rows = store.latest_rows(year, reprt_code=reprt_code)
+    rows = rows.loc[rows["corp_code"].isin(universe["corp_code"]), columns]
+    rows = rows.astype(object).where(rows.notna(), None)
+    for row in rows.to_dict("records"):
+        if writer is not None:
+            writer.write(row)
+        if top is not None:
+            top.add(row)
+    return len(rows)
+
+
+def run_universe(
+    universe: pd.DataFrame,
+    year: int,
+    store: ResultStore,
+    batch_size: int = 100,
+    writer: Optional[ResultWriter] = None,
+    top: Optional[TopN] = None,
+    statements: Optional[StatementStore] = None,
+    factor_table: Optional[pd.DataFrame] = None,
+    metric_plan: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+    reprt_code: str = ANNUAL,
+    checkpoint: Optional[Checkpoint] = None,
+    quota_wait: float = QUOTA_WAIT_SECONDS,
+    negative: Optional[NegativeCache] = None,
+    memory_mb: float = PIPELINE_MEMORY_MB,
+    memo: Optional[Memo] = None,
+    workers: int = PARALLEL_WORKERS,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> int:
+    """
+    유니버스 전체를 수집 → 지표·점수 → 저장 스트리밍 파이프라인(pipeline.stream)으로 처리하고,
+    종목별 결과를 batch_size 단위로 저장소에 upsert 합니다.
+    수집 단계와 계산 단계는 유한 큐로 연결된 별도 스레드에서 돌며, 원본 입력은 계산 단계에서 지표만 뽑은 뒤 버립니다.
+    큐에 머무는 데이터가 memory_mb 를 넘으면 디스크로 내려써 메모리 사용량을 제한합니다.
+    writer/top 이 주어지면 결과 행을 생성 즉시 내보내기 파일과 상위 N 집계에도 흘려보냅니다.
+    statements 가 주어지면 적재된 재무제표(dart_bulk.py)를 사용해 DART API 호출을 생략합니다.
+    factor_table(universe_factors 결과)이 주어지면 종목별 가격 팩터를 거기서 가져옵니다.
+    metric_plan, reprt_code, negative, memo 는 score_company 로 그대로 전달합니다.
+    checkpoint 가 주어지면 저장소에 반영된 단위만 완료로 기록하고, 이미 끝난 단위는 건너뜁니다.
+    DART 사용한도 초과(QuotaExceededError) 시 그때까지의 결과를 저장하고 quota_wait 초 대기 후 같은 종목부터 재시도합니다.
+    workers > 1 이면 수집·계산을 프로세스 풀(parallel.score_parallel)에서 chunk_size 개씩 나눠 수행합니다.
+    작업 프로세스는 statements / negative / memo 의 경로로 각자 저장소를 열며, statements 는 읽기만 합니다.
+    반환: 저장한 행 수
+    """
+    as_of = (checkpoint.meta.get("as_of") if checkpoint is not None else None) or datetime.date.today().isoformat()
+    pending: List[Dict] = []
+    journal: List[Tuple[str, str]] = []   # 저장 시점에 체크포인트에 기록할 (corp_code, status)
+    saved = skipped = done = 0
+    total = len(universe)
+
+    def flush() -> None:
+        nonlocal saved, pending, journal
+        saved += store.upsert_many(pending)
+        if checkpoint is not None:
+            for corp_code, status in journal:
+                checkpoint.mark(corp_code, year, status)
+        pending, journal = [], []
+
+    def source():
+        nonlocal skipped
+        for item in universe.itertuples(index=False):
+            if checkpoint is not None and checkpoint.is_finished(item.corp_code, year):
+                skipped += 1
+                continue
+            factors = None
+            if factor_table is not None and item.stock_code in factor_table.index:
+                # 결측 팩터는 덮어쓰지 않음 (종목별 시세로 계산한 값 유지)
+                factors = {k: float(v) for k, v in factor_table.loc[item.stock_code].items() if pd.notna(v)}
+            yield Company(item.corp_code, item.corp_name, item.stock_code), factors
+
+    def fetch(task):
+        item, factors = task
+        return fetch_task(item, factors, year, statements, metric_plan, reprt_code, negative, quota_wait)
+
+    def compute(fetched):
+        # 결과 행만 다음 단계로 넘기고 재무·시세 원본은 여기서 놓음
+        return score_task(fetched, year, as_of, metric_plan, memo, reprt_code)
+
+    if workers > 1:
+        # 종목 수가 적으면 묶음을 줄여 모든 프로세스가 일을 나눠 받도록 함
+        chunk_size = max(1, min(chunk_size, -(-total // (workers * 4))))
+        results = score_parallel(
+            source(), year, as_of, workers=workers, chunk_size=chunk_size,
+            statements_root=statements.root if statements is not None else None,
+            negative_path=negative.path if negative is not None else None,
+            memo_path=memo.path if memo is not None else None, use_memo=memo is not None,
+            metric_plan=metric_plan, reprt_code=reprt_code, quota_wait=quota_wait, idle=PIPELINE_IDLE_SECONDS,
+        )
+    else:
+        stages = [Stage("fetch", fetch), Stage("score", compute)]
+        results = stream(source(), stages, memory_mb=memory_mb, idle=PIPELINE_IDLE_SECONDS)
+    for result in results:
+        if result is IDLE:
+            if pending or journal:
+                flush()
+            continue
+        item, row, status, error = result
+        done += 1
+        if status == "failed":
+            if checkpoint is not None:
+                checkpoint.mark(item.corp_code, year, status, error=str(error))
+        else:
+            journal.append((item.corp_code, status))
+        if row:
+            pending.append(row)
+            if writer is not None:
+                writer.write(row)
+            if top is not None:
+                top.add(row)
+        if len(pending) >= batch_size or done + skipped == total:
+            flush()
+            logger.info(f"진행: {done + skipped}/{total} (저장 {saved}, 건너뜀 {skipped})")
+    if pending or journal:
+        flush()
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유니버스 전체 퀀트 점수 배치 작업")
+    parser.add_argument("--year", type=int, default=None, help="사업보고서 기준 연도 (기본: 전년도)")
+    parser.add_argument("--limit", type=int, default=None, help="처리할 최대 종목 수 (테스트용)")
+    parser.add_argument("--db", default=RESULTS_DB_PATH, help="결과 저장소(SQLite) 경로")
+    parser.add_argument(
+        "--export", default=None,
+        help="결과 내보내기 경로 (.parquet/.arrow/.jsonl/.csv, --resume 이면 끝난 뒤 저장소의 전체 결과로 다시 작성)",
+    )
+    parser.add_argument(
+        "--statements", default=STATEMENT_STORE_DIR,
+        help="재무제표 저장소 경로 (dart_bulk.py 적재본 + API 조회 결과 캐시, 재개 시 재사용)",
+    )
+    parser.add_argument("--top", type=int, default=20, help="콘솔 요약에 출력할 상위 종목 수")
+    parser.add_argument(
+        "--quarter", default=None, choices=[c for c in QUARTERS if c != ANNUAL] + ["latest"],
+        help="분기·반기 보고서 기준 TTM 재무로 계산 (latest: 제출 기한이 지난 최근 보고서, --year 무시)",
+    )
+    parser.add_argument(
+        "--all-metrics", action="store_true",
+        help="가중치가 없는 지표까지 모두 계산해 저장 (기본: SCORING_WEIGHTS 에 필요한 지표·데이터만)",
+    )
+    parser.add_argument("--panel", action="store_true", help="가격 팩터를 전 종목 시세 패널로 한 번에 계산")
+    parser.add_argument(
+        "--price-state", nargs="?", const=PRICE_STATE_PATH, default=None,
+        help="price_engine 일일 갱신 상태로 Mom12M/Volatility 사용. 사업연도 시세 구간({year}1231)으로 계산하므로 "
+             "그해 마지막 거래일까지 반영한 상태만 쓰며, 아니면 이유를 남기고 종목별 시세로 계산",
+    )
+    parser.add_argument("--checkpoint", default=None, help="체크포인트 저널 경로 (기본: 연도·보고서별 파일)")
+    parser.add_argument("--resume", action="store_true", help="체크포인트에서 완료된 종목은 건너뛰고 실패한 종목만 재시도")
+    parser.add_argument("--negative-cache", default=NEGATIVE_CACHE_PATH, help="네거티브 캐시(SQLite) 경로")
+    parser.add_argument(
+        "--quota-wait", type=float, default=QUOTA_WAIT_SECONDS, help="DART 사용한도 초과 시 대기 시간(초)",
+    )
+    parser.add_argument(
+        "--memory-mb", type=float, default=PIPELINE_MEMORY_MB,
+        help="파이프라인 큐 메모리 상한(MB), 넘으면 디스크로 내려씀",
+    )
+    parser.add_argument(
+        "--memo", default=MEMO_DB_PATH,
+        help="지표·점수 메모 캐시(SQLite) 경로, 빈 값이면 사용 안 함 (설정 변경 시 바뀐 계층만 재계산)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=PARALLEL_WORKERS,
+        help="지표·점수 계산 프로세스 수 (2 이상이면 프로세스 풀로 분산, 재무제표는 --statements 에서 읽기만 함)",
+    )
+    parser.add_argument("--sector", action="store_true", help="실행 후 KRX 업종 기준 업종 상대 점수(sector_score) 계산")
+    parser.add_argument("--backend", default=DATA_BACKEND, choices=MODES, help="데이터 백엔드 (record/replay: 응답 아카이브)")
+    parser.add_argument("--archive", default=DATA_ARCHIVE_PATH, help="record/replay 아카이브 경로")
+    args = parser.parse_args()
+    if args.workers > 1 and args.backend == RECORD:
+        parser.error("--backend record 는 --workers 1 에서만 사용할 수 있습니다")
+    use(args.backend, args.archive)
+
+    year = args.year or datetime.datetime.now().year - 1
+    reprt_code = args.quarter or ANNUAL
+    if reprt_code == "latest":
+        year, reprt_code = latest_report()
+    universe = list_universe(args.limit)
+    logger.info(f"유니버스: {len(universe)}개 종목, 기준 연도: {year}, 보고서: {reprt_code}")
+
+    metric_plan = None if args.all_metrics else plan()
+    if metric_plan is not None:
+        logger.info(f"계산 지표 {len(metric_plan[0])}개, 수집 입력: {sorted(metric_plan[1])}")
+    factor_table = universe_factors(year) if args.panel else None
+    if factor_table is not None:
+        logger.info(f"가격 팩터 패널 계산 완료: {len(factor_table)}개 종목")
+    if args.price_state:
+        # 진행 중인 연도는 시세가 오늘까지만 있으므로 구간 끝을 오늘로
+        end = min(price_window(year)[1], datetime.date.today().strftime("%Y%m%d"))
+        factor_table = with_price_state(factor_table, args.price_state, end)
+
+    checkpoint_path = args.checkpoint or os.path.join(CHECKPOINT_DIR, f"batch_{year}_{reprt_code}.jsonl")
+    checkpoint = Checkpoint(
+        checkpoint_path, resume=args.resume,
+        meta={"year": year, "reprt_code": reprt_code, "as_of": datetime.date.today().isoformat()},
+    )
+    top = TopN(args.top)
+    writer = open_writer(args.export) if args.export else None
+    memo = Memo(args.memo) if args.memo else None
+    try:
+        with ResultStore(args.db) as store, checkpoint, NegativeCache(args.negative_cache) as negative:
+            statements = StatementStore(args.statements) if args.statements else None
+            # --resume 이면 이번에 계산한 종목만 흘러나오므로 내보내기·상위 N 은 끝에서 저장소로 다시 만듦
+            saved = run_universe(
+                universe, year, store, writer=None if args.resume else writer, top=None if args.resume else top,
+                statements=statements, factor_table=factor_table, metric_plan=metric_plan,
+                reprt_code=reprt_code, checkpoint=checkpoint, quota_wait=args.quota_wait, negative=negative,
+                memory_mb=args.memory_mb, memo=memo, workers=args.workers,
+            )
+            if args.sector:
+                sector_pass(store, year, checkpoint.meta["as_of"].replace("-", ""), reprt_code)
+            if args.resume:
+                export_latest(store, year, universe, writer, top, reprt_code)
+            negative.purge()
+            negative_entries = negative.entries()
+    finally:
+        if writer is not None:
+            writer.close()
+        if memo is not None:
+            logger.info(f"메모 캐시: {memo.stats()}")
+            memo.close()
+    logger.info(f"결과 저장 완료: {args.db} (rows:{saved})")
+    if checkpoint.failed():
+        logger.info(f"실패 {len(checkpoint.failed())}건 — --resume 으로 재시도할 수 있습니다 ({checkpoint_path})")
+    if writer is not None:
+        logger.info(f"내보내기 완료: {args.export} (rows:{writer.rows_written})")
+    report_top_n(top.rows(), title=f"{year}년 종합 점수 상위")
+    report_negative_cache(negative_entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+# benchmark.py
+
+import sys
+import json
+import time
+import argparse
+import datetime
+import logging
+import statistics
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import backend
+from backend import JsonResponse
+from config import BENCH_FIXTURE_PATH, BENCH_BASELINE_PATH, BENCH_SIZES, BENCH_TOLERANCE
+
+logger = logging.getLogger(__name__)
+
+_MIN_DELTA_MS = 0.05   # 이보다 작은 시간 차이는 측정 잡음으로 봄
+
+
+# ------------------------------------------------------------------ #
+# 1. 기록된 DART/KRX 응답 (fixture)
+# ------------------------------------------------------------------ #
+def load_fixture(path: str = BENCH_FIXTURE_PATH) -> Dict:
+    """record_fixture 로 저장한 JSON 을 읽어 시세·지수는 DataFrame/Series 로 복원합니다."""
+    with open(path, encoding="utf-8") as fh:
+        fix = json.load(fh)
+    ohlcv = pd.DataFrame(fix["ohlcv"]["data"], index=pd.to_datetime(fix["ohlcv"]["index"]), columns=fix["ohlcv"]["columns"])
+    index = pd.Series(fix["index"]["data"], index=pd.to_datetime(fix["index"]["index"]), name="종가")
+    return {**fix, "ohlcv": ohlcv, "index": index}
+
+
+def record_fixture(code: str, year: int, path: str = BENCH_FIXTURE_PATH) -> None:
+    """실제 DART/KRX 에서 code 의 (year, year-1) 사업보고서와 시세를 받아 fixture 로 저장합니다 (네트워크 필요)."""
+    import data_provider
+    from utils import find_corp_info
+
+    info = find_corp_info(code)
+    start, end = f"{year-1}0101", f"{year}1231"
+    ohlcv = data_provider.stock.get_market_ohlcv_by_date(start, end, code)
+    last = ohlcv.index[-1].strftime("%Y%m%d")
+    fund = data_provider.stock.get_market_fundamental_by_date(last, last, code).iloc[0]
+    mcap = data_provider.stock.get_market_cap_by_date(last, last, code).iloc[0]["시가총액"]
+    fix = {
+        "source": "recorded",
+        "recorded_at": datetime.date.today().isoformat(),
+        "code": code,
+        "year": year,
+        "corp_code": info["corp_code"],
+        "corp_name": info["corp_name"],
+        "finstate": {
+            str(y): data_provider._finstate_all(code, y).to_dict("records") for y in (year, year - 1)
+        },
+        "ohlcv": json.loads(ohlcv.to_json(orient="split", date_format="iso", force_ascii=False)),
+        "index": json.loads(data_provider.get_benchmark(start, end).to_json(orient="split", date_format="iso")),
+        "fundamental": {k: float(v) for k, v in fund.items()},
+        "market_cap": int(mcap),
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(fix, fh, ensure_ascii=False, indent=1)
+    logger.info(f"fixture 저장: {path}")
+
+
+# ------------------------------------------------------------------ #
+# 2. 원격 호출 대체 (fixture 를 회사 수만큼 복제해 응답, 호출 수 집계)
+# ------------------------------------------------------------------ #
+class FixtureWorld:
+    """
+    fixture 한 건을 종목코드 000001 ~ N 으로 복제한 가상 DART/KRX.
+    종목마다 주가 배율만 달리해 시세 기반 지표가 서로 다르게 나오도록 합니다.
+    모든 원격 호출은 calls[(종목코드, 종류)] 로 집계됩니다.
+    """
+
+    def __init__(self, fixture: Dict, n: int):
+        self.fixture = fixture
+        self.codes = [f"{i:06d}" for i in range(1, n + 1)]
+        self.calls: Counter = Counter()
+        self.api_key = "benchmark"
+        self.corp_codes = pd.DataFrame({
+            "corp_code": [f"9{c}0" for c in self.codes],
+            "corp_name": [f"{fixture['corp_name']}{c}" for c in self.codes],
+            "stock_code": self.codes,
+        })
+        self._by_stock = dict(zip(self.corp_codes["stock_code"], self.corp_codes["corp_code"]))
+        self._by_corp = {v: k for k, v in self._by_stock.items()}
+
+    def _scale(self, code: str) -> float:
+        return 0.5 + (int(code) % 50) / 25
+
+    # --- OpenDartReader 대체 ---
+    def find_corp_code(self, code: str) -> Optional[str]:
+        self.calls[(code, "dart.corp_code")] += 1
+        return self._by_stock.get(code) or (code if code in self._by_corp else None)
+
+    def company(self, corp_code: str) -> Dict:
+        self.calls[(self._by_corp.get(corp_code, corp_code), "dart.company")] += 1
+        return {"corp_code": corp_code, "corp_name": f"{self.fixture['corp_name']}{self._by_corp[corp_code]}"}
+
+    def company_by_name(self, name: str) -> pd.DataFrame:
+        self.calls[(name, "dart.company_by_name")] += 1
+        return self.corp_codes[self.corp_codes["corp_name"] == name]
+
+    def finstate_all(self, corp_code: str, year: int) -> pd.DataFrame:
+        self.calls[(self._by_corp.get(corp_code, corp_code), "dart.finstate")] += 1
+        return pd.DataFrame(self.fixture["finstate"].get(str(year), []))
+
+    # --- 공유 HTTP 세션 대체 (data_provider._finstate_all 의 fnlttSinglAcntAll 조회) ---
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> JsonResponse:
+        params = params or {}
+        code = self._by_corp.get(params.get("corp_code"), params.get("corp_code"))
+        self.calls[(code, "dart.finstate")] += 1
+        rows = self.fixture["finstate"].get(str(params.get("bsns_year")))
+        if not rows:
+            return JsonResponse({"status": "013", "message": "조회된 데이타가 없습니다."})
+        return JsonResponse({"status": "000", "message": "정상", "list": rows})
+
+    # --- pykrx.stock 대체 ---
+    def get_market_ohlcv_by_date(self, start: str, end: str, code: str) -> pd.DataFrame:
+        self.calls[(code, "krx.ohlcv")] += 1
+        ohlcv = self.fixture["ohlcv"]
+        scaled = ohlcv.copy()
+        for col in ("시가", "고가", "저가", "종가", "거래대금"):
+            scaled[col] = ohlcv[col] * self._scale(code)
+        return scaled.loc[start:end]
+
+    def get_market_fundamental_by_date(self, start: str, end: str, code: str) -> pd.DataFrame:
+        self.calls[(code, "krx.fundamental")] += 1
+        fund = dict(self.fixture["fundamental"])
+        fund["PER"] = fund["PER"] * self._scale(code)
+        fund["PBR"] = fund["PBR"] * self._scale(code)
+        return pd.DataFrame([fund], index=[pd.Timestamp(end)])
+
+    def get_market_cap_by_date(self, start: str, end: str, code: str) -> pd.DataFrame:
+        self.calls[(code, "krx.market_cap")] += 1
+        return pd.DataFrame([{"시가총액": self.fixture["market_cap"] * self._scale(code)}], index=[pd.Timestamp(end)])
+
+    def get_index_ohlcv_by_date(self, start: str, end: str, ticker: str) -> pd.DataFrame:
+        self.calls[(ticker, "krx.index")] += 1
+        return self.fixture["index"].loc[start:end].to_frame()
+
+    def calls_for(self, kinds: Optional[str] = None) -> int:
+        return sum(n for (_, kind), n in self.calls.items() if kinds is None or kind.startswith(kinds))
+
+
+def install(world: FixtureWorld) -> None:
+    """data_provider/utils 가 world 로 조회하도록 연결합니다 (DART·HTTP 세션·pykrx 모두 world)."""
+    backend.install(world, world, world)
+
+
+# ------------------------------------------------------------------ #
+# 3. 측정
+# ------------------------------------------------------------------ #
+def _time(fn: Callable, items: List) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return time.perf_counter() - started
+
+
+def run_suite(n: int, fixture: Dict, year: Optional[int] = None) -> Dict:
+    """
+    회사 n 개에 대해 단계별 소요 시간(회사당 ms)과 원격 호출 수(회사당)를 측정합니다.
+    score_checksum 은 점수 합계로, 성능 수정이 결과를 바꾸지 않았는지 baseline 과 비교합니다.
+    """
+    world = FixtureWorld(fixture, n)
+    install(world)
+    import data_provider
+    from metrics import ALIASES, SOURCES, _lookup, calculate_metrics
+    from scorer import calculate_score
+    from utils import find_corp_info
+
+    year = year or fixture["year"]
+    result: Dict = {"companies": n, "stages": {}}
+
+    def stage(name: str, fn: Callable, items: List, kinds: Optional[str] = None) -> None:
+        before = world.calls_for(kinds)
+        elapsed = _time(fn, items)
+        result["stages"][name] = {
+            "ms_per_company": round(elapsed * 1000 / n, 4),
+            "calls_per_company": round((world.calls_for(kinds) - before) / n, 4),
+        }
+
+    stage("find_corp_info", find_corp_info, world.codes)
+
+    bundles: Dict[str, Dict] = {}
+    # batch.score_company 와 같은 호출 (compact 스냅샷)
+    stage(
+        "get_combined_data",
+        lambda code: bundles.__setitem__(code, data_provider.get_combined_data(code, year, compact=True)),
+        world.codes,
+    )
+
+    # _lookup: 회사마다 새 DataFrame 으로 (정규화 열 캐시가 없는 첫 조회 기준)
+    rows = fixture["finstate"][str(year)]
+    frames = [data_provider.split_statements(pd.DataFrame(rows)) for _ in world.codes]
+    stage("_lookup", lambda f: [_lookup(f[SOURCES[name]], ALIASES[name]) for name in ALIASES], frames)
+
+    computed: Dict[str, Dict] = {}
+
+    def metrics_of(code: str) -> None:
+        data = bundles[code]
+        computed[code] = calculate_metrics(data["dart"], data["price"], data["pykrx"])
+    stage("calculate_metrics", metrics_of, world.codes)
+
+    scores: List[float] = []
+    stage("calculate_score", lambda code: scores.append(calculate_score(computed[code])[0]), world.codes)
+
+    result["remote_calls_per_company"] = round(world.calls_for() / n, 4)
+    result["score_checksum"] = round(sum(s for s in scores if s is not None), 6)
+    return result
+
+
+def run_all(sizes=BENCH_SIZES, fixture_path: str = BENCH_FIXTURE_PATH, repeat: int = 1) -> Dict:
+    """sizes 별 run_suite 결과. repeat > 1 이면 단계별 시간은 중앙값을 사용합니다."""
+    fixture = load_fixture(fixture_path)
+    report = {"fixture": fixture.get("source", "recorded"), "runs": {}}
+    for n in sizes:
+        runs = [run_suite(n, fixture) for _ in range(repeat)]
+        best = runs[-1]
+        for name in best["stages"]:
+            best["stages"][name]["ms_per_company"] = round(
+                statistics.median(r["stages"][name]["ms_per_company"] for r in runs), 4
+            )
+        report["runs"][str(n)] = best
+        logger.info(f"회사 {n}개: " + ", ".join(
+            f"{k} {v['ms_per_company']:.3f}ms" for k, v in best["stages"].items()
+        ))
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = BENCH_TOLERANCE) -> List[str]:
+    """
+    baseline 대비 회귀 목록을 반환합니다 (빈 목록이면 통과).
+    - 회사당 시간이 (1 + tolerance) 배를 넘으면 회귀 (_MIN_DELTA_MS 미만 차이는 무시)
+    - 회사당 원격 호출 수가 늘거나 점수 합계가 달라지면 회귀 (허용 오차 없음)
+    """
+    problems = []
+    for n, run in report["runs"].items():
+        base = baseline.get("runs", {}).get(n)
+        if base is None:
+            continue
+        for name, cur in run["stages"].items():
+            ref = base["stages"].get(name)
+            if ref is None:
+                continue
+            slower = cur["ms_per_company"] - ref["ms_per_company"]
+            if cur["ms_per_company"] > ref["ms_per_company"] * (1 + tolerance) and slower > _MIN_DELTA_MS:
+                problems.append(
+                    f"[{n}] {name}: {ref['ms_per_company']:.3f}ms → {cur['ms_per_company']:.3f}ms"
+                )
+            if cur["calls_per_company"] > ref["calls_per_company"]:
+                problems.append(
+                    f"[{n}] {name}: 원격 호출 {ref['calls_per_company']} → {cur['calls_per_company']}/회사"
+                )
+        if abs(run["score_checksum"] - base["score_checksum"]) > 1e-6:
+            problems.append(f"[{n}] 점수 합계 변경: {base['score_checksum']} → {run['score_checksum']}")
+    return problems
+
+
+def print_report(report: Dict) -> None:
+    rows = []
+    for n, run in report["runs"].items():
+        for name, stat in run["stages"].items():
+            rows.append({"companies": int(n), "stage": name, **stat})
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기록된 DART/KRX 응답 기반 오프라인 성능 측정")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BENCH_SIZES), help="측정할 회사 수")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (시간은 중앙값)")
+    parser.add_argument("--fixture", default=BENCH_FIXTURE_PATH, help="fixture 경로")
+    parser.add_argument("--baseline", default=BENCH_BASELINE_PATH, help="비교할 baseline 경로")
+    parser.add_argument("--tolerance", type=float, default=BENCH_TOLERANCE, help="허용 시간 증가율 (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="측정 결과로 baseline 을 갱신")
+    parser.add_argument("--record", nargs=2, metavar=("CODE", "YEAR"), help="실제 API 로 fixture 를 새로 기록")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.record:
+        record_fixture(args.record[0], int(args.record[1]), args.fixture)
+        return
+
+    # 측정 중에는 수집·점수 로그를 끔
+    for name in ("data_provider", "scorer", "utils"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+    report = run_all(args.sizes, args.fixture, args.repeat)
+    print_report(report)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=1)
+        logger.info(f"baseline 갱신: {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+    except FileNotFoundError:
+        logger.warning(f"baseline 없음: {args.baseline} (--update-baseline 으로 생성)")
+        return
+    problems = compare(report, baseline, args.tolerance)
+    for problem in problems:
+        logger.error(f"회귀: {problem}")
+    if problems:
+        sys.exit(1)
+    logger.info("baseline 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# checkpoint.py
+
+import os
+import json
+import datetime
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 작업 단위 상태: done(저장 완료) / empty(데이터 없음, 재시도 불필요) / failed(재시도 대상)
+FINISHED = ("done", "empty")
+
+Unit = Tuple[str, int]   # (corp_code, year)
+
+
+class Checkpoint:
+    """
+    유니버스 배치의 (corp_code, year) 단위 진행 상황을 JSONL 저널로 기록합니다.
+    - 한 줄이 한 번의 상태 기록이며 같은 단위는 마지막 기록이 유효
+    - 줄 단위 append + flush 라 중간에 프로세스가 죽어도 그때까지의 기록은 남음
+    - 첫 줄은 실행 정보(meta: as_of 등)로, 재개 시 원래 실행의 기준일을 그대로 이어 씀
+    - resume=False 이거나 저널이 없으면 새로 시작
+    """
+
+    def __init__(self, path: str, resume: bool = False, meta: Optional[Dict] = None):
+        self.path = path
+        self.status: Dict[Unit, str] = {}
+        self.meta: Dict = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume and os.path.exists(path):
+            self._load()
+            self._fh = open(path, "a", encoding="utf-8")
+            if self._fh.tell() and not self._ends_with_newline():
+                self._fh.write("\n")   # 끊긴 줄 뒤에 이어 쓰지 않도록
+        else:
+            self.meta = dict(meta or {})
+            self._fh = open(path, "w", encoding="utf-8")
+            self._write({"meta": self.meta})
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    # 기록 도중 끊긴 마지막 줄
+                    logger.warning(f"체크포인트의 손상된 줄을 건너뜁니다: {line[:80]!r}")
+                    continue
+                if "meta" in rec:
+                    self.meta = rec["meta"]
+                    continue
+                self.status[(rec["corp_code"], int(rec["year"]))] = rec["status"]
+        logger.info(
+            f"체크포인트 로드: 완료 {len(self.finished())}건, 실패 {len(self.failed())}건 ({self.path})"
+        )
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as fh:
+            fh.seek(-1, os.SEEK_END)
+            return fh.read(1) == b"\n"
+
+    # ------------------------------------------------------------------ #
+    def is_finished(self, corp_code: str, year: int) -> bool:
+        return self.status.get((corp_code, int(year))) in FINISHED
+
+    def finished(self) -> Set[Unit]:
+        return {unit for unit, status in self.status.items() if status in FINISHED}
+
+    def failed(self) -> Set[Unit]:
+        return {unit for unit, status in self.status.items() if status == "failed"}
+
+    def mark(self, corp_code: str, year: int, status: str, error: Optional[str] = None) -> None:
+        rec = {
+            "corp_code": corp_code,
+            "year": int(year),
+            "status": status,
+            "at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        if error:
+            rec["error"] = error
+        self._write(rec)
+        self.status[(corp_code, int(year))] = status
+
+    def _write(self, rec: Dict) -> None:
+        self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
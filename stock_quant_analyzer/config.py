@@ -46,6 +46,15 @@ METRIC_TARGETS = {
     'Mom12M':          {'good':0.20, 'bad':-0.20,'direction':'high'},
     'Volatility':      {'good':0.20, 'bad':0.40, 'direction':'low'},
     'FCFYield':        {'good':0.08, 'bad':0.00, 'direction':'high'},
+    # 가격 팩터 (factors.py) — SCORING_WEIGHTS 에 가중치를 추가하면 스코어링에 반영
+    'Mom1M':           {'good':0.05, 'bad':-0.05,'direction':'high'},
+    'Mom3M':           {'good':0.10, 'bad':-0.10,'direction':'high'},
+    'Mom6M':           {'good':0.15, 'bad':-0.15,'direction':'high'},
+    'Mom12_1M':        {'good':0.20, 'bad':-0.20,'direction':'high'},
+    'MaxDrawdown':     {'good':0.15, 'bad':0.50, 'direction':'low'},
+    'DownsideDev':     {'good':0.12, 'bad':0.30, 'direction':'low'},
+    'Beta':            {'good':0.80, 'bad':1.50, 'direction':'low'},
+    'AvgTradedValue':  {'good':1e10, 'bad':1e8,  'direction':'high'},  # 원 (100억 / 1억)
 }
 
 # 4) 점수 구간별 코멘트
@@ -54,4 +63,80 @@ SCORE_COMMENTS = {
     (70, 90):  "우수 - 투자매력 높음",
     (50, 70):  "보통 - 시장 평균 수준",
     (0, 50):   "주의 - 추가 분석 필요",
-}
\ No newline at end of file
+}
+
+# 5) 유니버스 배치 / 스크리너 설정
+RESULTS_DB_PATH    = "data/results.db"  # 지표·점수 결과 저장소 (SQLite)
+SCREENER_PAGE_SIZE = 50                   # 스크리너 한 페이지 행 수
+
+# 6) 로컬 재무제표 저장소 (DART 일괄다운로드 덤프 적재 + API 조회 결과 캐시)
+STATEMENT_STORE_DIR = "data/statements"
+
+# 7) 가격 지표 증분 엔진 상태 파일
+PRICE_STATE_PATH = "data/price_state.pkl"
+
+# 8) 배치 체크포인트 / DART 사용한도 초과 시 대기
+CHECKPOINT_DIR = "data/checkpoints"
+QUOTA_WAIT_SECONDS = 3600
+
+# 9) 네거티브 캐시 (결과가 없던 조회를 사유별 기간 동안 생략)
+NEGATIVE_CACHE_PATH = "data/negative_cache.db"
+NEGATIVE_CACHE_TTL_DAYS = {
+    'NO_REPORT':      7,     # 보고서 없음 (새 공시가 나오면 scheduler 가 즉시 해제)
+    'PARSE_FAILURE':  30,    # 재무제표 형태가 아님 (금융지주 등)
+    'UNKNOWN_TICKER': 30,    # 고유번호/종목코드 없음 (상장폐지·비상장)
+    'FETCH_ERROR':    1/24,  # 일시적 조회 실패 (1시간)
+}
+
+# 10) 공유 HTTP 세션 (DART/KRX 커넥션 풀)
+HTTP_POOL_SIZE = 16    # 호스트별 유지할 keep-alive 커넥션 수
+HTTP_TIMEOUT   = 30    # 요청 기본 타임아웃(초)
+HTTP_RETRIES   = 3     # 5xx/연결 오류 재시도 횟수
+
+# 11) 오프라인 벤치마크 (benchmark.py)
+BENCH_FIXTURE_PATH  = "fixtures/bench_fixture.json"   # 기록된 DART/KRX 응답
+BENCH_BASELINE_PATH = "fixtures/bench_baseline.json"  # 비교 기준 결과
+BENCH_SIZES         = (1, 100, 2500)                  # 측정할 회사 수
+BENCH_TOLERANCE     = 0.25                            # 허용 시간 증가율
+
+# 12) 데이터 백엔드 (live: 실제 조회 / record: 조회 + 아카이브 기록 / replay: 아카이브만 사용)
+DATA_BACKEND      = "live"
+DATA_ARCHIVE_PATH = "data/archive.zip"   # record/replay 응답 아카이브 (zip)
+
+# 13) 업종 상대 지표 (KRX 업종 분류 기준)
+SECTOR_DIR       = "data/sectors"   # 업종 인덱스 / 업종별 분포 캐시
+SECTOR_MIN_COUNT = 10               # 표본이 이보다 적은 업종은 시장 전체 분포 사용
+
+# 14) 리스크 모델 / 포트폴리오 (portfolio.py)
+RISK_STATE_PATH            = "data/risk_state.pkl"   # 수익률 창 + 공분산 누적합 상태
+RISK_WINDOW                = 252     # 공분산 추정 구간 (거래일)
+PORTFOLIO_POSITION_CAP     = 0.05    # 종목당 최대 비중
+PORTFOLIO_SECTOR_CAP       = 0.25    # 업종당 최대 비중
+PORTFOLIO_MIN_TRADED_VALUE = 1e9     # 편입 최소 20일 평균 거래대금 (원)
+PORTFOLIO_RISK_AVERSION    = 20.0    # 위험회피계수 (클수록 분산 축소 쪽으로 기울어짐)
+
+# 15) 스트리밍 파이프라인 (수집 → 지표 → 점수 → 저장, pipeline.py)
+PIPELINE_QUEUE_SIZE = 64                # 단계 사이 큐에 쌓아 둘 최대 항목 수
+PIPELINE_MEMORY_MB  = 1024              # 큐에 머무는 데이터 합계 상한 (넘으면 디스크로 내려씀)
+PIPELINE_SPILL_DIR  = "data/spill"      # 상한 초과분 임시 저장 위치 (실행 종료 시 삭제)
+
+# 16) 지표·점수 메모이제이션 (입력 지문 + 설정 해시, memo.py)
+MEMO_DB_PATH   = "data/memo.db"   # 디스크 계층 (SQLite)
+MEMO_MAX_ITEMS = 4096             # 메모리 LRU 계층 항목 수 (계층별)
+
+# 17) asyncio API 동시 실행 한도 (aio.py)
+ASYNC_DART_CONCURRENCY = 8     # 동시에 진행할 DART 조회 수
+ASYNC_KRX_CONCURRENCY  = 8     # 동시에 진행할 KRX(pykrx) 조회 수
+ASYNC_CPU_CONCURRENCY  = 4     # 동시에 진행할 지표·점수 계산 수
+ASYNC_TIMEOUT          = 120   # 호출당 기본 제한 시간(초, 대기 시간 포함)
+
+# 18) 프로세스 풀 병렬 배치 (parallel.py, batch.py --workers)
+PARALLEL_WORKERS    = 1    # 지표·점수 계산 프로세스 수 (1 이면 스트리밍 파이프라인 사용)
+PARALLEL_CHUNK_SIZE = 50   # 작업 프로세스에 한 번에 넘기는 종목 수
+
+# 19) 장기 시세·점수 차트 (downsample.py, app.py)
+CHART_HISTORY_YEARS = 20       # 일별 시세를 불러올 기간 (년)
+CHART_WIDTH_PX      = 1200     # 차트 가로 해상도 기본값 (px)
+CHART_POINTS_PER_PX = 1.0      # 픽셀당 브라우저로 보낼 점 수 (점 예산 = 해상도 × 이 값)
+CHART_METHOD        = "lttb"   # 기본 다운샘플링 방식 (lttb / minmax)
+CHART_CACHE_ITEMS   = 256      # (종목, 구간, 해상도)별 다운샘플 결과 캐시 항목 수
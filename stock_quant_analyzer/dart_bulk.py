@@ -0,0 +1,206 @@
+# dart_bulk.py
+
+import csv
+import glob
+import argparse
+import logging
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend import MODES, use
+from data_provider import get_corp_list
+from statement_store import StatementStore
+from config import STATEMENT_STORE_DIR, DATA_BACKEND, DATA_ARCHIVE_PATH
+
+logger = logging.getLogger(__name__)
+
+# 재무제표종류 → sj_div ('포괄손익계산서' 를 '손익계산서' 보다 먼저 검사)
+SJ_DIVS = [
+    ("포괄손익계산서", "CIS"),
+    ("손익계산서",     "IS"),
+    ("재무상태표",     "BS"),
+    ("현금흐름표",     "CF"),
+    ("자본변동표",     "SCE"),
+]
+
+# 보고서종류 → reprt_code
+REPRT_CODES = {
+    "사업보고서":  "11011",
+    "반기보고서":  "11012",
+    "1분기보고서": "11013",
+    "3분기보고서": "11014",
+}
+
+# finstate_all 과 동일한 컬럼 구성
+FINSTATE_COLUMNS = [
+    "rcept_no", "reprt_code", "bsns_year", "corp_code", "stock_code", "sj_div", "sj_nm",
+    "account_id", "account_nm", "account_detail",
+    "thstrm_nm", "thstrm_amount", "thstrm_add_amount",
+    "frmtrm_nm", "frmtrm_amount", "frmtrm_add_amount",
+    "bfefrmtrm_nm", "bfefrmtrm_amount", "ord", "currency",
+]
+
+StatementKey = Tuple[str, int, str]   # (corp_code, year, reprt_code)
+
+
+def _amount_column(name: str) -> Optional[str]:
+    """덤프의 금액 컬럼명('당기', '당기 1분기 누적', '전기 반기 3개월', '전전기' 등)을 finstate_all 컬럼으로 매핑."""
+    name = name.strip()
+    if name.startswith("전전기"):
+        return "bfefrmtrm_amount"
+    if name.startswith("당기"):
+        return "thstrm_add_amount" if "누적" in name else "thstrm_amount"
+    if name.startswith("전기"):
+        return "frmtrm_add_amount" if "누적" in name else "frmtrm_amount"
+    return None
+
+
+def _sj_div(kind: str) -> Optional[str]:
+    for label, code in SJ_DIVS:
+        if label in kind:
+            return code
+    return None
+
+
+def to_finstate_shape(chunk: pd.DataFrame, corp_codes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    일괄다운로드 덤프 한 chunk 를 finstate_all 과 같은 컬럼 구성으로 변환합니다.
+    corp_codes(종목코드 → corp_code)가 없으면 종목코드를 corp_code 로 사용합니다.
+    """
+    chunk = chunk.loc[:, [c for c in chunk.columns if not c.startswith("Unnamed")]]
+    stock_code = chunk["종목코드"].str.strip("[] ")
+    kind = chunk["재무제표종류"].fillna("")
+
+    out = pd.DataFrame({
+        "rcept_no":       "",
+        "reprt_code":     chunk["보고서종류"].str.strip().map(REPRT_CODES),
+        "bsns_year":      chunk["결산기준일"].str[:4],
+        "corp_code":      stock_code.map(corp_codes) if corp_codes else stock_code,
+        "stock_code":     stock_code,
+        "sj_div":         kind.map(_sj_div),
+        "sj_nm":          kind.str.split(",").str[0].str.strip(),
+        # 구 덤프의 'ifrs_' 접두사를 finstate_all 의 'ifrs-full_' 로 통일
+        "account_id":     chunk["항목코드"].str.strip().str.replace(r"^ifrs_", "ifrs-full_", regex=True),
+        "account_nm":     chunk["항목명"].str.strip(),
+        "account_detail": "-",
+        "currency":       chunk["통화"].str.strip(),
+    }, index=chunk.index)
+    if corp_codes:
+        out["corp_code"] = out["corp_code"].fillna(stock_code)
+
+    for col in chunk.columns:
+        target = _amount_column(col)
+        if target:
+            out[target] = chunk[col].str.replace(",", "", regex=False).str.strip()
+
+    out["ord"] = out.groupby(["corp_code", "sj_div"], sort=False).cumcount().astype(str)
+    out = out.dropna(subset=["reprt_code", "sj_div"])
+    return out.reindex(columns=FINSTATE_COLUMNS)
+
+
+def read_dump(
+    path: str,
+    corp_codes: Optional[Dict[str, str]] = None,
+    chunksize: int = 100_000,
+    encoding: str = "cp949",
+) -> Iterator[pd.DataFrame]:
+    """덤프 파일(탭 구분 텍스트)을 chunksize 행씩 읽어 finstate_all 형태로 변환해 차례로 반환합니다."""
+    reader = pd.read_csv(
+        path, sep="\t", encoding=encoding, dtype=str, chunksize=chunksize,
+        quoting=csv.QUOTE_NONE, on_bad_lines="warn",
+    )
+    for chunk in reader:
+        yield to_finstate_shape(chunk, corp_codes)
+
+
+def iter_statements(
+    path: str,
+    corp_codes: Optional[Dict[str, str]] = None,
+    chunksize: int = 100_000,
+    encoding: str = "cp949",
+) -> Iterator[Tuple[StatementKey, str, pd.DataFrame]]:
+    """
+    덤프 파일에서 (키, sj_div, 해당 기업 행) 을 순서대로 꺼냅니다.
+    덤프는 회사 단위로 연속 정렬돼 있으므로 chunk 경계에 걸친 마지막 회사만 다음 chunk 로 넘깁니다.
+    """
+    pending: Optional[pd.DataFrame] = None
+    for chunk in read_dump(path, corp_codes, chunksize, encoding):
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        if chunk.empty:
+            continue
+        key = chunk["corp_code"] + "|" + chunk["bsns_year"] + "|" + chunk["reprt_code"] + "|" + chunk["sj_div"]
+        tail = key == key.iloc[-1]
+        pending = chunk[tail]
+        for _, group in chunk[~tail].groupby(key[~tail], sort=False):
+            yield _key(group), group["sj_div"].iloc[0], group
+    if pending is not None and not pending.empty:
+        yield _key(pending), pending["sj_div"].iloc[0], pending
+
+
+def _key(group: pd.DataFrame) -> StatementKey:
+    row = group.iloc[0]
+    return row["corp_code"], int(row["bsns_year"]), row["reprt_code"]
+
+
+def ingest_dumps(
+    paths: List[str],
+    store: StatementStore,
+    corp_codes: Optional[Dict[str, str]] = None,
+    chunksize: int = 100_000,
+    encoding: str = "cp949",
+) -> int:
+    """
+    덤프 파일들을 스트리밍으로 읽어 StatementStore 에 (corp_code, year, reprt_code) 단위로 저장합니다.
+    반환: 저장한 (키, 재무제표 종류) 묶음 수
+    """
+    written = 0
+    stock_to_corp: Dict[str, str] = {}
+    for path in paths:
+        seen = set()
+        for key, sj_div, group in iter_statements(path, corp_codes, chunksize, encoding):
+            corp_code, year, reprt_code = key
+            # 같은 파일 안에서 다시 나타난 키(비정렬 덤프)는 덮어쓰지 않고 이어 붙임
+            store.put_part(corp_code, year, reprt_code, sj_div, group, append=(key, sj_div) in seen)
+            seen.add((key, sj_div))
+            if corp_codes:
+                stock_to_corp[group["stock_code"].iloc[0]] = corp_code
+            written += 1
+        logger.info(f"덤프 적재 완료: {path} (누적 {written}건)")
+    store.flush()
+    if stock_to_corp:
+        store.register_codes(stock_to_corp)
+    return written
+
+
+def corp_code_map(corp_list: pd.DataFrame) -> Dict[str, str]:
+    """get_corp_list() 결과에서 상장사의 종목코드 → corp_code 매핑을 만듭니다."""
+    if corp_list is None or corp_list.empty:
+        return {}
+    listed = corp_list[corp_list["stock_code"].fillna("").str.strip() != ""]
+    return dict(zip(listed["stock_code"].str.strip(), listed["corp_code"]))
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="DART 재무정보 일괄다운로드 덤프 적재")
+    parser.add_argument("paths", nargs="+", help="덤프 파일 경로 (glob 패턴 가능)")
+    parser.add_argument("--store", default=STATEMENT_STORE_DIR, help="재무제표 저장소 경로")
+    parser.add_argument("--encoding", default="cp949", help="덤프 파일 인코딩")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="한 번에 읽을 행 수")
+    parser.add_argument("--backend", default=DATA_BACKEND, choices=MODES, help="데이터 백엔드 (record/replay: 응답 아카이브)")
+    parser.add_argument("--archive", default=DATA_ARCHIVE_PATH, help="record/replay 아카이브 경로")
+    args = parser.parse_args()
+    use(args.backend, args.archive)
+
+    paths = sorted({p for pattern in args.paths for p in glob.glob(pattern)})
+    # 덤프에는 종목코드만 있으므로 DART 고유번호 목록으로 corp_code 를 찾아 그 기준으로 저장
+    corp_codes = corp_code_map(get_corp_list())
+    if not corp_codes:
+        logger.warning("고유번호 목록을 받지 못해 종목코드를 corp_code 로 사용합니다.")
+    store = StatementStore(args.store)
+    ingest_dumps(paths, store, corp_codes, chunksize=args.chunksize, encoding=args.encoding)
+
+
+if __name__ == "__main__":
+    main()
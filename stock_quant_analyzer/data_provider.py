@@ -1,113 +1,421 @@
 # data_provider.py
 
-import os
 import logging
 import pandas as pd
-from OpenDartReader.dart import OpenDartReader
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
 from pykrx import stock
-from config import DART_API_KEY
+from statement_store import ANNUAL, StatementStore
+from snapshot import FinancialSnapshot
+from price_engine import PriceMetricEngine, price_metrics
+from factors import FACTORS, single_ticker_factors
+from metric_graph import INPUTS
+from ttm import QUARTERS, build_ttm
+from http_session import QuotaExceededError, dart_reader, get_session
+from negative_cache import FETCH_ERROR, NO_REPORT, PARSE_FAILURE, UNKNOWN_TICKER, NegativeCache
 
 logger = logging.getLogger(__name__)
 
-# DART API 인스턴스 초기화
-_dart = OpenDartReader(os.getenv("DART_API_KEY", DART_API_KEY))
+# DART API 인스턴스 초기화 (공유 HTTP 세션 사용)
+_dart = dart_reader()
+
+class FetchError(RuntimeError):
+    """
+    네트워크 등 일시적 조회 실패 (strict=True 일 때만 발생).
+    배치는 이 예외를 받은 종목을 부분 데이터로 점수화하지 않고 failed 로 기록해 --resume 에서 다시 조회합니다.
+    """
 
 
+DART_FINSTATE_URL = "https://opendart.fss.or.kr/api/fnlttSinglAcntAll.json"
+QUOTA_STATUS = "020"   # DART Open API 사용한도 초과
+NO_DATA_STATUS = "013"  # 조회된 데이터 없음
+
 def get_corp_list() -> pd.DataFrame:
     """
     모든 상장/비상장 기업의 corp_code 및 corp_name을 담은 DataFrame을 반환합니다.
     """
     try:
-        return _dart.corp_list()
+        return _dart.corp_codes.copy()
     except Exception as e:
         logger.error(f"corp_list 조회 실패: {e}", exc_info=True)
         return pd.DataFrame()
 
 
-def get_combined_data(code: str, year: int) -> dict:
+BENCHMARK_INDEX = "1001"   # KOSPI
+
+
+@lru_cache(maxsize=16)
+def get_benchmark(start: str, end: str, ticker: str = BENCHMARK_INDEX) -> pd.Series:
+    """지수 종가 Series (베타 계산용). 같은 구간은 한 번만 조회합니다."""
+    try:
+        return stock.get_index_ohlcv_by_date(start, end, ticker)['종가']
+    except Exception as e:
+        logger.warning(f"지수({ticker}) 시세 조회 실패: {e}")
+        return pd.Series(dtype=float)
+
+
+def get_price_history(ticker: str, start: str, end: str) -> pd.Series:
+    """종목의 일별 종가 Series (장기 차트용, 10~20년 구간도 한 번에 조회). 실패 시 빈 Series."""
+    try:
+        close = stock.get_market_ohlcv_by_date(start, end, ticker)['종가']
+    except Exception as e:
+        logger.warning(f"[{ticker}] 장기 시세 조회 실패: {e}")
+        return pd.Series(dtype=float)
+    # 거래정지(종가 0)는 결측으로 처리
+    return close.where(close > 0).astype(float)
+
+
+def get_sector_classifications(date: str, markets=("KOSPI", "KOSDAQ")) -> pd.DataFrame:
+    """
+    KRX 업종 분류를 stock_code / sector(업종명) / market 컬럼으로 반환합니다.
+    date 가 휴장일이면 직전 거래일 기준으로 조회합니다.
+    """
+    try:
+        date = stock.get_nearest_business_day_in_a_week(date, prev=True)
+    except Exception as e:
+        logger.warning(f"[{date}] 거래일 조회 실패: {e}")
+    frames = []
+    for market in markets:
+        try:
+            df = stock.get_market_sector_classifications(date, market)
+        except Exception as e:
+            logger.warning(f"[{date}] {market} 업종 분류 조회 실패: {e}")
+            continue
+        if df is None or df.empty:
+            continue
+        frames.append(pd.DataFrame({"stock_code": df.index.astype(str), "sector": df["업종명"].values, "market": market}))
+    if not frames:
+        return pd.DataFrame(columns=["stock_code", "sector", "market"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_price_state(path: str, end: str) -> pd.DataFrame:
+    """
+    price_engine 의 일일 갱신 상태를 읽어 end(YYYYMMDD) 로 끝나는 시세 구간의 Mom12M/Volatility 로 반환합니다
+    (index=종목코드, 결측 행 제외). 파일이 없으면 FileNotFoundError,
+    상태가 end 직전 거래일까지 반영된 것이 아니면(다른 시점의 값) ValueError.
+    """
+    engine = PriceMetricEngine.load(path)
+    try:
+        day = stock.get_nearest_business_day_in_a_week(end, prev=True)
+    except Exception as e:
+        logger.warning(f"[{end}] 거래일 조회 실패: {e}")
+        day = end
+    if engine.last_date != day:
+        raise ValueError(f"상태 기준일 {engine.last_date} 이 시세 구간 끝 {end} (거래일 {day}) 과 다릅니다")
+    return engine.to_frame().dropna()
+
+
+def get_price_panel(start: str, end: str, market: str = "ALL") -> Dict[str, pd.DataFrame]:
+    """
+    구간 내 거래일마다 전 종목 시세를 한 번씩 조회해 (날짜 × 종목) 패널로 반환합니다.
+    종목별 get_market_ohlcv_by_date 를 수천 번 호출하는 대신 거래일 수만큼만 호출합니다.
+
+    Returns:
+        {'close': 종가 패널, 'value': 거래대금 패널}
+    """
+    closes, values = {}, {}
+    for day in stock.get_previous_business_days(fromdate=start, todate=end):
+        date = day.strftime("%Y%m%d")
+        try:
+            ohlcv = stock.get_market_ohlcv_by_ticker(date, market=market)
+        except Exception as e:
+            logger.warning(f"[{date}] 전 종목 시세 조회 실패: {e}")
+            continue
+        closes[day] = ohlcv['종가']
+        values[day] = ohlcv['거래대금']
+    close = pd.DataFrame(closes).T.sort_index()
+    value = pd.DataFrame(values).T.sort_index()
+    # 거래정지(종가 0)는 결측으로 처리
+    return {'close': close.where(close > 0), 'value': value}
+
+
+def get_filings(start: str, end: str, kind: str = "A") -> pd.DataFrame:
+    """
+    기간 내 DART 공시목록을 반환합니다 (kind='A': 정기공시).
+    정정 공시도 캐시 무효화 대상이므로 최종보고서만으로 거르지 않습니다.
+    """
+    try:
+        return _dart.list(start=start, end=end, kind=kind, final=False)
+    except Exception as e:
+        logger.error(f"공시목록 조회 실패 ({start}~{end}): {e}", exc_info=True)
+        return pd.DataFrame()
+
+
+def split_statements(full_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """finstate_all 형태의 DataFrame을 {'bs','is','cf'} 로 나눕니다."""
+    if full_df is None or full_df.empty:
+        return {'bs': pd.DataFrame(), 'is': pd.DataFrame(), 'cf': pd.DataFrame()}
+    return {
+        'bs': full_df[full_df['sj_div'] == 'BS'].reset_index(drop=True),
+        'is': full_df[full_df['sj_div'] == 'IS'].reset_index(drop=True),
+        'cf': full_df[full_df['sj_div'] == 'CF'].reset_index(drop=True),
+    }
+
+
+def _finstate_all(code: str, year: int, reprt_code: str = ANNUAL, fs_div: str = "CFS") -> pd.DataFrame:
+    """
+    OpenDartReader.finstate_all 과 같은 결과를 반환합니다.
+    OpenDartReader 는 사용한도 초과(020)도 빈 DataFrame 으로 돌려주므로 직접 조회해 상태 코드를 구분합니다.
+    """
+    corp_code = _dart.find_corp_code(code)
+    if not corp_code:
+        raise LookupError(f'could not find "{code}"')
+    params = {
+        'crtfc_key':  _dart.api_key,
+        'corp_code':  corp_code,
+        'bsns_year':  year,
+        'reprt_code': reprt_code,
+        'fs_div':     fs_div,
+    }
+    jo = get_session().get(DART_FINSTATE_URL, params=params).json()
+    status = jo.get('status')
+    if status == QUOTA_STATUS:
+        raise QuotaExceededError(jo.get('message', 'DART 사용한도 초과'))
+    if status == NO_DATA_STATUS:
+        return pd.DataFrame()
+    if 'list' not in jo:
+        raise RuntimeError(f"DART 오류 {status}: {jo.get('message')}")
+    return pd.DataFrame(jo['list'])
+
+
+def _finstate(
+    code: str,
+    year: int,
+    store: Optional[StatementStore],
+    reprt_code: str = ANNUAL,
+    negative: Optional[NegativeCache] = None,
+    strict: bool = False,
+) -> pd.DataFrame:
+    """
+    로컬 저장소에 있으면 저장본을, 없으면 DART API 결과를 반환합니다.
+    API 로 받은 결과는 저장소에 기록해 두므로 같은 보고서는 한 번만 내려받습니다.
+    negative(NegativeCache)가 주어지면 결과가 없던 조합은 만료 전까지 조회하지 않고 빈 DataFrame 을 반환하며,
+    새로 실패한 조합은 사유 코드와 함께 기록합니다.
+    strict=True 면 일시적 조회 실패를 네거티브 캐시에 남기지 않고 FetchError 로 올려 보내며,
+    기존 FETCH_ERROR 기록도 무시하고 다시 조회합니다 (재시도는 호출 측 체크포인트가 담당).
+    """
+    if store is not None and store.has(code, year, reprt_code):
+        return store.get(code, year, reprt_code)
+    hit = negative.get(code, year, reprt_code) if negative is not None else None
+    if hit and not (strict and hit[0] == FETCH_ERROR):
+        return pd.DataFrame()
+    try:
+        full_df = _finstate_all(code, year, reprt_code)
+    except QuotaExceededError:
+        raise
+    except LookupError as e:
+        if negative is not None:
+            negative.add(code, year, reprt_code, UNKNOWN_TICKER, str(e))
+        raise
+    except Exception as e:
+        if strict:
+            raise FetchError(f"[{code}-{year}-{reprt_code}] DART 재무제표 조회 실패: {e}") from e
+        if negative is not None:
+            negative.add(code, year, reprt_code, FETCH_ERROR, str(e))
+        raise
+    if full_df is None or full_df.empty:
+        if negative is not None:
+            negative.add(code, year, reprt_code, NO_REPORT)
+        return pd.DataFrame()
+    if 'sj_div' not in full_df.columns:
+        if negative is not None:
+            negative.add(code, year, reprt_code, PARSE_FAILURE, f"columns={list(full_df.columns)[:10]}")
+        return pd.DataFrame()
+    if store is not None:
+        store.put(code, year, full_df, reprt_code)
+    return full_df
+
+
+def _snapshot(
+    code: str,
+    year: int,
+    reprt_code: str,
+    store: Optional[StatementStore],
+    negative: Optional[NegativeCache] = None,
+    strict: bool = False,
+) -> FinancialSnapshot:
+    try:
+        return FinancialSnapshot.from_statements(
+            split_statements(_finstate(code, year, store, reprt_code, negative, strict))
+        )
+    except (QuotaExceededError, FetchError):
+        raise
+    except Exception as e:
+        logger.error(f"[{code}-{year}-{reprt_code}] DART 재무제표 수집 실패: {e}", exc_info=True)
+        return FinancialSnapshot.blank(None, year, reprt_code)
+
+
+def get_ttm_snapshot(
+    code: str,
+    year: int,
+    reprt_code: str,
+    store: Optional[StatementStore] = None,
+    negative: Optional[NegativeCache] = None,
+    strict: bool = False,
+) -> FinancialSnapshot:
+    """
+    (year, reprt_code) 보고서 기준 최근 12개월(TTM) 재무 스냅샷을 반환합니다.
+    필요한 보고서는 (Y,q), (Y-1) 사업보고서, (Y-1,q) 세 개이며, store 가 있으면
+    이전 실행에서 받아 둔 보고서는 저장본을 쓰므로 새 분기가 나오면 그 분기만 조회합니다.
+    strict 는 _finstate 와 같습니다 (일시적 조회 실패 시 FetchError).
+    """
+    current = _snapshot(code, year, reprt_code, store, negative, strict)
+    annual_prev = _snapshot(code, year - 1, ANNUAL, store, negative, strict)
+    current_prev = _snapshot(code, year - 1, reprt_code, store, negative, strict) if QUARTERS[reprt_code] < 4 else None
+    return build_ttm(reprt_code, current, annual_prev, current_prev)
+
+
+def price_window(year: int, price_end: Optional[str] = None) -> Tuple[str, str]:
+    """
+    시세 조회 구간 (YYYYMMDD, YYYYMMDD).
+    기본은 사업연도 기준 {year-1}0101 ~ {year}1231, price_end 가 주어지면 그날로 끝나는 최근 2년 (시세만 갱신할 때).
+    """
+    if price_end is None:
+        return f"{year-1}0101", f"{year}1231"
+    end = pd.Timestamp(price_end)
+    start = end - pd.DateOffset(years=2) + pd.Timedelta(days=1)
+    return start.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+
+
+def get_combined_data(
+    code: str,
+    year: int,
+    store: Optional[StatementStore] = None,
+    compact: bool = False,
+    keep_raw: bool = False,
+    inputs: Optional[Iterable[str]] = None,
+    reprt_code: str = ANNUAL,
+    negative: Optional[NegativeCache] = None,
+    strict: bool = False,
+    price_end: Optional[str] = None,
+    metrics: Optional[Iterable[str]] = None,
+) -> dict:
     """
     DART 재무제표와 PyKrx 시세·펀더멘털을 함께 수집하여 반환합니다.
+    store(StatementStore)가 주어지면 적재된 재무제표를 우선 사용해 DART API 호출을 생략합니다.
+    compact=True 이면 재무제표 DataFrame 대신 필요한 계정만 담은 FinancialSnapshot 을
+    'dart' 로 반환하고 원본은 버립니다 (keep_raw=True 면 snapshot.raw 에 보관).
+    inputs(metric_graph.INPUTS 의 부분집합)가 주어지면 그 입력만 수집하고 나머지는 빈 값으로 둡니다.
+    metrics(metric_graph.plan 의 지표 집합)가 주어지면 그중에 factors.FACTORS 가 없을 때 가격 팩터를 계산하지 않습니다.
+    reprt_code 가 분기·반기 보고서(11013/11012/11014)면 'dart' 는 해당 보고서 기준
+    TTM FinancialSnapshot(get_ttm_snapshot)이며 compact 여부와 무관하게 스냅샷으로 반환합니다.
+    negative(NegativeCache)가 주어지면 결과가 없다고 기록된 보고서·시세 조회를 생략하고, 새 실패를 기록합니다.
+    strict=True 면 DART·PyKrx 조회가 일시적으로 실패했을 때 남은 데이터로 채우지 않고 FetchError 를 올립니다
+    (배치 경로: 부분 데이터로 점수를 매기지 않고 --resume 에서 재시도하도록). 종목을 찾을 수 없는 경우는 그대로 빈 값.
+    price_end(YYYYMMDD)가 주어지면 시세 구간을 사업연도 대신 그날로 끝나는 최근 2년으로 잡습니다 (price_window 참고).
 
     Returns:
         {
           'dart'    : {'bs': pd.DataFrame, 'is': pd.DataFrame, 'cf': pd.DataFrame},
           'is_prev' : pd.DataFrame,            # 전년도 손익계산서 추가
           'price'   : pd.DataFrame,            # OHLCV
-          'pykrx'   : dict                     # EPS, BPS, PER, PBR, DivYield, Mom12M, Volatility, FCFYield
+          'pykrx'   : dict                     # EPS, BPS, PER, PBR, DivYield, Mom12M, Volatility, MarketCap,
+                                               # FCFYield + factors.FACTORS (Mom1M, Beta, MaxDrawdown 등)
         }
     """
+    inputs = frozenset(INPUTS) if inputs is None else frozenset(inputs)
+    bs = is_ = cf = is_prev = pd.DataFrame()
+
     # 1) DART: 재무제표 (BS/IS/CF)
-    try:
-        full_df = _dart.finstate_all(code, year)
-        bs  = full_df[full_df['sj_div'] == 'BS'].reset_index(drop=True)
-        is_ = full_df[full_df['sj_div'] == 'IS'].reset_index(drop=True)
-        cf  = full_df[full_df['sj_div'] == 'CF'].reset_index(drop=True)
-        logger.info(f"[{code}-{year}] DART 재무제표 수집 완료 (BS:{len(bs)}, IS:{len(is_)}, CF:{len(cf)})")
-    except Exception as e:
-        logger.error(f"[{code}-{year}] DART 재무제표 수집 실패: {e}", exc_info=True)
-        bs = is_ = cf = pd.DataFrame()
+    ttm = None
+    if reprt_code != ANNUAL:
+        if "dart" in inputs:
+            ttm = get_ttm_snapshot(code, year, reprt_code, store, negative, strict)
+    elif "dart" in inputs:
+        try:
+            parts = split_statements(_finstate(code, year, store, negative=negative, strict=strict))
+            bs, is_, cf = parts['bs'], parts['is'], parts['cf']
+            logger.info(f"[{code}-{year}] DART 재무제표 수집 완료 (BS:{len(bs)}, IS:{len(is_)}, CF:{len(cf)})")
+        except (QuotaExceededError, FetchError):
+            raise
+        except Exception as e:
+            logger.error(f"[{code}-{year}] DART 재무제표 수집 실패: {e}", exc_info=True)
 
-    # — 추가 시작 —  
-    # 전년도 손익계산서(is_prev) 수집 (Revenue/NetIncome Growth 용)
-    try:
-        prev_full = _dart.finstate_all(code, year - 1)
-        is_prev = prev_full[prev_full['sj_div'] == 'IS'].reset_index(drop=True)
-    except Exception:
-        is_prev = pd.DataFrame()
-    # — 추가 끝 —  
+    # 전년도 손익계산서(is_prev) 수집 (Revenue/NetIncome Growth 용, TTM 은 스냅샷에 포함)
+    if "dart_prev" in inputs and reprt_code == ANNUAL:
+        try:
+            is_prev = split_statements(_finstate(code, year - 1, store, negative=negative, strict=strict))['is']
+        except (QuotaExceededError, FetchError):
+            raise
+        except Exception:
+            is_prev = pd.DataFrame()
 
     # 2) PyKrx: 일별 시세
-    try:
-        start = f"{year-1}0101"
-        end   = f"{year}1231"
-        price_df = stock.get_market_ohlcv_by_date(start, end, code)
-        logger.info(f"[{code}-{year}] PyKrx 시세 수집 완료 (rows:{len(price_df)})")
-    except Exception as e:
-        logger.error(f"[{code}-{year}] PyKrx 시세 수집 실패: {e}", exc_info=True)
-        price_df = pd.DataFrame()
+    start, end = price_window(year, price_end)
+    price_df = pd.DataFrame()
+    if "ohlcv" in inputs and not (negative is not None and negative.get(code, year, "ohlcv")):
+        try:
+            price_df = stock.get_market_ohlcv_by_date(start, end, code)
+            logger.info(f"[{code}-{year}] PyKrx 시세 수집 완료 (rows:{len(price_df)})")
+            if price_df.empty and negative is not None:
+                negative.add(code, year, "ohlcv", UNKNOWN_TICKER, "KRX 시세 없음")
+        except Exception as e:
+            if strict:
+                raise FetchError(f"[{code}-{year}] PyKrx 시세 조회 실패: {e}") from e
+            logger.error(f"[{code}-{year}] PyKrx 시세 수집 실패: {e}", exc_info=True)
+            price_df = pd.DataFrame()
 
     # 3) PyKrx: 펀더멘털 + 모멘텀 + 변동성 + FCFYield
     pkrx_f = {}
     if not price_df.empty:
         # 펀더멘털
         last_date = price_df.index[-1].strftime("%Y%m%d")
-        try:
-            fund = stock.get_market_fundamental_by_date(last_date, last_date, code).iloc[0]
-            pkrx_f.update({
-                'EPS':      fund['EPS'],
-                'BPS':      fund['BPS'],
-                'PER':      fund['PER'],
-                'PBR':      fund['PBR'],
-                'DivYield': fund['DIV'],
-            })
-        except Exception as e:
-            logger.warning(f"[{code}-{year}] PyKrx 펀더멘털 조회 실패: {e}")
+        if "fundamental" in inputs:
+            try:
+                fund = stock.get_market_fundamental_by_date(last_date, last_date, code).iloc[0]
+                pkrx_f.update({
+                    'EPS':      fund['EPS'],
+                    'BPS':      fund['BPS'],
+                    'PER':      fund['PER'],
+                    'PBR':      fund['PBR'],
+                    'DivYield': fund['DIV'],
+                })
+            except Exception as e:
+                if strict and not isinstance(e, (IndexError, KeyError)):   # 빈 결과·컬럼 없음은 데이터 없음으로 취급
+                    raise FetchError(f"[{code}-{year}] PyKrx 펀더멘털 조회 실패: {e}") from e
+                logger.warning(f"[{code}-{year}] PyKrx 펀더멘털 조회 실패: {e}")
 
-        # 모멘텀
-        try:
-            pkrx_f['Mom12M'] = price_df['종가'].iloc[-1] / price_df['종가'].iloc[0] - 1
-        except Exception:
-            pkrx_f['Mom12M'] = None
+        # 모멘텀 + 변동성 + 가격 팩터 (metrics 에서 재계산하지 않도록 여기서 한 번만, 가격 팩터는 필요할 때만)
+        pkrx_f.update(price_metrics(price_df['종가']))
+        if metrics is None or not frozenset(metrics).isdisjoint(FACTORS):
+            benchmark = get_benchmark(start, end) if "benchmark" in inputs else None
+            pkrx_f.update(single_ticker_factors(price_df, benchmark))
 
-        # 변동성
-        try:
-            ret = price_df['종가'].pct_change().dropna()
-            pkrx_f['Volatility'] = ret.std() * (252 ** 0.5)
-        except Exception:
-            pkrx_f['Volatility'] = None
-
-        # FCFYield
+        # 시가총액 + FCFYield
+        if "market_cap" in inputs:
+            try:
+                pkrx_f['MarketCap'] = stock.get_market_cap_by_date(last_date, last_date, code).iloc[0]['시가총액']
+            except Exception as e:
+                if strict and not isinstance(e, (IndexError, KeyError)):   # 빈 결과·컬럼 없음은 데이터 없음으로 취급
+                    raise FetchError(f"[{code}-{year}] PyKrx 시가총액 조회 실패: {e}") from e
+                logger.warning(f"[{code}-{year}] PyKrx 시가총액 조회 실패: {e}")
         try:
             op_cf  = int(cf.loc[cf['account_nm'].str.contains('영업활동현금흐름'), 'thstrm_amount'].iloc[0])
             inv_cf = int(cf.loc[cf['account_nm'].str.contains('투자활동현금흐름'), 'thstrm_amount'].iloc[0])
-            mcap   = stock.get_market_cap_by_date(last_date, last_date, code).iloc[0]['시가총액']
+            mcap   = pkrx_f['MarketCap']
             pkrx_f['FCFYield'] = (op_cf + inv_cf) / mcap if mcap else None
         except Exception:
             pkrx_f['FCFYield'] = None
 
+    if reprt_code != ANNUAL:
+        return {
+            'dart':  ttm or FinancialSnapshot.blank(None, year, reprt_code),
+            'price': price_df,
+            'pykrx': pkrx_f,
+        }
+
+    if compact:
+        snapshot = FinancialSnapshot.from_statements({'bs': bs, 'is': is_, 'cf': cf}, is_prev, keep_raw=keep_raw)
+        return {
+            'dart':  snapshot,
+            'price': price_df,
+            'pykrx': pkrx_f,
+        }
+
     return {
         'dart':    {'bs': bs, 'is': is_, 'cf': cf},
         'is_prev': is_prev,   # 전년도 IS 추가
         'price':   price_df,
         'pykrx':   pkrx_f,
-    }
\ No newline at end of file
+    }
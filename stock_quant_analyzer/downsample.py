@@ -0,0 +1,134 @@
+# downsample.py
+
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+from config import CHART_WIDTH_PX, CHART_POINTS_PER_PX, CHART_METHOD, CHART_CACHE_ITEMS
+
+# 다운샘플링 방식
+LTTB = "lttb"       # Largest-Triangle-Three-Buckets: 모양(추세·굴곡) 보존
+MINMAX = "minmax"   # 구간별 최솟값·최댓값: 급등락(스파이크) 보존
+METHODS = (LTTB, MINMAX)
+
+
+# ---------------------------------------------------------------------- #
+# 1. 인덱스 선택
+# ---------------------------------------------------------------------- #
+def point_budget(width_px: int, points_per_px: float = CHART_POINTS_PER_PX) -> int:
+    """차트 가로 픽셀 수로 정한 브라우저 전송 점 수 (최소 3)."""
+    return max(3, int(width_px * points_per_px))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    LTTB 로 n 개 점의 위치를 고릅니다. 처음·끝 점은 항상 포함하고,
+    가운데 구간마다 (직전 선택점, 다음 구간 평균)과 만드는 삼각형 넓이가 가장 큰 점을 고릅니다.
+    """
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # 구간 경계를 정수 연산으로 잡아 모든 가운데 점이 정확히 한 구간에 속하게 함
+    edges = 1 + (np.arange(n - 1) * (size - 2)) // (n - 2)
+    out = np.empty(n, dtype=np.int64)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt = slice(end, edges[i + 2]) if i + 2 < n - 1 else slice(size - 1, size)
+        avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y: np.ndarray, n: int) -> np.ndarray:
+    """구간 (n-2)/2 개마다 최솟값·최댓값 위치를 고릅니다 (처음·끝 점 포함 최대 n 개, 위치 순 정렬)."""
+    size = len(y)
+    if n >= size or n < 4:
+        return np.arange(size)
+    y = np.asarray(y, dtype=float)
+    buckets = (n - 2) // 2
+    edges = (np.arange(buckets + 1) * size) // buckets
+    picked = [0, size - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            chunk = y[start:end]
+            picked += [start + int(np.argmin(chunk)), start + int(np.argmax(chunk))]
+    return np.unique(picked)
+
+
+def downsample(series: pd.Series, n: int, method: str = CHART_METHOD) -> pd.Series:
+    """
+    시계열을 최대 n 개 점으로 줄입니다 (결측 제외). 날짜 인덱스는 시각 값을 x 로 씁니다.
+    n 이상이면 결측만 뺀 원본을 그대로 반환합니다.
+    """
+    if method not in METHODS:
+        raise ValueError(f"알 수 없는 다운샘플링 방식: {method} (가능: {', '.join(METHODS)})")
+    series = series.dropna()
+    if len(series) <= n:
+        return series
+    values = series.to_numpy(dtype=float)
+    if method == MINMAX:
+        idx = minmax_indices(values, n)
+    else:
+        index = series.index
+        x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(series))
+        idx = lttb_indices(x, values, n)
+    return series.iloc[idx]
+
+
+# ---------------------------------------------------------------------- #
+# 2. (종목, 구간, 해상도)별 캐시
+# ---------------------------------------------------------------------- #
+class ChartCache:
+    """
+    다운샘플 결과 LRU 캐시. 키는 (종목, 구간, 해상도, 방식) 에 창 안 데이터의 길이·마지막 시점을 더해,
+    새 시세가 들어오면 자동으로 다른 키가 됩니다. 여러 세션이 공유해도 되도록 잠금을 씁니다.
+    """
+
+    def __init__(self, max_items: int = CHART_CACHE_ITEMS):
+        self.max_items = max_items
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def cached(self, key: Hashable, compute: Callable[[], pd.Series]) -> pd.Series:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return value
+
+    def series(
+        self,
+        ticker: str,
+        series: pd.Series,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        width_px: int = CHART_WIDTH_PX,
+        method: str = CHART_METHOD,
+    ) -> pd.Series:
+        """
+        series 의 [start, end] 구간을 width_px 해상도의 점 예산으로 줄여 반환합니다.
+        확대(구간 축소) 시 같은 점 예산으로 다시 뽑으므로 좁은 구간일수록 원본에 가까워집니다.
+        """
+        window = series.loc[start:end]
+        last = window.index[-1] if len(window) else None
+        key = (ticker, start, end, width_px, method, len(window), last)
+        return self.cached(key, lambda: downsample(window, point_budget(width_px), method))
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,123 @@
+# factors.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+TRADING_DAYS = 252
+MONTH = 21   # 1개월 ≈ 21 거래일
+
+# 팩터 이름 → 설명 (METRIC_TARGETS 에 같은 이름으로 목표값 등록)
+FACTORS = {
+    "Mom1M":          "1개월 수익률",
+    "Mom3M":          "3개월 수익률",
+    "Mom6M":          "6개월 수익률",
+    "Mom12_1M":       "12-1개월 모멘텀 (최근 1개월 제외)",
+    "MaxDrawdown":    "최대 낙폭 (양수, 0.3 = -30%)",
+    "DownsideDev":    "연율화 하방 편차",
+    "Beta":           "KOSPI 대비 베타",
+    "AvgTradedValue": "최근 20일 평균 거래대금 (원)",
+}
+
+
+def _lag_return(close: pd.DataFrame, end_lag: int, start_lag: int) -> pd.Series:
+    """각 종목 (t-end_lag)/(t-start_lag) - 1. 거래정지일은 직전 종가로 채우고, 이력이 부족하면 NaN."""
+    values = close.ffill().to_numpy(dtype=float)
+    n = len(values)
+    if n <= start_lag:
+        return pd.Series(np.nan, index=close.columns)
+    return pd.Series(values[n - 1 - end_lag] / values[n - 1 - start_lag] - 1.0, index=close.columns)
+
+
+def _beta(returns: np.ndarray, market: np.ndarray) -> np.ndarray:
+    """종목별 결측을 고려한 베타 = cov(r, m) / var(m) (열 단위 벡터화)."""
+    valid = ~np.isnan(returns) & ~np.isnan(market)[:, None]
+    r = np.where(valid, returns, 0.0)
+    m = np.where(valid, market[:, None], 0.0)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (r * m).sum(axis=0) - r.sum(axis=0) * m.sum(axis=0) / n
+        var = (m * m).sum(axis=0) - m.sum(axis=0) ** 2 / n
+        beta = cov / var
+    beta[(n < 20) | (var <= 0)] = np.nan
+    return beta
+
+
+def compute_factors(
+    close: pd.DataFrame,
+    traded_value: Optional[pd.DataFrame] = None,
+    benchmark: Optional[pd.Series] = None,
+    window: int = TRADING_DAYS,
+) -> pd.DataFrame:
+    """
+    (날짜 × 종목) 종가 패널로 전 종목 가격 팩터를 한 번에 계산합니다.
+    - close:        종가 패널 (index=날짜 오름차순, columns=종목코드)
+    - traded_value: 거래대금 패널 (없으면 AvgTradedValue 는 NaN)
+    - benchmark:    KOSPI 등 지수 종가 Series (없으면 Beta 는 NaN)
+    - window:       MaxDrawdown/DownsideDev/Beta 계산 구간 (거래일)
+    반환: index=종목코드, columns=FACTORS 인 DataFrame
+    """
+    close = close.sort_index().astype(float)
+    out = pd.DataFrame(index=close.columns)
+
+    # 1) 다기간 모멘텀
+    out["Mom1M"] = _lag_return(close, 0, MONTH)
+    out["Mom3M"] = _lag_return(close, 0, 3 * MONTH)
+    out["Mom6M"] = _lag_return(close, 0, 6 * MONTH)
+    out["Mom12_1M"] = _lag_return(close, MONTH, 12 * MONTH)
+
+    # 2) 최근 window 구간 리스크
+    recent = close.iloc[-(window + 1):].to_numpy()
+    observed = (~np.isnan(recent)).sum(axis=0)
+    peak = np.fmax.accumulate(np.where(np.isnan(recent), -np.inf, recent), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        drawdown = np.where(np.isnan(recent), 0.0, 1.0 - recent / peak)
+        returns = recent[1:] / recent[:-1] - 1.0
+    out["MaxDrawdown"] = np.where(observed >= 2, drawdown.max(axis=0), np.nan)
+
+    valid = ~np.isnan(returns)
+    downside = np.where(valid & (returns < 0), returns, 0.0)
+    n_ret = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["DownsideDev"] = np.where(
+            n_ret > 0, np.sqrt((downside ** 2).sum(axis=0) / n_ret) * np.sqrt(TRADING_DAYS), np.nan
+        )
+
+    # 3) 베타
+    if benchmark is not None and len(recent) > 1:
+        bench = benchmark.reindex(close.index).astype(float).iloc[-(window + 1):].to_numpy()
+        out["Beta"] = _beta(returns, bench[1:] / bench[:-1] - 1.0)
+    else:
+        out["Beta"] = np.nan
+
+    # 4) 유동성
+    if traded_value is not None:
+        out["AvgTradedValue"] = traded_value.sort_index().iloc[-20:].mean().reindex(out.index)
+    else:
+        out["AvgTradedValue"] = np.nan
+
+    return out
+
+
+def single_ticker_factors(price_df: pd.DataFrame, benchmark: Optional[pd.Series] = None) -> Dict[str, Optional[float]]:
+    """
+    종목 하나의 pykrx OHLCV DataFrame 에 대해 compute_factors 를 적용합니다.
+    거래대금 컬럼이 없으면 종가 × 거래량으로 대신합니다.
+    거래정지(종가 0)는 get_price_panel 과 같이 결측으로 처리해 패널 계산과 같은 값을 냅니다.
+    """
+    if price_df is None or price_df.empty or "종가" not in price_df.columns:
+        return {name: None for name in FACTORS}
+
+    close = price_df[["종가"]].rename(columns={"종가": "_"})
+    close = close.where(close > 0)
+    if "거래대금" in price_df.columns:
+        value = price_df[["거래대금"]]
+    elif "거래량" in price_df.columns:
+        value = (price_df["종가"] * price_df["거래량"]).to_frame()
+    else:
+        value = None
+    if value is not None:
+        value.columns = ["_"]
+
+    row = compute_factors(close, value, benchmark).iloc[0]
+    return {name: (None if pd.isna(row[name]) else float(row[name])) for name in FACTORS}
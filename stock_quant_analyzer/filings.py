@@ -0,0 +1,65 @@
+# filings.py
+
+import re
+import pandas as pd
+from typing import Optional, Set, Tuple
+from statement_store import ANNUAL
+from ttm import QUARTERS
+
+# DART 공시목록(list.json) report_nm 예: "사업보고서 (2023.12)", "[기재정정]반기보고서 (2024.06)"
+_PERIODIC = re.compile(r"(사업|반기|분기)보고서\s*\((\d{4})\.(\d{2})\)")
+FILING_COLUMNS = ["corp_code", "corp_name", "stock_code", "report_nm", "rcept_no", "rcept_dt"]
+
+Report = Tuple[int, str]   # (year, reprt_code)
+
+
+def parse_report_name(report_nm: str) -> Optional[Report]:
+    """
+    정기보고서 이름을 (사업연도, reprt_code) 로 변환합니다. 정기보고서가 아니면 None.
+    분기보고서는 보고기간 월로 1분기(3월)/3분기(9월)를 구분합니다 (12월 결산 기준).
+    """
+    match = _PERIODIC.search(report_nm or "")
+    if not match:
+        return None
+    kind, year, month = match.group(1), int(match.group(2)), int(match.group(3))
+    if kind == "사업":
+        return year, ANNUAL
+    if kind == "반기":
+        return year, "11012"
+    return year, ("11013" if month <= 3 else "11014")
+
+
+def load_filings(path: str) -> pd.DataFrame:
+    """로컬에 저장해 둔 공시목록(csv/json/jsonl)을 읽습니다. DART list 조회 대신 테스트·재실행용."""
+    if path.endswith(".jsonl"):
+        df = pd.read_json(path, lines=True, dtype=str)
+    elif path.endswith(".json"):
+        df = pd.read_json(path, dtype=str)
+    else:
+        df = pd.read_csv(path, dtype=str)
+    return df.reindex(columns=FILING_COLUMNS)
+
+
+def periodic_reports(filings: pd.DataFrame) -> pd.DataFrame:
+    """
+    공시목록에서 정기보고서만 골라 (corp_code, stock_code, corp_name, year, reprt_code) 로 반환합니다.
+    같은 보고서의 정정 공시가 여러 건이면 한 행으로 합칩니다.
+    """
+    columns = ["corp_code", "stock_code", "corp_name", "year", "reprt_code"]
+    if filings is None or filings.empty:
+        return pd.DataFrame(columns=columns)
+    parsed = filings["report_nm"].map(parse_report_name)
+    hit = filings[parsed.notna()].copy()
+    if hit.empty:
+        return pd.DataFrame(columns=columns)
+    hit["year"] = [p[0] for p in parsed[parsed.notna()]]
+    hit["reprt_code"] = [p[1] for p in parsed[parsed.notna()]]
+    hit["stock_code"] = hit["stock_code"].fillna("").astype(str).str.strip()
+    return hit[columns].drop_duplicates(["corp_code", "year", "reprt_code"]).reset_index(drop=True)
+
+
+def relevant_reports(year: int, reprt_code: str = ANNUAL) -> Set[Report]:
+    """(year, reprt_code) 기준 점수 계산에 쓰이는 보고서 집합 (data_provider 수집 범위와 동일)."""
+    if QUARTERS[reprt_code] == 4:
+        return {(year, ANNUAL), (year - 1, ANNUAL)}
+    return {(year, reprt_code), (year - 1, ANNUAL), (year - 1, reprt_code)}
@@ -0,0 +1,155 @@
+# http_session.py
+
+import os
+import sys
+import logging
+import importlib
+import requests
+from functools import lru_cache
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import DART_API_KEY, HTTP_POOL_SIZE, HTTP_TIMEOUT, HTTP_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# requests 를 모듈 전역으로 사용하는 OpenDartReader 하위 모듈
+DART_MODULES = (
+    "OpenDartReader._utils", "OpenDartReader.dart", "OpenDartReader.dart_event",
+    "OpenDartReader.dart_finstate", "OpenDartReader.dart_list", "OpenDartReader.dart_regstate",
+    "OpenDartReader.dart_report", "OpenDartReader.dart_search", "OpenDartReader.dart_share",
+    "OpenDartReader.dart_utils", "OpenDartReader.search",
+)
+KRX_MODULE = "pykrx.website.comm.webio"
+
+_DART_HOST = "opendart.fss.or.kr"
+_QUOTA_MARK = b'"status":"020"'   # DART 사용한도 초과 응답
+
+
+class QuotaExceededError(RuntimeError):
+    """DART Open API 일일 사용한도 초과 (status 020). 배치는 이 예외를 받으면 대기 후 재시도합니다."""
+
+
+class PooledSession(requests.Session):
+    """keep-alive 커넥션 풀 + 재시도 + 기본 타임아웃을 갖춘 공유 세션."""
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, timeout: float = HTTP_TIMEOUT, retries: int = HTTP_RETRIES):
+        super().__init__()
+        self.timeout = timeout
+        retry = Retry(
+            total=retries, backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset({"GET", "POST"}),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        self.hooks["response"].append(_check_dart_quota)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def _check_dart_quota(response: requests.Response, *args, **kwargs) -> None:
+    """DART 응답 앞부분만 확인해 사용한도 초과를 예외로 바꿉니다 (빈 결과로 오인하지 않도록)."""
+    if _DART_HOST not in response.url or "json" not in response.headers.get("Content-Type", ""):
+        return
+    if _QUOTA_MARK in response.content[:64].replace(b" ", b""):
+        raise QuotaExceededError(f"DART 사용한도 초과: {response.url.split('?')[0]}")
+
+
+class _RequestsShim:
+    """
+    모듈 전역 requests 대신 주입하는 래퍼.
+    requests.get/post/Session() 호출이 모두 공유 세션으로 가고, 나머지 속성(예외 등)은 requests 그대로.
+    """
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def get(self, url, **kwargs):
+        return self._session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._session.post(url, **kwargs)
+
+    def Session(self):
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+_session: Optional[PooledSession] = None
+
+
+def get_session() -> PooledSession:
+    """프로세스 공유 세션 (처음 호출 시 생성하고 DART/KRX 백엔드에 주입)."""
+    global _session
+    if _session is None:
+        _session = PooledSession()
+        install(_session)
+    return _session
+
+
+def reset_session() -> None:
+    """
+    부모 프로세스에서 만든 세션을 버리고 새 세션을 만들어 다시 주입합니다.
+    fork 된 작업 프로세스가 부모의 keep-alive 커넥션(같은 소켓)을 함께 쓰지 않도록 초기화 시 호출합니다.
+    부모 세션은 닫지 않습니다 (닫으면 부모가 쓰는 소켓에 영향을 줄 수 있음).
+    """
+    global _session
+    if _session is not None:
+        _session = None
+        get_session()
+
+
+def install(session: requests.Session) -> None:
+    """OpenDartReader 와 pykrx 가 session 으로 요청하도록 주입합니다."""
+    shim = _RequestsShim(session)
+    # OpenDartReader 는 import 시 sys.modules['OpenDartReader'] 를 클래스로 바꾸므로
+    # 하위 모듈은 OpenDartReader.dart 를 불러온 뒤 sys.modules 에서 찾음
+    importlib.import_module("OpenDartReader.dart")
+    for name in DART_MODULES:
+        module = sys.modules.get(name)
+        if module is not None and hasattr(module, "requests"):
+            module.requests = shim
+
+    try:
+        webio = importlib.import_module(KRX_MODULE)
+    except ImportError:
+        return
+    # 비로그인 상태에서는 요청마다 requests.Session() 을 새로 만들므로 공유 세션으로 대체
+    webio.requests = shim
+    # 로그인 세션이 있으면 쿠키는 유지하고 커넥션 풀만 교체
+    krxs = webio.get_session()
+    if krxs is not None:
+        for prefix, adapter in session.adapters.items():
+            krxs.session.mount(prefix, adapter)
+
+
+@lru_cache(maxsize=1)
+def _open_reader():
+    from OpenDartReader.dart import OpenDartReader
+    get_session()
+    return OpenDartReader(os.getenv("DART_API_KEY", DART_API_KEY))
+
+
+class _LazyReader:
+    """
+    처음 속성에 접근할 때 OpenDartReader 를 만드는 핸들.
+    OpenDartReader 는 생성 시 고유번호 목록을 내려받으므로 import 만으로는 네트워크를 쓰지 않도록 미룹니다
+    (backend.use('replay') 처럼 조회 전에 백엔드를 바꾸는 경우).
+    """
+
+    def __getattr__(self, name):
+        return getattr(_open_reader(), name)
+
+
+_reader = _LazyReader()
+
+
+def dart_reader():
+    """공유 세션을 쓰는 OpenDartReader (프로세스당 하나, 첫 사용 시 생성)."""
+    return _reader
@@ -0,0 +1,231 @@
+# memo.py
+
+import os
+import json
+import pickle
+import sqlite3
+import hashlib
+import logging
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from config import MEMO_DB_PATH, MEMO_MAX_ITEMS
+
+logger = logging.getLogger(__name__)
+
+# 계층 이름
+METRICS = "metrics"   # calculate_metrics: METRICS_VERSION / ALIASES / SOURCES / FACTORS 에만 의존
+SCORE = "score"       # calculate_score:   SCORE_VERSION / SCORING_WEIGHTS / METRIC_TARGETS / SCORE_COMMENTS 에만 의존
+
+
+# ---------------------------------------------------------------------- #
+# 1. 입력 지문 / 설정 해시
+# ---------------------------------------------------------------------- #
+def _feed(h, obj: Any) -> None:
+    """obj 내용을 h 에 순서·타입까지 고정된 형태로 넣습니다."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode("utf-8"))
+    elif isinstance(obj, pd.DataFrame):
+        h.update(f"df:{list(obj.columns)!r}:{list(map(str, obj.dtypes))!r}:{obj.shape};".encode("utf-8"))
+        if len(obj):
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(f"s:{obj.name!r}:{obj.dtype}:{len(obj)};".encode("utf-8"))
+        if len(obj):
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"a:{obj.dtype}:{obj.shape};".encode("utf-8"))
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(f"d:{len(obj)};".encode("utf-8"))
+        for key in sorted(obj, key=str):
+            _feed(h, str(key))
+            _feed(h, obj[key])
+    elif isinstance(obj, (list, tuple, frozenset, set)):
+        items = sorted(obj, key=str) if isinstance(obj, (set, frozenset)) else obj
+        h.update(f"l:{len(items)};".encode("utf-8"))
+        for item in items:
+            _feed(h, item)
+    elif hasattr(obj, "get_prev"):
+        # FinancialSnapshot: 계정 금액 버퍼만으로 내용이 정해짐 (raw 는 지표 계산에 쓰이지 않음)
+        _feed(h, (obj.corp_code, obj.year, obj.reprt_code))
+        h.update(obj.values.tobytes())
+        h.update(obj.prev.tobytes())
+    else:
+        h.update(f"o:{obj!r};".encode("utf-8"))
+
+
+def fingerprint(*parts: Any) -> str:
+    """재무제표·시세·스냅샷·딕셔너리 입력의 내용 지문 (같은 내용이면 객체가 달라도 같은 값)."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _feed(h, part)
+    return h.hexdigest()
+
+
+def layer_hash(layer: str) -> str:
+    """
+    계층이 의존하는 설정과 계산식 버전(metrics.METRICS_VERSION / scorer.SCORE_VERSION)으로 만든 해시.
+    호출할 때마다 현재 값을 읽으므로 설정을 바꾸면 해당 계층만 새 키를 쓰게 됩니다
+    (예: 가중치 변경 시 지표는 그대로, 점수만 재계산). 계산식을 바꾸면 버전을 올려야 디스크 캐시가 무효화됩니다.
+    """
+    if layer == METRICS:
+        from metrics import ALIASES, SOURCES, METRICS_VERSION
+        from factors import FACTORS
+        payload = {"version": METRICS_VERSION, "aliases": ALIASES, "sources": SOURCES, "factors": list(FACTORS)}
+    elif layer == SCORE:
+        from config import SCORING_WEIGHTS, METRIC_TARGETS, SCORE_COMMENTS
+        from scorer import SCORE_VERSION
+        payload = {
+            "version": SCORE_VERSION, "weights": SCORING_WEIGHTS, "targets": METRIC_TARGETS,
+            "comments": sorted([list(k), v] for k, v in SCORE_COMMENTS.items()),
+        }
+    else:
+        raise ValueError(f"알 수 없는 메모 계층: {layer}")
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+# ---------------------------------------------------------------------- #
+# 2. 메모리 LRU + 디스크(SQLite) 2계층 캐시
+# ---------------------------------------------------------------------- #
+class Memo:
+    """
+    (계층, 설정 해시, 입력 지문) → 결과 캐시.
+    - 메모리: 계층별 최근 max_items 개 LRU
+    - 디스크: SQLite (path=None 이면 메모리 계층만 사용)
+    설정이 바뀐 계층의 예전 항목은 조회되지 않으며, purge() 로 지울 수 있습니다.
+    """
+
+    def __init__(self, path: Optional[str] = MEMO_DB_PATH, max_items: int = MEMO_MAX_ITEMS):
+        self.path = path
+        self.max_items = max_items
+        self._lru: Dict[str, OrderedDict] = {METRICS: OrderedDict(), SCORE: OrderedDict()}
+        self._lock = threading.Lock()
+        self.hits = {METRICS: 0, SCORE: 0}
+        self.misses = {METRICS: 0, SCORE: 0}
+        self.conn = None
+        if path:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS memo (
+                    layer      TEXT NOT NULL,
+                    config     TEXT NOT NULL,
+                    key        TEXT NOT NULL,
+                    value      BLOB NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (layer, config, key)
+                )
+            """)
+            self.conn.commit()
+
+    # ------------------------------------------------------------------ #
+    def get(self, layer: str, config: str, key: str) -> Tuple[bool, Any]:
+        """(찾았는지, 값). 디스크에서 찾은 값은 메모리 계층으로 올립니다."""
+        lru, slot = self._lru[layer], f"{config}:{key}"
+        with self._lock:
+            if slot in lru:
+                lru.move_to_end(slot)
+                self.hits[layer] += 1
+                return True, pickle.loads(lru[slot])
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT value FROM memo WHERE layer = ? AND config = ? AND key = ?", (layer, config, key),
+                ).fetchone()
+                if row is not None:
+                    self._remember(lru, slot, row[0])
+                    self.hits[layer] += 1
+                    return True, pickle.loads(row[0])
+            self.misses[layer] += 1
+            return False, None
+
+    def put(self, layer: str, config: str, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(self._lru[layer], f"{config}:{key}", blob)
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO memo (layer, config, key, value, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (layer, config, key, blob, datetime.datetime.now().isoformat(timespec="seconds")),
+                    )
+
+    def _remember(self, lru: OrderedDict, slot: str, blob: bytes) -> None:
+        # 값은 pickle 바이트로 보관해 호출자가 결과를 수정해도 캐시가 바뀌지 않게 함
+        lru[slot] = blob
+        lru.move_to_end(slot)
+        while len(lru) > self.max_items:
+            lru.popitem(last=False)
+
+    def cached(self, layer: str, key: str, compute: Callable[[], Any]) -> Any:
+        """현재 설정 해시로 (layer, key) 를 찾고, 없으면 compute() 결과를 저장해 반환합니다."""
+        config = layer_hash(layer)
+        found, value = self.get(layer, config, key)
+        if found:
+            return value
+        value = compute()
+        if value is not None:   # 실패(None)는 저장하지 않음 — 다음 호출에서 다시 시도
+            self.put(layer, config, key, value)
+        return value
+
+    # ------------------------------------------------------------------ #
+    def metrics(
+        self,
+        dart_data: Any,
+        price_df: pd.DataFrame,
+        pkrx_f: Dict[str, float],
+        benchmark: Optional[pd.Series] = None,
+        only: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Optional[float]]:
+        """calculate_metrics 의 메모이즈 버전 (인자 동일)."""
+        from metrics import calculate_metrics
+        key = fingerprint(dart_data, price_df, pkrx_f, benchmark, None if only is None else frozenset(only))
+        return self.cached(METRICS, key, lambda: calculate_metrics(dart_data, price_df, pkrx_f, benchmark, only))
+
+    def score(self, metrics: Dict[str, Optional[float]]):
+        """calculate_score 의 메모이즈 버전."""
+        from scorer import calculate_score
+        return self.cached(SCORE, fingerprint(metrics), lambda: calculate_score(metrics))
+
+    def purge(self) -> int:
+        """현재 설정 해시와 다른(설정 변경으로 더 이상 조회되지 않는) 디스크 항목을 지웁니다."""
+        if self.conn is None:
+            return 0
+        removed = 0
+        with self._lock, self.conn:
+            for layer in (METRICS, SCORE):
+                cur = self.conn.execute("DELETE FROM memo WHERE layer = ? AND config != ?", (layer, layer_hash(layer)))
+                removed += cur.rowcount
+        return removed
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {layer: {"hits": self.hits[layer], "misses": self.misses[layer]} for layer in (METRICS, SCORE)}
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default: Optional[Memo] = None
+
+
+def default_memo() -> Memo:
+    """프로세스 공유 Memo (MEMO_DB_PATH, 처음 호출 시 생성)."""
+    global _default
+    if _default is None:
+        _default = Memo()
+    return _default
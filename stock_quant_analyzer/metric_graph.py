@@ -0,0 +1,81 @@
+# metric_graph.py
+
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple
+from config import SCORING_WEIGHTS
+from factors import FACTORS
+
+# ------------------------------------------------------------------ #
+# 1. 입력 노드 (data_provider 가 수집하는 데이터 소스)
+# ------------------------------------------------------------------ #
+INPUTS = {
+    "dart":        "당기 재무제표 (BS/IS/CF)",
+    "dart_prev":   "전년도 손익계산서",
+    "ohlcv":       "일별 시세",
+    "fundamental": "PyKrx 펀더멘털 (EPS/BPS/PER/PBR/DIV)",
+    "market_cap":  "시가총액",
+    "benchmark":   "KOSPI 지수 종가",
+}
+
+# 입력 노드 간 의존 (펀더멘털·시가총액은 시세의 마지막 거래일 기준으로 조회)
+INPUT_DEPENDS = {
+    "fundamental": ("ohlcv",),
+    "market_cap":  ("ohlcv",),
+}
+
+# ------------------------------------------------------------------ #
+# 2. 지표 노드 → 필요한 입력 노드
+# ------------------------------------------------------------------ #
+METRIC_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "ROE":             ("dart",),
+    "OperatingMargin": ("dart",),
+    "ROA":             ("dart",),
+    "DebtRatio":       ("dart",),
+    "CurrentRatio":    ("dart",),
+    "RevenueGrowth":   ("dart", "dart_prev"),
+    "NetIncomeGrowth": ("dart", "dart_prev"),
+    "PER":             ("fundamental",),
+    "PBR":             ("fundamental",),
+    "DivYield":        ("fundamental",),
+    "Mom12M":          ("ohlcv",),
+    "Volatility":      ("ohlcv",),
+    "FCFYield":        ("dart", "market_cap"),
+}
+METRIC_INPUTS.update({name: ("ohlcv",) for name in FACTORS})
+METRIC_INPUTS["Beta"] = ("ohlcv", "benchmark")
+
+ALL_METRICS: FrozenSet[str] = frozenset(METRIC_INPUTS)
+# 재무제표 없이 시세·펀더멘털만으로 다시 계산할 수 있는 지표 (scheduler 의 시세 갱신용)
+DART_INPUTS = frozenset({"dart", "dart_prev"})
+PRICE_METRICS: FrozenSet[str] = frozenset(
+    name for name, inputs in METRIC_INPUTS.items() if not DART_INPUTS & set(inputs)
+)
+
+
+def active_metrics(weights: Optional[Mapping[str, float]] = None) -> FrozenSet[str]:
+    """가중치가 0 보다 큰 지표 집합 (기본: config.SCORING_WEIGHTS)."""
+    weights = SCORING_WEIGHTS if weights is None else weights
+    unknown = [name for name in weights if name not in METRIC_INPUTS]
+    if unknown:
+        raise ValueError(f"입력 정의가 없는 지표: {unknown}")
+    return frozenset(name for name, weight in weights.items() if weight and weight > 0)
+
+
+def required_inputs(metrics: Iterable[str]) -> FrozenSet[str]:
+    """지표 집합에서 도달 가능한 입력 노드 전체 (입력 간 의존 포함)."""
+    needed: Set[str] = set()
+    stack = [src for name in metrics for src in METRIC_INPUTS[name]]
+    while stack:
+        src = stack.pop()
+        if src not in needed:
+            needed.add(src)
+            stack.extend(INPUT_DEPENDS.get(src, ()))
+    return frozenset(needed)
+
+
+def plan(weights: Optional[Mapping[str, float]] = None) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    활성 가중치로 (계산할 지표, 수집할 입력) 을 결정합니다.
+    예) 모멘텀만 가중치가 있으면 입력은 {'ohlcv'} 뿐이라 DART 호출이 생략됩니다.
+    """
+    metrics = active_metrics(weights)
+    return metrics, required_inputs(metrics)
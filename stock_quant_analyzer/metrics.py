@@ -3,9 +3,16 @@
 import re
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
-from config import METRIC_TARGETS, DART_API_KEY
-from OpenDartReader.dart import OpenDartReader
+from typing import Dict, Iterable, Optional
+from config import METRIC_TARGETS
+from http_session import dart_reader
+from price_engine import price_metrics
+from factors import FACTORS, single_ticker_factors
+from metric_graph import ALL_METRICS
+
+# 지표 계산식 버전. 계산 방식(구간·결측 처리 등)을 바꾸면 올려서 메모 캐시(memo.METRICS 계층)를 무효화합니다.
+# 2: Mom12M/Volatility 를 최근 252 거래일 기준으로 (price_metrics), 3: 종목별 가격 팩터에서 거래정지일 제외
+METRICS_VERSION = 3
 
 # ------------------------------------------------------------------ #
 # 1. 계정명 Alias 정의
@@ -41,12 +48,26 @@ ALIASES = {
     "inv_cf": {"names": ["투자활동현금흐름", "net cash used in investing activities"]},
 }
 
+# 계정별 출처 재무제표
+SOURCES = {
+    "operating_income":    "is",
+    "revenue":             "is",
+    "net_income":          "is",
+    "total_assets":        "bs",
+    "equity":              "bs",
+    "total_liabilities":   "bs",
+    "current_assets":      "bs",
+    "current_liabilities": "bs",
+    "op_cf":               "cf",
+    "inv_cf":              "cf",
+}
+
 # ------------------------------------------------------------------ #
 def normalize(name: str) -> str:
     """영문/한글 계정명을 비교하기 전에 전처리(공백·괄호·Zero width 제거)."""
     return re.sub(r"[\s()\u200b]", "", name).lower()
 
-def _lookup(df: pd.DataFrame, aliases: Dict[str, list]) -> Optional[float]:
+def _match_row(df: pd.DataFrame, aliases: Dict[str, list]) -> Optional[pd.Series]:
     """
     1) account_id 우선
     2) account_nm normalize 후 exact 매칭
@@ -59,108 +80,150 @@ def _lookup(df: pd.DataFrame, aliases: Dict[str, list]) -> Optional[float]:
     if "account_id" in df.columns and aliases.get("ids"):
         hit = df[df["account_id"].isin(aliases["ids"])]
         if not hit.empty:
-            return pd.to_numeric(hit["thstrm_amount"], errors="coerce").iloc[0]
+            return hit.iloc[0]
 
     # 2) account_nm exact
     if aliases.get("names"):
         targets = [normalize(x) for x in aliases["names"]]
-        df["__nm__"] = df["account_nm"].map(normalize)
+        if "__nm__" not in df.columns:
+            df["__nm__"] = df["account_nm"].map(normalize)
         exact = df[df["__nm__"].isin(targets)]
         if not exact.empty:
-            return pd.to_numeric(exact["thstrm_amount"], errors="coerce").iloc[0]
+            return exact.iloc[0]
 
         # 3) contains fallback
         pattern = "|".join(targets)
         contains = df[df["__nm__"].str.contains(pattern, na=False)]
         if not contains.empty:
-            return pd.to_numeric(contains["thstrm_amount"], errors="coerce").iloc[0]
+            return contains.iloc[0]
 
     return None
 
+def _lookup(df: pd.DataFrame, aliases: Dict[str, list], column: str = "thstrm_amount") -> Optional[float]:
+    """_match_row 로 찾은 계정 행의 금액(column)을 숫자로 반환합니다."""
+    row = _match_row(df, aliases)
+    if row is None or column not in row.index:
+        return None
+    value = row[column]
+    if isinstance(value, (int, float, np.number)):
+        return value   # 저장소에서 읽은 금액은 이미 숫자
+    return pd.to_numeric(value, errors="coerce")
+
 # ------------------------------------------------------------------ #
 def calculate_metrics(
     dart_data: Dict[str, pd.DataFrame],
     price_df: pd.DataFrame,
     pkrx_f: Dict[str, float],
+    benchmark: Optional[pd.Series] = None,
+    only: Optional[Iterable[str]] = None,
 ) -> Dict[str, Optional[float]]:
     """
     DART + PyKrx 원시 데이터를 받아 주요 퀀트 지표를 계산해 반환합니다.
     dart_data 딕셔너리에 'is_prev'(전년도 IS)가 없으면 자동으로 불러옵니다.
+    dart_data 로 FinancialSnapshot(snapshot.py)을 넘기면 추출해 둔 계정값을 그대로 사용합니다.
+    가격 팩터(factors.FACTORS)는 pkrx_f 에 미리 계산된 값(유니버스 패널)이 있으면 사용하고,
+    없으면 price_df 와 benchmark(KOSPI 종가)로 계산합니다.
+    only(metric_graph.plan 의 지표 집합)가 주어지면 해당 지표 묶음만 계산해 반환합니다.
     """
-
-    # 기본 데이터
-    bs   = dart_data.get("bs", pd.DataFrame())
-    is_  = dart_data.get("is", pd.DataFrame())
-    cf   = dart_data.get("cf", pd.DataFrame())
-    is_prev = dart_data.get("is_prev", pd.DataFrame())
-
-    # -- 전년도 IS 자동 로드 (is_prev 없을 때) --
-    if is_prev.empty and not is_.empty:
-        try:
-            corp_code = is_["corp_code"].iloc[0]
-            year = int(is_["bsns_year"].iloc[0])
-            reader = OpenDartReader(DART_API_KEY)
-            prev_full = reader.finstate_all(corp_code, year - 1)
-            is_prev = prev_full[prev_full["sj_div"] == "IS"].reset_index(drop=True)
-        except Exception:
-            is_prev = pd.DataFrame()
+    wanted = ALL_METRICS if only is None else frozenset(only)
+    want = lambda *names: any(name in wanted for name in names)
+
+    if hasattr(dart_data, "get_prev"):
+        # FinancialSnapshot: 계정값이 이미 추출돼 있음
+        acct, prev_acct = dart_data.get, dart_data.get_prev
+    else:
+        # 기본 데이터
+        bs   = dart_data.get("bs", pd.DataFrame())
+        is_  = dart_data.get("is", pd.DataFrame())
+        cf   = dart_data.get("cf", pd.DataFrame())
+        is_prev = dart_data.get("is_prev", pd.DataFrame())
+
+        # -- 전년도 IS 자동 로드 (is_prev 없고 성장 지표가 필요할 때) --
+        if is_prev.empty and not is_.empty and want("RevenueGrowth", "NetIncomeGrowth"):
+            try:
+                corp_code = is_["corp_code"].iloc[0]
+                year = int(is_["bsns_year"].iloc[0])
+                prev_full = dart_reader().finstate_all(corp_code, year - 1)
+                is_prev = prev_full[prev_full["sj_div"] == "IS"].reset_index(drop=True)
+            except Exception:
+                is_prev = pd.DataFrame()
+
+        frames = {"bs": bs, "is": is_, "cf": cf}
+        acct = lambda name: _lookup(frames[SOURCES[name]], ALIASES[name])
+        prev_acct = lambda name: _lookup(is_prev, ALIASES[name])
 
     metrics: Dict[str, Optional[float]] = {}
+    # 필요한 계정만 한 번씩 조회
+    accounts: Dict[str, Optional[float]] = {}
+    def get(name: str) -> Optional[float]:
+        if name not in accounts:
+            accounts[name] = acct(name)
+        return accounts[name]
 
     # ---------------- 펀더멘털 ---------------- #
-    net_inc  = _lookup(is_,   ALIASES["net_income"])
-    equity   = _lookup(bs,    ALIASES["equity"])
-    op_inc   = _lookup(is_,   ALIASES["operating_income"])
-    revenue  = _lookup(is_,   ALIASES["revenue"])
-    t_assets = _lookup(bs,    ALIASES["total_assets"])
-    t_liab   = _lookup(bs,    ALIASES["total_liabilities"])
-    c_assets = _lookup(bs,    ALIASES["current_assets"])
-    c_liab   = _lookup(bs,    ALIASES["current_liabilities"])
-
-    metrics["ROE"]             = (net_inc / equity   * 100) if net_inc and equity else None
-    metrics["OperatingMargin"] = (op_inc / revenue   * 100) if op_inc and revenue else None
-    metrics["ROA"]             = (net_inc / t_assets * 100) if net_inc and t_assets else None
-    metrics["DebtRatio"]       = (t_liab / equity    * 100) if t_liab and equity else None
-    metrics["CurrentRatio"]    = (c_assets / c_liab  * 100) if c_assets and c_liab else None
+    if want("ROE"):
+        net_inc, equity = get("net_income"), get("equity")
+        metrics["ROE"] = (net_inc / equity * 100) if net_inc and equity else None
+    if want("OperatingMargin"):
+        op_inc, revenue = get("operating_income"), get("revenue")
+        metrics["OperatingMargin"] = (op_inc / revenue * 100) if op_inc and revenue else None
+    if want("ROA"):
+        net_inc, t_assets = get("net_income"), get("total_assets")
+        metrics["ROA"] = (net_inc / t_assets * 100) if net_inc and t_assets else None
+    if want("DebtRatio"):
+        t_liab, equity = get("total_liabilities"), get("equity")
+        metrics["DebtRatio"] = (t_liab / equity * 100) if t_liab and equity else None
+    if want("CurrentRatio"):
+        c_assets, c_liab = get("current_assets"), get("current_liabilities")
+        metrics["CurrentRatio"] = (c_assets / c_liab * 100) if c_assets and c_liab else None
 
     # ---------------- 성장 지표 ---------------- #
-    prev_rev = _lookup(is_prev, ALIASES["revenue"])
-    prev_inc = _lookup(is_prev, ALIASES["net_income"])
-    metrics["RevenueGrowth"] = (
-        (revenue - prev_rev) / prev_rev * 100
-        if revenue is not None and prev_rev not in (None, 0) else None
-    )
-    metrics["NetIncomeGrowth"] = (
-        (net_inc - prev_inc) / prev_inc * 100
-        if net_inc is not None and prev_inc not in (None, 0) else None
-    )
+    if want("RevenueGrowth"):
+        revenue, prev_rev = get("revenue"), prev_acct("revenue")
+        metrics["RevenueGrowth"] = (
+            (revenue - prev_rev) / prev_rev * 100
+            if revenue is not None and prev_rev not in (None, 0) else None
+        )
+    if want("NetIncomeGrowth"):
+        net_inc, prev_inc = get("net_income"), prev_acct("net_income")
+        metrics["NetIncomeGrowth"] = (
+            (net_inc - prev_inc) / prev_inc * 100
+            if net_inc is not None and prev_inc not in (None, 0) else None
+        )
 
     # ---------------- 밸류 지표 ---------------- #
-    metrics["PER"]      = pkrx_f.get("PER")
-    metrics["PBR"]      = pkrx_f.get("PBR")
-    metrics["DivYield"] = pkrx_f.get("DivYield")
+    for name in ("PER", "PBR", "DivYield"):
+        if want(name):
+            metrics[name] = pkrx_f.get(name)
 
     # --------- 모멘텀 / 변동성 ------------- #
-    try:
-        metrics["Mom12M"] = price_df["종가"].iloc[-1] / price_df["종가"].iloc[0] - 1
-    except Exception:
-        metrics["Mom12M"] = None
-    try:
-        ret = price_df["종가"].pct_change().dropna()
-        metrics["Volatility"] = ret.std() * np.sqrt(252)
-    except Exception:
-        metrics["Volatility"] = None
+    # data_provider 가 이미 계산했으면 그대로 사용, 없을 때만 계산
+    if want("Mom12M", "Volatility"):
+        if "Mom12M" in pkrx_f and "Volatility" in pkrx_f:
+            metrics["Mom12M"]     = pkrx_f["Mom12M"]
+            metrics["Volatility"] = pkrx_f["Volatility"]
+        else:
+            metrics.update(price_metrics(price_df["종가"] if "종가" in price_df.columns else pd.Series(dtype=float)))
+
+    # --------- 가격 팩터 (다기간 모멘텀/리스크/유동성) --------- #
+    if want(*FACTORS):
+        if all(name in pkrx_f for name in FACTORS):
+            metrics.update({name: pkrx_f[name] for name in FACTORS})
+        else:
+            metrics.update(single_ticker_factors(price_df, benchmark))
 
     # --------- FCF 수익률 ------------------ #
-    op_cf  = _lookup(cf,      ALIASES["op_cf"])
-    inv_cf = _lookup(cf,      ALIASES["inv_cf"])
-    mcap   = pkrx_f.get("MarketCap")
-    if mcap is None and equity and pkrx_f.get("BPS") and not price_df.empty:
-        shares = equity / pkrx_f["BPS"]
-        mcap   = shares * price_df["종가"].iloc[-1]
-    metrics["FCFYield"] = (
-        (op_cf + inv_cf) / mcap
-        if op_cf and inv_cf and mcap is not None else None
-    )
-
-    return metrics
\ No newline at end of file
+    if want("FCFYield"):
+        op_cf, inv_cf, equity = get("op_cf"), get("inv_cf"), get("equity")
+        mcap = pkrx_f.get("MarketCap")
+        if mcap is None and equity and pkrx_f.get("BPS") and not price_df.empty:
+            shares = equity / pkrx_f["BPS"]
+            mcap   = shares * price_df["종가"].iloc[-1]
+        metrics["FCFYield"] = (
+            (op_cf + inv_cf) / mcap
+            if op_cf and inv_cf and mcap is not None else None
+        )
+
+    if only is not None:
+        metrics = {name: value for name, value in metrics.items() if name in wanted}
+    return metrics
@@ -0,0 +1,105 @@
+# negative_cache.py
+
+import os
+import sqlite3
+import logging
+import datetime
+import pandas as pd
+from typing import Dict, Optional, Tuple
+from config import NEGATIVE_CACHE_PATH, NEGATIVE_CACHE_TTL_DAYS
+
+logger = logging.getLogger(__name__)
+
+# 실패 사유 코드
+NO_REPORT = "NO_REPORT"            # 조회는 성공했으나 해당 보고서가 없음 (DART 013 / 빈 결과)
+PARSE_FAILURE = "PARSE_FAILURE"    # 응답은 있으나 재무제표 형태로 해석 불가
+UNKNOWN_TICKER = "UNKNOWN_TICKER"  # DART 고유번호 또는 KRX 종목코드를 찾을 수 없음
+FETCH_ERROR = "FETCH_ERROR"        # 네트워크 등 일시적 조회 실패
+REASONS = (NO_REPORT, PARSE_FAILURE, UNKNOWN_TICKER, FETCH_ERROR)
+
+
+class NegativeCache:
+    """
+    조회해도 결과가 없던 (코드, 연도, 출처) 조합을 사유·만료시각과 함께 기록하는 SQLite 캐시.
+    - 출처(source)는 DART 보고서면 reprt_code, 시세면 'ohlcv'
+    - 만료 전까지는 data_provider 가 해당 조회를 생략하므로 다음 배치에서 비용이 들지 않음
+    - 사유별 TTL 은 config.NEGATIVE_CACHE_TTL_DAYS (일시적 실패일수록 짧게)
+    """
+
+    def __init__(self, path: str = NEGATIVE_CACHE_PATH, ttl_days: Optional[Dict[str, float]] = None):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.ttl_days = {**NEGATIVE_CACHE_TTL_DAYS, **(ttl_days or {})}
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS negative (
+                code       TEXT    NOT NULL,
+                year       INTEGER NOT NULL,
+                source     TEXT    NOT NULL,
+                reason     TEXT    NOT NULL,
+                detail     TEXT,
+                created_at TEXT    NOT NULL,
+                expires_at TEXT    NOT NULL,
+                PRIMARY KEY (code, year, source)
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def _now() -> datetime.datetime:
+        return datetime.datetime.now()
+
+    # ------------------------------------------------------------------ #
+    def get(self, code: str, year: int, source: str) -> Optional[Tuple[str, str]]:
+        """만료되지 않은 기록이 있으면 (reason, detail), 없으면 None."""
+        cur = self.conn.execute(
+            "SELECT reason, detail FROM negative WHERE code = ? AND year = ? AND source = ? AND expires_at > ?",
+            (code, int(year), source, self._now().isoformat()),
+        )
+        return cur.fetchone()
+
+    def add(self, code: str, year: int, source: str, reason: str, detail: str = "") -> None:
+        if reason not in REASONS:
+            raise ValueError(f"알 수 없는 사유 코드: {reason}")
+        now = self._now()
+        expires = now + datetime.timedelta(days=self.ttl_days[reason])
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO negative VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (code, int(year), source, reason, detail[:500], now.isoformat(), expires.isoformat()),
+            )
+        logger.info(f"[{code}-{year}-{source}] 네거티브 캐시 등록: {reason} {detail}")
+
+    def discard(self, code: str, year: int, source: str) -> None:
+        """새 공시가 나온 경우 등 기록을 즉시 지웁니다."""
+        with self.conn:
+            self.conn.execute("DELETE FROM negative WHERE code = ? AND year = ? AND source = ?", (code, int(year), source))
+
+    def purge(self) -> int:
+        """만료된 기록을 삭제하고 삭제 건수를 반환합니다."""
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM negative WHERE expires_at <= ?", (self._now().isoformat(),))
+        return cur.rowcount
+
+    def entries(self, year: Optional[int] = None, include_expired: bool = False) -> pd.DataFrame:
+        """기록 목록 (배치 리포트용)."""
+        where, params = [], []
+        if year is not None:
+            where.append("year = ?")
+            params.append(int(year))
+        if not include_expired:
+            where.append("expires_at > ?")
+            params.append(self._now().isoformat())
+        sql = "SELECT * FROM negative" + (" WHERE " + " AND ".join(where) if where else "")
+        return pd.read_sql_query(sql + " ORDER BY reason, code", self.conn, params=params)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,71 @@
+# pages/1_screener.py
+
+import os
+import math
+import streamlit as st
+from store import ResultStore
+from screener import query_score_table
+from screen import run_screen, ScreenSyntaxError
+from config import RESULTS_DB_PATH, SCREENER_PAGE_SIZE, METRIC_TARGETS
+
+# Streamlit 페이지 설정
+st.set_page_config(
+    page_title="유니버스 스크리너",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+st.title("📋 유니버스 스크리너 (사전 계산 점수)")
+
+# 저장소 연결은 세션 간 공유 (조회 전용)
+@st.cache_resource
+def open_store(path: str) -> ResultStore:
+    return ResultStore(path)
+
+if not os.path.exists(RESULTS_DB_PATH):
+    st.warning(f"결과 저장소가 없습니다: `{RESULTS_DB_PATH}` — `python batch.py` 로 먼저 생성해 주세요.")
+    st.stop()
+
+store = open_store(RESULTS_DB_PATH)
+years = store.years()
+if not years:
+    st.warning("저장된 점수 결과가 없습니다.")
+    st.stop()
+year = st.sidebar.selectbox("기준 연도", years)
+reprt_code = st.sidebar.selectbox("기준 보고서", store.reports(year), help="11011: 사업보고서, 그 외: 분기·반기 TTM")
+
+# 스크린 쿼리 (입력 시 아래 사이드바 필터 대신 사용)
+query = st.text_input("스크린 쿼리", placeholder="ROE > 15 and PER < 10 order by score desc limit 50")
+if query:
+    try:
+        st.dataframe(run_screen(query, store, year, reprt_code), use_container_width=True, hide_index=True)
+    except ScreenSyntaxError as e:
+        st.error(f"쿼리 오류: {e}")
+    st.stop()
+
+# 사이드바: 필터 / 정렬 / 페이지 크기
+st.sidebar.header("필터")
+filters = {}
+for name in st.sidebar.multiselect("필터 지표", list(METRIC_TARGETS)):
+    col_min, col_max = st.sidebar.columns(2)
+    low = col_min.text_input(f"{name} 최소", key=f"{name}_min")
+    high = col_max.text_input(f"{name} 최대", key=f"{name}_max")
+    try:
+        filters[name] = (float(low) if low else None, float(high) if high else None)
+    except ValueError:
+        st.sidebar.error(f"{name}: 숫자를 입력해 주세요.")
+
+st.sidebar.header("정렬")
+sort_by = st.sidebar.selectbox("정렬 기준", ["score"] + list(METRIC_TARGETS))
+ascending = st.sidebar.checkbox("오름차순", value=False)
+page_size = st.sidebar.number_input("페이지당 행 수", min_value=10, max_value=500, value=SCREENER_PAGE_SIZE, step=10)
+page = st.sidebar.number_input("페이지", min_value=1, value=1, step=1)
+
+# 서버 측 필터·정렬 후 현재 페이지만 브라우저로 전송
+rows, total = query_score_table(
+    store, year, filters, sort_by, ascending, page=page, page_size=page_size, reprt_code=reprt_code,
+)
+pages = max(1, math.ceil(total / page_size))
+
+st.caption(f"{page}/{pages}쪽 · 조건 충족 {total:,}개 종목")
+st.dataframe(rows, use_container_width=True, hide_index=True)
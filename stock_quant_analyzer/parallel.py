@@ -0,0 +1,139 @@
+# parallel.py
+
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from backend import LIVE, RECORD, active, use
+from pipeline import IDLE
+from statement_store import ANNUAL
+from config import PARALLEL_WORKERS, PARALLEL_CHUNK_SIZE, QUOTA_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 작업 프로세스마다 한 번 만들어 두는 상태 (_init 에서 설정)
+_state: Dict[str, Any] = {}
+
+
+# ---------------------------------------------------------------------- #
+# 1. 작업 프로세스
+# ---------------------------------------------------------------------- #
+def _init(
+    backend: Tuple[str, Optional[str]],
+    statements_root: Optional[str],
+    negative_path: Optional[str],
+    memo_path: Optional[str],
+    use_memo: bool,
+    settings: Dict[str, Any],
+) -> None:
+    """
+    작업 프로세스 초기화. 부모의 열린 파일·연결을 공유하지 않도록 저장소·캐시를 프로세스마다 새로 엽니다.
+    - 재무제표 저장소는 읽기 전용으로 열어 디스크의 parquet 를 직접 읽습니다 (사전 파일을 덮어쓰지 않음).
+    - 네거티브 캐시·메모 캐시는 SQLite 라 여러 프로세스가 같은 파일을 함께 써도 됩니다.
+    - replay 백엔드는 아카이브를 프로세스마다 다시 엽니다 (zip 파일 위치를 공유하지 않도록).
+    - live 백엔드는 fork 로 물려받은 공유 HTTP 세션(부모의 keep-alive 소켓)을 버리고 새 세션을 만듭니다.
+    """
+    import http_session
+    from memo import Memo
+    from negative_cache import NegativeCache
+    from statement_store import StatementStore
+
+    mode, archive = backend
+    if mode == LIVE:
+        http_session.reset_session()
+    else:
+        use(mode, archive)
+    _state.clear()
+    _state.update(settings)
+    _state["statements"] = StatementStore(statements_root, read_only=True) if statements_root else None
+    _state["negative"] = NegativeCache(negative_path) if negative_path else None
+    _state["memo"] = Memo(memo_path) if use_memo else None
+
+
+def _score_chunk(tasks: List[Tuple[Any, Optional[Dict[str, float]]]]) -> List[Tuple[Any, Optional[Dict], str, Optional[str]]]:
+    """
+    종목 묶음을 수집 → 지표·점수 계산해 (item, row, status, error) 목록을 반환합니다.
+    재무·시세 원본은 프로세스 안에서 버리고 결과 행(지표 값)만 돌려보내며, 예외는 문자열로 바꿔 보냅니다.
+    """
+    from batch import fetch_task, score_task
+
+    s = _state
+    out = []
+    for item, factors in tasks:
+        fetched = fetch_task(
+            item, factors, s["year"], s["statements"], s["metric_plan"], s["reprt_code"], s["negative"], s["quota_wait"],
+        )
+        item, row, status, error = score_task(fetched, s["year"], s["as_of"], s["metric_plan"], s["memo"], s["reprt_code"])
+        out.append((item, row, status, None if error is None else f"{type(error).__name__}: {error}"))
+    return out
+
+
+# ---------------------------------------------------------------------- #
+# 2. 부모 프로세스
+# ---------------------------------------------------------------------- #
+def _chunks(tasks: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_parallel(
+    tasks: Iterable[Tuple[Any, Optional[Dict[str, float]]]],
+    year: int,
+    as_of: Optional[str] = None,
+    workers: int = PARALLEL_WORKERS,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+    statements_root: Optional[str] = None,
+    negative_path: Optional[str] = None,
+    memo_path: Optional[str] = None,
+    use_memo: bool = False,
+    metric_plan: Optional[Tuple[FrozenSet[str], FrozenSet[str]]] = None,
+    reprt_code: str = ANNUAL,
+    quota_wait: float = QUOTA_WAIT_SECONDS,
+    idle: Optional[float] = None,
+    start_method: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    (batch.Company, factors) 작업을 chunk_size 개씩 묶어 workers 개 프로세스에 나눠 계산하고,
+    (item, row, status, error) 를 묶음이 끝나는 순서대로 내보냅니다 (pipeline.stream 과 같은 결과 형식, error 는 문자열).
+    작업 프로세스는 statements_root 의 재무제표를 직접 읽으므로 DataFrame 을 프로세스 사이로 보내지 않습니다.
+    한 번에 workers × 2 묶음만 넘겨 두어 입력을 끝까지 미리 읽지 않으며,
+    idle 초 동안 끝난 묶음이 없으면 IDLE 을 내보냅니다 (사용한도 대기 중 저장 등).
+    저장소가 읽기 전용이므로 저장소에 없는 재무제표를 API 로 받은 결과는 저장되지 않습니다 — 먼저 적재해 두세요.
+    record 백엔드는 아카이브를 여러 프로세스가 함께 쓸 수 없어 ValueError.
+    """
+    backend = active()
+    if backend[0] == RECORD:
+        raise ValueError("record 백엔드는 병렬 실행을 지원하지 않습니다 (workers=1 로 기록하세요)")
+    settings = {
+        "year": year, "as_of": as_of, "metric_plan": metric_plan, "reprt_code": reprt_code, "quota_wait": quota_wait,
+    }
+    context = multiprocessing.get_context(start_method) if start_method else None
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=_init,
+        initargs=(backend, statements_root, negative_path, memo_path, use_memo, settings),
+    )
+    chunks = _chunks(tasks, max(1, chunk_size))
+    in_flight = set()
+    try:
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                in_flight.add(pool.submit(_score_chunk, chunk))
+            if not in_flight:
+                return
+            finished, in_flight = wait(in_flight, timeout=idle, return_when=FIRST_COMPLETED)
+            if not finished:
+                yield IDLE
+                continue
+            for future in finished:
+                yield from future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
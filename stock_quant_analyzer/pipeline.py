@@ -0,0 +1,259 @@
+# pipeline.py
+
+import os
+import sys
+import pickle
+import shutil
+import logging
+import tempfile
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from config import PIPELINE_QUEUE_SIZE, PIPELINE_MEMORY_MB, PIPELINE_SPILL_DIR
+
+logger = logging.getLogger(__name__)
+
+IDLE = object()    # stream(idle=...) 에서 일정 시간 새 항목이 없을 때 내보내는 표식
+_DONE = object()
+
+
+def estimate_bytes(obj: Any) -> int:
+    """큐에 머무는 항목의 대략적인 메모리 크기 (DataFrame·배열은 버퍼 크기, 컨테이너는 재귀 합)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=False).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=False))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, "nbytes") and callable(obj.nbytes):   # FinancialSnapshot
+        return int(obj.nbytes())
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_bytes(k) + estimate_bytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_bytes(v) for v in obj)
+    if hasattr(obj, "_asdict"):   # namedtuple (itertuples 행)
+        return estimate_bytes(tuple(obj))
+    return sys.getsizeof(obj)
+
+
+class MemoryBudget:
+    """파이프라인의 모든 큐가 공유하는 메모리 상한 (항목 추정 크기 합계)."""
+
+    def __init__(self, limit_mb: float = PIPELINE_MEMORY_MB):
+        self.limit = int(limit_mb * 1024 * 1024)
+        self.used = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def charge(self, size: int) -> bool:
+        """size 만큼 사용량을 늘리고 상한 초과 여부를 반환합니다."""
+        with self._lock:
+            self.used += size
+            self.peak = max(self.peak, self.used)
+            return self.used > self.limit
+
+    def release(self, size: int) -> None:
+        with self._lock:
+            self.used -= size
+
+
+class _Aborted(Exception):
+    pass
+
+
+class SpillQueue:
+    """
+    단계 사이의 유한 큐.
+    - 항목 수가 maxsize 에 닿으면 put 이 대기합니다 (앞 단계가 뒤 단계보다 너무 앞서지 않도록).
+    - 공유 MemoryBudget 을 넘으면 메모리에 있는 항목을 묶음 단위로 디스크에 pickle 해 두고,
+      get 차례가 오면 다시 읽습니다. 순서(FIFO)는 유지됩니다.
+    """
+
+    def __init__(self, maxsize: int, budget: MemoryBudget, spill_dir: str):
+        self.maxsize = maxsize
+        self.budget = budget
+        self.spill_dir = spill_dir
+        self._segments: deque = deque()   # [list[(item, size)]] 또는 디스크 묶음 (path, count)
+        self._count = 0
+        self._closed = False
+        self._aborted = False
+        self._cond = threading.Condition()
+        self.spilled_items = 0
+        self.spilled_files = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def put(self, item: Any) -> None:
+        size = estimate_bytes(item)
+        with self._cond:
+            while self._count >= self.maxsize and not self._aborted:
+                self._cond.wait()
+            if self._aborted:
+                raise _Aborted()
+            if not self._segments or not isinstance(self._segments[-1], list):
+                self._segments.append([])
+            self._segments[-1].append((item, size))
+            self._count += 1
+            if self.budget.charge(size):
+                self._spill()
+            self._cond.notify_all()
+
+    def _spill(self) -> None:
+        """메모리에 있는 묶음을 모두 디스크로 내립니다 (락 안에서 호출)."""
+        for i, segment in enumerate(self._segments):
+            if not isinstance(segment, list) or not segment:
+                continue
+            path = os.path.join(self.spill_dir, f"{id(self)}_{self.spilled_files:06d}.pkl")
+            with open(path, "wb") as fh:
+                pickle.dump([item for item, _ in segment], fh, protocol=pickle.HIGHEST_PROTOCOL)
+            self.budget.release(sum(size for _, size in segment))
+            self._segments[i] = (path, len(segment))
+            self.spilled_items += len(segment)
+            self.spilled_files += 1
+
+    def _load(self, path: str) -> list:
+        with open(path, "rb") as fh:
+            items = pickle.load(fh)
+        os.remove(path)
+        loaded = []
+        for item in items:
+            size = estimate_bytes(item)
+            self.budget.charge(size)
+            loaded.append((item, size))
+        return loaded
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """다음 항목. 닫힌 뒤 비면 _DONE, timeout 안에 항목이 없으면 IDLE."""
+        with self._cond:
+            while self._count == 0 and not self._closed:
+                if not self._cond.wait(timeout):
+                    return IDLE
+            if self._count == 0:
+                return _DONE
+            head = self._segments[0]
+            if not isinstance(head, list):
+                head = self._segments[0] = self._load(head[0])
+            item, size = head.pop(0)
+            if not head:
+                self._segments.popleft()
+            self._count -= 1
+            self.budget.release(size)
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        """더 넣을 항목이 없음을 알립니다 (남은 항목은 계속 꺼낼 수 있음)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self) -> None:
+        """대기 중인 put/get 을 모두 깨우고 이후 put 은 실패시킵니다."""
+        with self._cond:
+            self._closed = self._aborted = True
+            self._segments.clear()
+            self._count = 0
+            self._cond.notify_all()
+
+
+@dataclass
+class Stage:
+    """파이프라인 한 단계: fn(item) → 다음 단계로 넘길 값 (None 이면 버림). workers 개 스레드로 실행."""
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+def stream(
+    source: Iterable,
+    stages: List[Stage],
+    maxsize: int = PIPELINE_QUEUE_SIZE,
+    memory_mb: float = PIPELINE_MEMORY_MB,
+    spill_dir: str = PIPELINE_SPILL_DIR,
+    idle: Optional[float] = None,
+) -> Iterator[Any]:
+    """
+    source 를 stages 순서대로 흘려 마지막 단계 결과를 생성자로 내보냅니다.
+    단계마다 별도 스레드가 유한 큐(SpillQueue)로 연결되어 수집(I/O)과 계산이 겹쳐 진행되고,
+    어떤 단계가 느려도 앞 단계는 maxsize 만큼만 앞서며, 큐 전체 크기가 memory_mb 를 넘으면 디스크로 내려씁니다.
+    workers 가 1 인 단계만 있으면 순서가 유지됩니다.
+    idle 초 동안 결과가 없으면 IDLE 을 내보내 소비자가 그 사이 모아 둔 결과를 저장할 수 있게 합니다.
+    단계 함수에서 처리하지 않은 예외는 모든 단계를 멈추고 소비자 쪽에서 다시 발생합니다.
+    """
+    os.makedirs(spill_dir, exist_ok=True)
+    spill = tempfile.mkdtemp(prefix="pipeline_", dir=spill_dir)
+    budget = MemoryBudget(memory_mb)
+    queues = [SpillQueue(maxsize, budget, spill) for _ in range(len(stages) + 1)]
+    errors: List[BaseException] = []
+    threads: List[threading.Thread] = []
+
+    def fail(e: BaseException) -> None:
+        errors.append(e)
+        for q in queues:
+            q.abort()
+
+    def feed() -> None:
+        try:
+            for item in source:
+                queues[0].put(item)
+            queues[0].close()
+        except _Aborted:
+            pass
+        except BaseException as e:
+            fail(e)
+
+    def work(stage: Stage, inbox: SpillQueue, outbox: SpillQueue, remaining: List[int], lock: threading.Lock) -> None:
+        try:
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                result = stage.fn(item)
+                del item   # 원본 입력은 여기서 놓아 다음 단계로 넘어가지 않게 함
+                if result is not None:
+                    outbox.put(result)
+        except _Aborted:
+            return
+        except BaseException as e:
+            logger.error(f"파이프라인 단계 '{stage.name}' 실패: {e}")
+            fail(e)
+            return
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                outbox.close()
+
+    threads.append(threading.Thread(target=feed, name="pipeline-source", daemon=True))
+    for i, stage in enumerate(stages):
+        remaining, lock = [stage.workers], threading.Lock()
+        for w in range(stage.workers):
+            threads.append(threading.Thread(
+                target=work, args=(stage, queues[i], queues[i + 1], remaining, lock),
+                name=f"pipeline-{stage.name}-{w}", daemon=True,
+            ))
+    for t in threads:
+        t.start()
+
+    try:
+        while True:
+            item = queues[-1].get(idle)
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        if errors or any(t.is_alive() for t in threads):
+            for q in queues:
+                q.abort()
+        for t in threads:
+            t.join()
+        spilled = sum(q.spilled_items for q in queues)
+        if spilled:
+            logger.info(f"파이프라인: 메모리 상한으로 {spilled}건을 디스크에 내려썼습니다 (최대 사용 {budget.peak / 2**20:.0f}MB).")
+        shutil.rmtree(spill, ignore_errors=True)
+    if errors:
+        raise errors[0]
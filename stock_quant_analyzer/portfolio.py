@@ -0,0 +1,386 @@
+# portfolio.py
+
+import os
+import pickle
+import argparse
+import datetime
+import logging
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from config import (
+    RISK_STATE_PATH, RISK_WINDOW, PORTFOLIO_POSITION_CAP, PORTFOLIO_SECTOR_CAP,
+    PORTFOLIO_MIN_TRADED_VALUE, PORTFOLIO_RISK_AVERSION,
+)
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+VALUE_WINDOW = 20   # 유동성 판단용 평균 거래대금 구간 (factors.AvgTradedValue 와 동일)
+
+
+# ---------------------------------------------------------------------- #
+# 1. 증분 공분산 + Ledoit-Wolf 수축
+# ---------------------------------------------------------------------- #
+class RiskModel:
+    """
+    최근 window 거래일 일간 수익률로 전 종목 공분산을 유지하는 롤링 모델.
+    - 수익률 창(window × 종목)과 함께 Σr, Σrr', 관측 수(종목별·쌍별)를 누적해 두고,
+      새 거래일이 들어오면 추가분을 더하고 창에서 밀려난 날을 빼는 것으로 갱신합니다 (전체 재계산 없음).
+    - 거래정지·상장 전 구간은 결측으로 두고 쌍별로 관측된 날만 씁니다.
+    - covariance() 는 표본 공분산을 Ledoit-Wolf(2004) 방식으로 척도 항등행렬 쪽으로 수축한 연율화 행렬입니다.
+    상태는 PriceMetricEngine 처럼 save/load 해 두고 일일 갱신(update_prices)만 반영합니다.
+    """
+
+    def __init__(self, window: int = RISK_WINDOW, min_obs: int = 60):
+        self.window = window
+        self.min_obs = min_obs
+        self.tickers: List[str] = []
+        self._col = {}
+        self.dates: List[pd.Timestamp] = []
+        self.returns = np.empty((0, 0))      # 창 안의 수익률 (결측 NaN)
+        self.sum = np.empty(0)               # 종목별 Σr
+        self.count = np.empty(0)             # 종목별 관측 수
+        self.cross = np.empty((0, 0))        # Σ r_i r_j (결측은 0)
+        self.pair = np.empty((0, 0))         # 쌍별 동시 관측 수
+        self.last_close = pd.Series(dtype=float)
+        self.values = pd.DataFrame()         # 최근 VALUE_WINDOW 일 거래대금
+
+    # ------------------------------------------------------------------ #
+    def _ensure(self, tickers) -> None:
+        """처음 보는 종목을 열로 추가합니다 (기존 누적값은 유지)."""
+        new = [t for t in tickers if t not in self._col]
+        if not new:
+            return
+        for t in new:
+            self._col[t] = len(self.tickers)
+            self.tickers.append(t)
+        k = len(new)
+        self.returns = np.hstack([self.returns, np.full((len(self.returns), k), np.nan)])
+        self.sum = np.concatenate([self.sum, np.zeros(k)])
+        self.count = np.concatenate([self.count, np.zeros(k)])
+        self.cross = np.pad(self.cross, ((0, k), (0, k)))
+        self.pair = np.pad(self.pair, ((0, k), (0, k)))
+
+    def _accumulate(self, block: np.ndarray, sign: float) -> None:
+        mask = ~np.isnan(block)
+        filled = np.where(mask, block, 0.0)
+        m = mask.astype(float)
+        self.sum += sign * filled.sum(axis=0)
+        self.count += sign * m.sum(axis=0)
+        self.cross += sign * (filled.T @ filled)
+        self.pair += sign * (m.T @ m)
+
+    def update_returns(self, returns: pd.DataFrame) -> None:
+        """(날짜 × 종목) 일간 수익률 블록을 창에 넣고, 창을 넘친 가장 오래된 날을 뺍니다."""
+        returns = returns.sort_index()
+        if self.dates:
+            returns = returns[returns.index > self.dates[-1]]
+        if returns.empty:
+            return
+        self._ensure(returns.columns)
+        block = np.full((len(returns), len(self.tickers)), np.nan)
+        block[:, [self._col[t] for t in returns.columns]] = returns.to_numpy(dtype=float)
+
+        self._accumulate(block, 1.0)
+        self.returns = np.vstack([self.returns, block])
+        self.dates.extend(returns.index)
+        excess = len(self.dates) - self.window
+        if excess > 0:
+            self._accumulate(self.returns[:excess], -1.0)
+            self.returns = self.returns[excess:]
+            self.dates = self.dates[excess:]
+
+    def update_prices(self, close: pd.DataFrame, value: Optional[pd.DataFrame] = None) -> None:
+        """
+        (날짜 × 종목) 종가 블록으로 갱신합니다. 첫 날 수익률은 직전 상태의 종가 기준이며,
+        종가 0(거래정지)은 결측으로 처리합니다. value(거래대금)를 주면 유동성 평균도 함께 갱신합니다.
+        """
+        close = close.sort_index().astype(float)
+        close = close.where(close > 0)
+        if self.dates:
+            close = close[close.index > self.dates[-1]]
+        if close.empty:
+            return
+        prev = self.last_close.reindex(close.columns)
+        previous = pd.concat([prev.to_frame().T, close.iloc[:-1]])
+        previous.index = close.index
+        returns = close / previous.ffill() - 1.0
+        self.update_returns(returns)
+        self.last_close = close.ffill().iloc[-1].combine_first(self.last_close)
+        if value is not None:
+            self.values = pd.concat([self.values, value.sort_index()]).iloc[-VALUE_WINDOW:]
+
+    def update_day(self, closes: pd.Series, date: str, values: Optional[pd.Series] = None) -> None:
+        """하루치 종가(index=종목코드)를 반영합니다. 이미 반영된 날짜 이전이면 무시합니다."""
+        day = pd.Timestamp(date)
+        if self.dates and day <= self.dates[-1]:
+            logger.warning(f"{date} 는 이미 반영된 날짜({self.dates[-1].date()}) 이전이므로 무시합니다.")
+            return
+        value = None if values is None else values.to_frame(day).T
+        self.update_prices(closes.to_frame(day).T, value)
+
+    # ------------------------------------------------------------------ #
+    def traded_value(self) -> pd.Series:
+        """종목별 최근 VALUE_WINDOW 일 평균 거래대금."""
+        return self.values.mean() if not self.values.empty else pd.Series(dtype=float)
+
+    def covered(self, tickers=None) -> List[str]:
+        """공분산을 추정할 만큼(min_obs) 관측이 쌓인 종목."""
+        tickers = self.tickers if tickers is None else tickers
+        return [t for t in tickers if t in self._col and self.count[self._col[t]] >= self.min_obs]
+
+    def sample_covariance(self, tickers: List[str]) -> np.ndarray:
+        """쌍별 관측으로 계산한 일간 표본 공분산 (모평균은 종목별 관측 평균)."""
+        idx = np.array([self._col[t] for t in tickers], dtype=int)
+        mean = self.sum[idx] / self.count[idx]
+        pair = self.pair[np.ix_(idx, idx)]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = self.cross[np.ix_(idx, idx)] / pair - np.outer(mean, mean)
+        # 함께 관측된 날이 너무 적은 쌍은 공분산 0 으로 둠
+        cov[pair < self.min_obs] = 0.0
+        np.fill_diagonal(cov, self.cross[idx, idx] / self.count[idx] - mean ** 2)
+        return cov
+
+    def shrinkage(self, tickers: List[str], sample: np.ndarray) -> float:
+        """
+        Ledoit-Wolf 수축 강도 δ ∈ [0, 1] (목표: 평균 분산 × I).
+        δ = min(b̄², d²) / d²,  d² = ‖S − μI‖²,  b̄² = 1/T² Σ_t ‖x_t x_tᵀ − S‖²  (x_t: 평균 제거, 결측 0)
+        """
+        idx = np.array([self._col[t] for t in tickers], dtype=int)
+        block = self.returns[:, idx]
+        mean = self.sum[idx] / self.count[idx]
+        x = np.where(np.isnan(block), 0.0, block - mean)
+        t = len(x)
+        n = len(tickers)
+        mu = np.trace(sample) / n
+        d2 = ((sample - mu * np.eye(n)) ** 2).sum()
+        if t == 0 or d2 <= 0:
+            return 1.0
+        sq = (x * x).sum(axis=1)
+        b2 = ((sq ** 2).sum() - 2.0 * ((x @ sample) * x).sum() + t * (sample ** 2).sum()) / t ** 2
+        return float(np.clip(b2 / d2, 0.0, 1.0))
+
+    def covariance(self, tickers=None) -> pd.DataFrame:
+        """수축 공분산 (연율화). tickers 중 관측이 부족한 종목은 제외합니다."""
+        tickers = self.covered(tickers)
+        if not tickers:
+            return pd.DataFrame()
+        sample = self.sample_covariance(tickers)
+        delta = self.shrinkage(tickers, sample)
+        mu = np.trace(sample) / len(tickers)
+        shrunk = (1.0 - delta) * sample + delta * mu * np.eye(len(tickers))
+        logger.debug(f"Ledoit-Wolf 수축 강도 δ={delta:.3f} ({len(tickers)}개 종목, {len(self.dates)}일)")
+        return pd.DataFrame(shrunk * TRADING_DAYS, index=tickers, columns=tickers)
+
+    def save(self, path: str = RISK_STATE_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as fh:
+            pickle.dump(self, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str = RISK_STATE_PATH) -> "RiskModel":
+        with open(path, "rb") as fh:
+            return pickle.load(fh)
+
+
+# ---------------------------------------------------------------------- #
+# 2. 제약 포트폴리오 (점수 기울기 + 분산 벌점)
+# ---------------------------------------------------------------------- #
+def _project_box_simplex(v: np.ndarray, upper: np.ndarray, iters: int = 50) -> np.ndarray:
+    """{0 ≤ w ≤ upper, Σw = 1} 위로의 유클리드 사영 (τ 이분탐색, 종목 방향 벡터화)."""
+    lo, hi = v.min() - upper.max() - 1.0, v.max()
+    for _ in range(iters):
+        tau = (lo + hi) / 2
+        if np.clip(v - tau, 0.0, upper).sum() > 1.0:
+            lo = tau
+        else:
+            hi = tau
+    return np.clip(v - (lo + hi) / 2, 0.0, upper)
+
+
+def _project_sectors(v: np.ndarray, codes: np.ndarray, size: np.ndarray, cap: float) -> np.ndarray:
+    """업종 합 ≤ cap 반공간들 위로의 사영 (업종끼리 겹치지 않으므로 초과분을 업종 내 균등 차감)."""
+    excess = np.maximum(np.bincount(codes, weights=v, minlength=len(size)) - cap, 0.0)
+    return v - (excess / size)[codes]
+
+
+def _project(v, upper, codes, size, sector_cap, iters: int = 1000, tol: float = 1e-9) -> np.ndarray:
+    """
+    상자·합계 제약과 업종 제약의 교집합 위로의 사영 (Dykstra 교대 사영).
+    업종 제약을 이미 만족하면 상자·합계 사영 한 번으로 끝납니다.
+    """
+    y = _project_box_simplex(v, upper)
+    if codes is None or np.bincount(codes, weights=y).max() <= sector_cap + tol:
+        return y
+    x, p, q = v, np.zeros_like(v), np.zeros_like(v)
+    for _ in range(iters):
+        y = _project_box_simplex(x + p, upper)
+        p = x + p - y
+        x = _project_sectors(y + q, codes, size, sector_cap)
+        q = y + q - x
+        # 두 사영이 같은 점에 모이면 교집합 위의 점
+        if np.abs(x - y).max() < tol:
+            break
+    return y
+
+
+def build_portfolio(
+    scores: pd.Series,
+    cov: pd.DataFrame,
+    sectors: Optional[pd.Series] = None,
+    traded_value: Optional[pd.Series] = None,
+    position_cap: float = PORTFOLIO_POSITION_CAP,
+    sector_cap: float = PORTFOLIO_SECTOR_CAP,
+    min_traded_value: float = PORTFOLIO_MIN_TRADED_VALUE,
+    risk_aversion: float = PORTFOLIO_RISK_AVERSION,
+    max_iter: int = 500,
+    tol: float = 1e-7,
+) -> pd.DataFrame:
+    """
+    calculate_score 점수로 기울인 롱온리 포트폴리오를 만듭니다.
+        max  αᵀw − (γ/2) wᵀΣw   s.t.  Σw = 1,  0 ≤ w ≤ position_cap,  업종 합 ≤ sector_cap
+    - α: 편입 후보 안에서 표준화한 점수 (z-score)
+    - 후보: 점수·공분산이 있고, traded_value 가 주어지면 평균 거래대금 ≥ min_traded_value 인 종목
+    가속 사영 경사법(FISTA)으로 풀며 반복마다 행렬-벡터 곱 한 번과 벡터 사영만 하므로 수백 종목도 1초 안팎입니다.
+    반환: index=종목코드, columns=[weight, score, alpha, sector, traded_value] (비중 내림차순, 0 비중 제외)
+    """
+    scores = pd.to_numeric(scores, errors="coerce").dropna()
+    names = [t for t in scores.index if t in cov.index]
+    if traded_value is not None:
+        liquid = traded_value.reindex(names) >= min_traded_value
+        dropped = len(names) - int(liquid.sum())
+        names = list(liquid[liquid].index)
+        if dropped:
+            logger.info(f"유동성 미달 {dropped}개 종목 제외 (평균 거래대금 < {min_traded_value:,.0f}원)")
+    if not names:
+        raise ValueError("편입 가능한 종목이 없습니다 (점수·공분산·유동성 조건 확인).")
+
+    n = len(names)
+    upper = np.full(n, float(position_cap))
+    sector = sectors.reindex(names).fillna("미분류").to_numpy() if sectors is not None else None
+    if sector is not None:
+        labels, codes = np.unique(sector, return_inverse=True)
+        size = np.bincount(codes).astype(float)
+        capacity = np.minimum(size * position_cap, sector_cap).sum()
+    else:
+        codes = size = None
+        capacity = n * position_cap
+    if capacity < 1.0 - 1e-9:
+        raise ValueError(f"제약을 만족하는 포트폴리오가 없습니다 (최대 편입 가능 비중 {capacity:.2f} < 1).")
+
+    s = scores.reindex(names).to_numpy(dtype=float)
+    alpha = (s - s.mean()) / s.std() if s.std() > 0 else np.zeros(n)
+    sigma = cov.loc[names, names].to_numpy(dtype=float)
+
+    # 경사의 립시츠 상수 γ·λmax(Σ) 로 보폭 결정
+    step = 1.0 / max(risk_aversion * np.linalg.eigvalsh(sigma)[-1], 1e-12)
+    w = _project(np.full(n, 1.0 / n), upper, codes, size, sector_cap)
+    z, t = w.copy(), 1.0
+    for i in range(max_iter):
+        grad = alpha - risk_aversion * (sigma @ z)
+        w_new = _project(z + step * grad, upper, codes, size, sector_cap)
+        t_new = (1.0 + np.sqrt(1.0 + 4.0 * t * t)) / 2.0
+        z = w_new + ((t - 1.0) / t_new) * (w_new - w)
+        converged = np.abs(w_new - w).max() < tol
+        w, t = w_new, t_new
+        if converged:
+            break
+    logger.debug(f"포트폴리오 최적화 {i + 1}회 반복 ({n}개 후보)")
+
+    out = pd.DataFrame({
+        "weight": w,
+        "score": s,
+        "alpha": alpha,
+        "sector": sector if sector is not None else None,
+        "traded_value": traded_value.reindex(names).to_numpy() if traded_value is not None else np.nan,
+    }, index=pd.Index(names, name="stock_code"))
+    out = out[out["weight"] > 1e-6]
+    out["weight"] /= out["weight"].sum()
+    return out.sort_values("weight", ascending=False)
+
+
+def portfolio_risk(weights: pd.Series, cov: pd.DataFrame) -> float:
+    """연율화 포트폴리오 변동성."""
+    w = weights.reindex(cov.index).fillna(0.0).to_numpy()
+    return float(np.sqrt(w @ cov.to_numpy() @ w))
+
+
+# ---------------------------------------------------------------------- #
+# 3. CLI (배치 결과 → 포트폴리오 CSV)
+# ---------------------------------------------------------------------- #
+def load_risk_model(path: str, date: str, window: int = RISK_WINDOW) -> RiskModel:
+    """
+    상태 파일을 읽어 date 까지 반영합니다. 상태가 없으면 전 종목 시세 패널로 window 거래일을 한 번에 채우고,
+    있으면 마지막 반영일 이후 거래일만 get_price_panel 로 가져와 더합니다.
+    """
+    from data_provider import get_price_panel
+
+    try:
+        model = RiskModel.load(path)
+        start = (model.dates[-1] + pd.Timedelta(days=1)).strftime("%Y%m%d") if model.dates else None
+    except FileNotFoundError:
+        logger.info("리스크 모델 상태가 없어 시세 패널로 새로 만듭니다.")
+        model = RiskModel(window)
+        start = None
+    if start is None:
+        # 거래일 window 개 ≈ 달력일 window × 1.5
+        start = (pd.Timestamp(date) - pd.Timedelta(days=int(window * 1.5))).strftime("%Y%m%d")
+    if start <= date:
+        panel = get_price_panel(start, date)
+        model.update_prices(panel["close"], panel["value"])
+        model.save(path)
+    return model
+
+
+def main():
+    from statement_store import ANNUAL
+    from ttm import QUARTERS
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="배치 점수 기반 제약 포트폴리오 생성")
+    parser.add_argument("--year", type=int, default=datetime.date.today().year - 1, help="사업보고서 기준 연도")
+    parser.add_argument(
+        "--quarter", default=None, choices=[c for c in QUARTERS if c != ANNUAL],
+        help="분기·반기 보고서 기준 TTM 점수 사용 (batch.py --quarter 결과, 기본: 사업보고서)",
+    )
+    parser.add_argument("--date", default=datetime.date.today().strftime("%Y%m%d"), help="리스크 모델 기준일 (YYYYMMDD)")
+    parser.add_argument("--top", type=int, default=500, help="점수 상위 후보 수")
+    parser.add_argument("--position-cap", type=float, default=PORTFOLIO_POSITION_CAP, help="종목당 최대 비중")
+    parser.add_argument("--sector-cap", type=float, default=PORTFOLIO_SECTOR_CAP, help="업종당 최대 비중")
+    parser.add_argument("--min-value", type=float, default=PORTFOLIO_MIN_TRADED_VALUE, help="최소 평균 거래대금 (원)")
+    parser.add_argument("--risk-aversion", type=float, default=PORTFOLIO_RISK_AVERSION, help="위험회피계수")
+    parser.add_argument("--state", default=RISK_STATE_PATH, help="리스크 모델 상태 파일")
+    parser.add_argument("--out", default=None, help="비중 CSV 경로 (기본: 콘솔 출력만)")
+    args = parser.parse_args()
+
+    from store import ResultStore
+    with ResultStore() as store:
+        rows = store.latest_rows(args.year, reprt_code=args.quarter or ANNUAL)
+    rows = rows.dropna(subset=["stock_code", "score"]).nlargest(args.top, "score").set_index("stock_code")
+    if rows.empty:
+        logger.error(f"❌ {args.year}년 배치 결과가 없습니다.")
+        return
+
+    model = load_risk_model(args.state, args.date)
+    cov = model.covariance(list(rows.index))
+    liquidity = model.traded_value().reindex(rows.index)
+    if "AvgTradedValue" in rows.columns:
+        liquidity = liquidity.combine_first(rows["AvgTradedValue"])
+    sectors = rows["sector"] if rows.get("sector") is not None and rows["sector"].notna().any() else None
+
+    weights = build_portfolio(
+        rows["score"], cov, sectors=sectors, traded_value=liquidity,
+        position_cap=args.position_cap, sector_cap=args.sector_cap,
+        min_traded_value=args.min_value, risk_aversion=args.risk_aversion,
+    )
+    weights.insert(0, "corp_name", rows["corp_name"].reindex(weights.index))
+    logger.info(weights.head(30).to_string(float_format=lambda x: f"{x:,.4f}"))
+    logger.info(f"\n편입 {len(weights)}개 종목, 예상 연율 변동성 {portfolio_risk(weights['weight'], cov):.2%}")
+    if args.out:
+        weights.to_csv(args.out, encoding="utf-8-sig")
+        logger.info(f"저장 완료: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# price_engine.py
+
+import os
+import math
+import pickle
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Mapping, Optional
+from pykrx import stock
+from backend import LIVE, use
+from config import PRICE_STATE_PATH
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252   # 연율화 기준 거래일 수
+
+
+def price_metrics(close: pd.Series, window: int = TRADING_DAYS) -> Dict[str, Optional[float]]:
+    """
+    종가 Series 로 모멘텀(구간 수익률)과 연율화 변동성을 한 번에 계산합니다.
+    data_provider 와 metrics 가 같은 값을 쓰도록 공용으로 사용합니다.
+    PriceMetricEngine 과 같은 정의: 거래정지·결측(0/NaN)을 뺀 최근 window+1 개 종가(수익률 window 개) 기준.
+    """
+    if close is None or close.empty:
+        return {"Mom12M": None, "Volatility": None}
+    close = close[close > 0].iloc[-(window + 1):]
+    if close.empty:
+        return {"Mom12M": None, "Volatility": None}
+    try:
+        mom = close.iloc[-1] / close.iloc[0] - 1
+    except Exception:
+        mom = None
+    try:
+        ret = close.pct_change().dropna()
+        vol = ret.std() * np.sqrt(TRADING_DAYS)
+    except Exception:
+        vol = None
+    return {"Mom12M": mom, "Volatility": vol}
+
+
+class TickerState:
+    """
+    종목 하나의 롤링 상태.
+    - closes: 모멘텀 기준가를 담는 길이 momentum_window+1 링버퍼
+    - rets:   변동성 윈도우 수익률 링버퍼 + Welford 방식 이동 평균/제곱편차합(m2)
+    """
+
+    __slots__ = ("closes", "c_pos", "c_len", "rets", "r_pos", "r_len", "mean", "m2", "last")
+
+    def __init__(self, momentum_window: int, volatility_window: int):
+        self.closes = np.empty(momentum_window + 1)
+        self.c_pos = 0
+        self.c_len = 0
+        self.rets = np.empty(volatility_window)
+        self.r_pos = 0
+        self.r_len = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last = math.nan
+
+    def push(self, close: float) -> None:
+        """새 종가 한 개를 반영합니다 (O(1))."""
+        if not close > 0:   # 거래정지·결측(0/NaN)은 건너뜀
+            return
+
+        # 1) 수익률 윈도우 갱신
+        if self.last == self.last:   # 이전 종가가 있을 때만 (NaN 아님)
+            x = close / self.last - 1.0
+            size = len(self.rets)
+            if self.r_len < size:
+                # 윈도우가 찰 때까지: Welford 추가
+                self.r_len += 1
+                delta = x - self.mean
+                self.mean += delta / self.r_len
+                self.m2 += delta * (x - self.mean)
+            else:
+                # 가장 오래된 값 y 를 x 로 교체: 평균/제곱편차합을 한 번에 갱신
+                y = self.rets[self.r_pos]
+                old_mean = self.mean
+                self.mean += (x - y) / size
+                self.m2 += (x - y) * (x - self.mean + y - old_mean)
+            self.rets[self.r_pos] = x
+            self.r_pos = (self.r_pos + 1) % size
+        self.last = close
+
+        # 2) 종가 링버퍼 갱신
+        self.closes[self.c_pos] = close
+        self.c_pos = (self.c_pos + 1) % len(self.closes)
+        self.c_len = min(self.c_len + 1, len(self.closes))
+
+    def momentum(self) -> Optional[float]:
+        if self.c_len < 2:
+            return None
+        # 버퍼가 가득 찼으면 가장 오래된 값이 c_pos 위치, 아니면 0번
+        start = self.closes[self.c_pos] if self.c_len == len(self.closes) else self.closes[0]
+        return self.last / start - 1.0
+
+    def volatility(self) -> Optional[float]:
+        if self.r_len < 2:
+            return None
+        return math.sqrt(max(self.m2, 0.0) / (self.r_len - 1)) * math.sqrt(TRADING_DAYS)
+
+
+class PriceMetricEngine:
+    """
+    전 종목 Mom12M/Volatility 를 증분으로 유지하는 롤링 엔진 (기본 구간은 price_metrics 와 같은 TRADING_DAYS).
+    하루치 종가(update_day)를 넣으면 종목당 O(1) 로 갱신되며,
+    상태를 save/load 해 두면 일일 갱신은 그날 데이터 한 번 훑기로 끝납니다.
+    batch.py / scheduler.py 의 --price-state 로 넘기면 data_provider.load_price_state 를 거쳐 점수 계산에 쓰입니다.
+    """
+
+    def __init__(self, momentum_window: int = TRADING_DAYS, volatility_window: int = TRADING_DAYS):
+        self.momentum_window = momentum_window
+        self.volatility_window = volatility_window
+        self.states: Dict[str, TickerState] = {}
+        self.last_date: Optional[str] = None
+
+    def _state(self, ticker: str) -> TickerState:
+        state = self.states.get(ticker)
+        if state is None:
+            state = self.states[ticker] = TickerState(self.momentum_window, self.volatility_window)
+        return state
+
+    def update(self, ticker: str, close: float) -> None:
+        self._state(ticker).push(float(close))
+
+    def seed(self, ticker: str, closes: Iterable[float]) -> None:
+        """과거 종가 이력으로 상태를 초기화합니다."""
+        for close in closes:
+            self.update(ticker, close)
+
+    def update_day(self, closes: Mapping[str, float], date: Optional[str] = None) -> None:
+        """하루치 {ticker: 종가} 를 반영합니다. 같은 날짜를 두 번 넣으면 무시합니다."""
+        if date is not None and self.last_date is not None and date <= self.last_date:
+            logger.warning(f"{date} 는 이미 반영된 날짜({self.last_date}) 이전이므로 무시합니다.")
+            return
+        for ticker, close in closes.items():
+            self.update(ticker, close)
+        if date is not None:
+            self.last_date = date
+
+    def metrics(self, ticker: str) -> Dict[str, Optional[float]]:
+        state = self.states.get(ticker)
+        if state is None:
+            return {"Mom12M": None, "Volatility": None}
+        return {"Mom12M": state.momentum(), "Volatility": state.volatility()}
+
+    def to_frame(self) -> pd.DataFrame:
+        """전 종목 현재 지표를 DataFrame(index=ticker)으로 반환합니다."""
+        return pd.DataFrame.from_dict({t: self.metrics(t) for t in self.states}, orient="index")
+
+    def save(self, path: str = PRICE_STATE_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as fh:
+            pickle.dump(self, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str = PRICE_STATE_PATH) -> "PriceMetricEngine":
+        with open(path, "rb") as fh:
+            return pickle.load(fh)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="전 종목 가격 지표 일일 증분 갱신")
+    parser.add_argument("date", help="반영할 거래일 (YYYYMMDD)")
+    parser.add_argument("--state", default=PRICE_STATE_PATH, help="엔진 상태 파일 경로")
+    args = parser.parse_args()
+    use(LIVE)   # pykrx 가 공유 세션(커넥션 풀)으로 요청하도록
+
+    try:
+        engine = PriceMetricEngine.load(args.state)
+    except FileNotFoundError:
+        logger.info("상태 파일이 없어 새 엔진으로 시작합니다.")
+        engine = PriceMetricEngine()
+
+    day = stock.get_market_ohlcv_by_ticker(args.date, market="ALL")
+    engine.update_day(day["종가"], date=args.date)
+    engine.save(args.state)
+    logger.info(f"{args.date} 반영 완료: {len(day)}개 종목, 상태 {len(engine.states)}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,23 @@
 # reporter.py
 
+import os
+import csv
+import json
+import math
+import heapq
+import pandas as pd
 from tabulate import tabulate
 from colorama import init, Fore, Style
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
+from store import INFO_COLUMNS, KEY_COLUMNS, SCORE_SUFFIX, SECTOR_COLUMNS
+from config import METRIC_TARGETS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # Parquet/Arrow 내보내기에만 필요
+    pa = None
 
 # 컬러 출력 초기화
 init(autoreset=True)
@@ -21,4 +36,224 @@ def report_console(metrics: Dict[str, float], score: float, comment: str) -> Non
     table = [(name, f"{value:.1f}") for name, value in metrics.items()]
     print(tabulate(table, headers=["지표", "점수"], tablefmt="github"))
 
-    print()  # 한 줄 띄우기
\ No newline at end of file
+    print()  # 한 줄 띄우기
+
+
+# ------------------------------------------------------------------ #
+# 유니버스 결과 스트리밍 내보내기
+# ------------------------------------------------------------------ #
+def _clean(value):
+    """NaN/numpy 스칼라를 직렬화 가능한 파이썬 값으로 변환."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class ResultWriter:
+    """
+    결과 행(dict)을 생성되는 즉시 파일에 이어 쓰는 스트리밍 writer 기본 클래스.
+    batch_size 행마다 디스크로 내보내므로 유니버스 크기와 관계없이 메모리가 일정합니다.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer: List[Dict] = []
+
+    def write(self, row: Dict) -> None:
+        self._buffer.append({k: _clean(v) for k, v in row.items()})
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[Dict]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlWriter(ResultWriter):
+    """한 줄에 JSON 객체 하나 (다운스트림 도구용)."""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        super().__init__(path, batch_size)
+        self._fh = open(path, "w", encoding="utf-8")
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        self._fh.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        self._fh.flush()
+
+    def _close(self) -> None:
+        self._fh.close()
+
+
+class CsvWriter(ResultWriter):
+    """첫 배치의 컬럼 순서로 헤더를 고정하는 CSV (Excel 호환 utf-8-sig)."""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        super().__init__(path, batch_size)
+        self._fh = open(path, "w", encoding="utf-8-sig", newline="")
+        self._csv: Optional[csv.DictWriter] = None
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        if self._csv is None:
+            self._csv = csv.DictWriter(self._fh, fieldnames=list(rows[0]), extrasaction="ignore")
+            self._csv.writeheader()
+        self._csv.writerows(rows)
+        self._fh.flush()
+
+    def _close(self) -> None:
+        self._fh.close()
+
+
+def result_schema():
+    """
+    결과 행(store.make_row) 컬럼의 Arrow 스키마: 키·정보·업종 컬럼 + METRIC_TARGETS 지표와 *_score 컬럼.
+    첫 배치의 값으로 추론하지 않으므로 앞쪽 종목에 결측이 몰려도 타입이 흔들리지 않습니다.
+    """
+    fields = [pa.field(name, pa.int64() if name == "year" else pa.string()) for name in KEY_COLUMNS]
+    fields += [pa.field(name, pa.float64() if name == "score" else pa.string()) for name in INFO_COLUMNS]
+    for name in METRIC_TARGETS:
+        fields += [pa.field(name, pa.float64()), pa.field(name + SCORE_SUFFIX, pa.float64())]
+    fields += [pa.field(name, pa.string() if typ == "TEXT" else pa.float64()) for name, typ in SECTOR_COLUMNS.items()]
+    return pa.schema(fields)
+
+
+class _ArrowBase(ResultWriter):
+    """결과 컬럼으로 정한 스키마(result_schema)로 배치마다 변환해 씁니다. 스키마에 없는 키는 버립니다."""
+
+    def __init__(self, path: str, batch_size: int = 500):
+        if pa is None:
+            raise ImportError("Parquet/Arrow 내보내기에는 pyarrow 가 필요합니다: pip install pyarrow")
+        super().__init__(path, batch_size)
+        self.schema = result_schema()
+        self._sink = None
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        if self._sink is None:
+            self._sink = self._open_sink(self.schema)
+        self._write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def _close(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
+
+
+class ParquetWriter(_ArrowBase):
+    """배치마다 Parquet row group 하나를 추가합니다."""
+
+    def _open_sink(self, schema):
+        return pq.ParquetWriter(self.path, schema, compression="zstd")
+
+    def _write_table(self, table) -> None:
+        self._sink.write_table(table, row_group_size=self.batch_size)
+
+
+class ArrowWriter(_ArrowBase):
+    """Arrow IPC 파일 포맷 (배치마다 RecordBatch 하나)."""
+
+    def _open_sink(self, schema):
+        return pa_ipc.new_file(self.path, schema)
+
+    def _write_table(self, table) -> None:
+        self._sink.write_table(table)
+
+
+WRITERS = {
+    "parquet": ParquetWriter,
+    "arrow":   ArrowWriter,
+    "jsonl":   JsonlWriter,
+    "csv":     CsvWriter,
+}
+
+
+def open_writer(path: str, fmt: Optional[str] = None, batch_size: int = 500) -> ResultWriter:
+    """
+    포맷(생략 시 확장자: .parquet/.arrow/.jsonl/.csv)에 맞는 스트리밍 writer를 엽니다.
+    """
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    fmt = {"feather": "arrow", "ipc": "arrow", "ndjson": "jsonl"}.get(fmt, fmt)
+    if fmt not in WRITERS:
+        raise ValueError(f"지원하지 않는 내보내기 포맷: '{fmt}' (사용 가능: {', '.join(WRITERS)})")
+    return WRITERS[fmt](path, batch_size=batch_size)
+
+
+class TopN:
+    """스트리밍 중 점수 상위 N개 행만 힙으로 유지합니다 (O(N) 메모리)."""
+
+    def __init__(self, n: int = 20, key: str = "score"):
+        self.n = n
+        self.key = key
+        self._heap: list = []
+        self._seq = 0
+
+    def add(self, row: Dict) -> None:
+        value = row.get(self.key)
+        if value is None:
+            return
+        self._seq += 1
+        item = (value, self._seq, row)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+        elif value > self._heap[0][0]:
+            heapq.heapreplace(self._heap, item)
+
+    def rows(self) -> List[Dict]:
+        return [row for _, _, row in sorted(self._heap, key=lambda x: (-x[0], x[1]))]
+
+
+def report_top_n(rows: List[Dict], columns: Optional[List[str]] = None, title: str = "상위 종목") -> None:
+    """
+    유니버스 실행 결과 중 상위 N개 종목을 콘솔 요약 테이블로 출력합니다.
+    - rows: 점수 내림차순으로 정렬된 결과 행 (TopN.rows())
+    - columns: 출력 컬럼 (기본: 종목코드, 기업명, 종합 점수, 코멘트)
+    """
+    columns = columns or ["stock_code", "corp_name", "score", "comment"]
+    print(Fore.CYAN + Style.BRIGHT + f"\n=== {title} {len(rows)}개 ===\n")
+    table = [
+        [i] + [f"{row.get(c):.1f}" if isinstance(row.get(c), float) else row.get(c) for c in columns]
+        for i, row in enumerate(rows, start=1)
+    ]
+    print(tabulate(table, headers=["순위"] + columns, tablefmt="github"))
+    print()
+
+
+def report_negative_cache(entries: pd.DataFrame, limit: int = 50) -> None:
+    """
+    네거티브 캐시 기록(NegativeCache.entries)을 사유별 건수와 함께 콘솔에 출력합니다.
+    다음 실행에서 조회를 생략할 (코드, 연도, 출처) 조합 목록입니다.
+    """
+    if entries.empty:
+        return
+    counts = entries["reason"].value_counts()
+    summary = ", ".join(f"{reason} {n}건" for reason, n in counts.items())
+    print(Fore.YELLOW + Style.BRIGHT + f"\n=== 조회 생략 대상 {len(entries)}건 ({summary}) ===\n")
+    columns = ["code", "year", "source", "reason", "detail", "expires_at"]
+    print(tabulate(entries[columns].head(limit).values.tolist(), headers=columns, tablefmt="github"))
+    if len(entries) > limit:
+        print(f"... 외 {len(entries) - limit}건")
+    print()
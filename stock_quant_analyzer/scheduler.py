@@ -0,0 +1,225 @@
+# scheduler.py
+
+import argparse
+import logging
+import datetime
+import pandas as pd
+from typing import Dict, FrozenSet, List, Optional
+
+from backend import MODES, use
+from data_provider import get_combined_data, get_filings
+from batch import list_universe, score_company, with_price_state
+from filings import load_filings, periodic_reports, relevant_reports
+from metric_graph import PRICE_METRICS, active_metrics, required_inputs
+from metrics import calculate_metrics
+from negative_cache import NegativeCache
+from scorer import calculate_score
+from store import ResultStore, make_row
+from statement_store import ANNUAL, StatementStore
+from ttm import QUARTERS, latest_report
+from config import (
+    RESULTS_DB_PATH, STATEMENT_STORE_DIR, METRIC_TARGETS, NEGATIVE_CACHE_PATH, DATA_BACKEND, DATA_ARCHIVE_PATH,
+    PRICE_STATE_PATH,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+
+def invalidate_reports(
+    reports: pd.DataFrame, statements: StatementStore, negative: Optional[NegativeCache] = None,
+) -> int:
+    """
+    새로 제출(정정 포함)된 보고서의 저장본을 삭제합니다. 삭제한 건수를 반환합니다.
+    negative 가 주어지면 해당 보고서의 '결과 없음' 기록도 지워 다음 조회에서 다시 받아오게 합니다.
+    """
+    removed = 0
+    for item in reports.itertuples(index=False):
+        if negative is not None:
+            for code in (item.corp_code, item.stock_code):
+                if code:
+                    negative.discard(code, int(item.year), item.reprt_code)
+        for code in (item.corp_code, item.stock_code):
+            if code and statements.invalidate(code, int(item.year), item.reprt_code):
+                removed += 1
+                break
+    return removed
+
+
+def refresh_prices(
+    row: Dict,
+    year: int,
+    metric_names: FrozenSet[str],
+    as_of: Optional[str] = None,
+    factors: Optional[Dict[str, float]] = None,
+) -> Optional[Dict]:
+    """
+    저장된 결과 행의 재무 지표는 그대로 두고 시세·펀더멘털 지표만 다시 계산해 점수를 갱신합니다.
+    재무제표(DART)는 조회하지 않습니다. 시세는 사업연도가 아니라 as_of(기본: 오늘)로 끝나는 최근 구간을 씁니다
+    (끝난 사업연도 구간이면 매번 같은 값이 나오므로).
+    factors 가 주어지면 (가격 엔진 상태 등 미리 계산한 가격 지표) 종목별 계산값 대신 사용하고,
+    factors 로 채워지는 지표에만 필요한 입력은 수집하지 않습니다 (모두 채워지면 시세를 받지 않음).
+    """
+    as_of = as_of or datetime.date.today().isoformat()
+    inputs = required_inputs(set(metric_names) - set(factors or ()))
+    data = get_combined_data(
+        row["stock_code"], year, inputs=inputs, price_end=as_of.replace("-", ""), metrics=metric_names,
+    )
+    if factors:
+        data["pykrx"].update(factors)
+    metrics = {name: (None if pd.isna(row.get(name)) else row.get(name)) for name in METRIC_TARGETS}
+    metrics.update(calculate_metrics(data["dart"], data["price"], data["pykrx"], only=metric_names))
+
+    result = calculate_score(metrics)
+    if not result or result[0] is None:
+        return None
+    score, comment, detail = result
+    return make_row(
+        row["corp_code"], year, metrics, score, comment, detail,
+        stock_code=row["stock_code"], corp_name=row["corp_name"], as_of=as_of,
+        reprt_code=row.get("reprt_code") or ANNUAL,
+    )
+
+
+def carry_forward(row: Dict, as_of: str) -> Dict:
+    """갱신하지 못한 결과 행을 값은 그대로 두고 as_of 만 옮긴 행으로 만듭니다 (결측은 None)."""
+    carried = {key: (None if not isinstance(value, str) and pd.isna(value) else value) for key, value in row.items()}
+    carried["as_of"] = as_of
+    return carried
+
+
+def run_schedule(
+    filings: pd.DataFrame,
+    year: int,
+    store: ResultStore,
+    statements: StatementStore,
+    universe: Optional[pd.DataFrame] = None,
+    reprt_code: str = ANNUAL,
+    batch_size: int = 100,
+    negative: Optional[NegativeCache] = None,
+    as_of: Optional[str] = None,
+    factor_table: Optional[pd.DataFrame] = None,
+) -> Dict[str, int]:
+    """
+    공시목록 기준 증분 재계산.
+    1) 정기보고서를 제출한 기업의 해당 보고서 저장본을 무효화
+    2) (year, reprt_code) 점수에 쓰이는 보고서를 낸 기업만 재무부터 다시 계산
+    3) 나머지 기존 결과는 시세·펀더멘털 지표만 갱신 (DART 호출 없음, 시세는 as_of 로 끝나는 최근 구간)
+    재계산·갱신에 실패했거나 갱신할 시세 지표가 없는 기존 결과도 같은 as_of 로 옮겨 저장해,
+    실행 후 모든 기업의 최신 행이 같은 as_of 를 갖게 합니다.
+    universe 가 주어지면 그 안의 기업만 대상으로 합니다.
+    negative(NegativeCache)가 주어지면 새 보고서의 '결과 없음' 기록을 해제하고 재계산에도 사용합니다.
+    as_of 기본값은 오늘입니다. factor_table(index=종목코드, batch.with_price_state)이 주어지면 3) 에서 그 값을 씁니다.
+    반환: {'filed', 'invalidated', 'rescored', 'price_refreshed', 'carried'}
+    """
+    as_of = as_of or datetime.date.today().isoformat()
+    reports = periodic_reports(filings)
+    if universe is not None:
+        reports = reports[reports["corp_code"].isin(universe["corp_code"])]
+    invalidated = invalidate_reports(reports, statements, negative)
+
+    relevant = relevant_reports(year, reprt_code)
+    mask = [(int(y), rc) in relevant for y, rc in zip(reports["year"], reports["reprt_code"])]
+    hit = reports[pd.Series(mask, index=reports.index, dtype=bool)]   # 빈 목록이 컬럼 선택이 되지 않도록
+    affected = hit.drop_duplicates("corp_code")
+    logger.info(f"정기보고서 {len(reports)}건, 무효화 {invalidated}건, 재계산 대상 {len(affected)}개 기업")
+
+    pending: List[Dict] = []
+    stats = {"filed": len(reports), "invalidated": invalidated, "rescored": 0, "price_refreshed": 0, "carried": 0}
+
+    def flush(force: bool = False) -> None:
+        if pending and (force or len(pending) >= batch_size):
+            store.upsert_many(pending)
+            pending.clear()
+
+    # 2) 새 보고서 기업: 전체 재계산
+    rescored = set()
+    for item in affected.itertuples(index=False):
+        try:
+            row = score_company(
+                item.corp_code, item.corp_name, item.stock_code, year, as_of,
+                statements=statements, reprt_code=reprt_code, negative=negative,
+            )
+        except Exception as e:
+            logger.error(f"[{item.stock_code}-{year}] 재계산 실패: {e}", exc_info=True)
+            row = None
+        if row:
+            pending.append(row)
+            rescored.add(item.corp_code)
+            stats["rescored"] += 1
+            flush()
+
+    # 3) 나머지: 시세 기반 지표만 갱신, 실패하면 기존 값을 as_of 만 옮겨 저장
+    price_metrics = active_metrics() & PRICE_METRICS
+    existing = store.latest_rows(year, reprt_code=reprt_code)
+    rest = existing[~existing["corp_code"].isin(rescored)]
+    if universe is not None:
+        rest = rest[rest["corp_code"].isin(universe["corp_code"])]
+    failed = set(affected["corp_code"])   # 새 보고서를 냈지만 재계산에 실패한 기업은 시세만 섞지 않고 그대로 옮김
+    for row in rest.to_dict("records"):
+        refreshed = None
+        if price_metrics and row["corp_code"] not in failed and row.get("stock_code"):
+            factors = None
+            if factor_table is not None and row["stock_code"] in factor_table.index:
+                factors = {k: float(v) for k, v in factor_table.loc[row["stock_code"]].items() if pd.notna(v)}
+            try:
+                refreshed = refresh_prices(row, year, price_metrics, as_of, factors)
+            except Exception as e:
+                logger.error(f"[{row['stock_code']}-{year}] 시세 갱신 실패: {e}", exc_info=True)
+        if refreshed:
+            pending.append(refreshed)
+            stats["price_refreshed"] += 1
+        else:
+            pending.append(carry_forward(row, as_of))
+            stats["carried"] += 1
+        flush()
+    flush(force=True)
+    logger.info(
+        f"재계산 {stats['rescored']}개, 시세 갱신 {stats['price_refreshed']}개, 기존 값 유지 {stats['carried']}개 완료"
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="신규 정기공시 기반 증분 재계산")
+    parser.add_argument("--start", default=None, help="공시 조회 시작일 (YYYYMMDD, 기본: 오늘)")
+    parser.add_argument("--end", default=None, help="공시 조회 종료일 (YYYYMMDD, 기본: 시작일)")
+    parser.add_argument("--filings", default=None, help="DART 조회 대신 사용할 공시목록 파일 (csv/json/jsonl)")
+    parser.add_argument("--year", type=int, default=None, help="점수 기준 연도 (기본: 전년도)")
+    parser.add_argument(
+        "--quarter", default=None, choices=[c for c in QUARTERS if c != ANNUAL] + ["latest"],
+        help="분기·반기 보고서 기준 TTM 점수 (batch.py --quarter 와 동일)",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="유니버스 최대 종목 수 (테스트용)")
+    parser.add_argument("--db", default=RESULTS_DB_PATH, help="결과 저장소(SQLite) 경로")
+    parser.add_argument("--statements", default=STATEMENT_STORE_DIR, help="재무제표 저장소 경로")
+    parser.add_argument(
+        "--price-state", nargs="?", const=PRICE_STATE_PATH, default=None,
+        help="시세 갱신에 price_engine 일일 갱신 상태의 Mom12M/Volatility 사용 (오늘 직전 거래일까지 반영된 경우)",
+    )
+    parser.add_argument("--backend", default=DATA_BACKEND, choices=MODES, help="데이터 백엔드 (record/replay: 응답 아카이브)")
+    parser.add_argument("--archive", default=DATA_ARCHIVE_PATH, help="record/replay 아카이브 경로")
+    args = parser.parse_args()
+    use(args.backend, args.archive)
+
+    today = datetime.date.today().strftime("%Y%m%d")
+    start = args.start or today
+    end = args.end or start
+    filings = load_filings(args.filings) if args.filings else get_filings(start, end)
+
+    year = args.year or datetime.datetime.now().year - 1
+    reprt_code = args.quarter or ANNUAL
+    if reprt_code == "latest":
+        year, reprt_code = latest_report()
+
+    universe = list_universe(args.limit) if args.limit else None
+    factor_table = with_price_state(None, args.price_state, today) if args.price_state else None
+    with ResultStore(args.db) as store, NegativeCache(NEGATIVE_CACHE_PATH) as negative:
+        run_schedule(
+            filings, year, store, StatementStore(args.statements), universe, reprt_code, negative=negative,
+            factor_table=factor_table,
+        )
+
+
+if __name__ == "__main__":
+    main()
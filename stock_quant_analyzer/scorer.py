@@ -7,6 +7,9 @@ from config import SCORING_WEIGHTS, SCORE_COMMENTS, METRIC_TARGETS
 
 logger = logging.getLogger(__name__)
 
+# 점수 계산식 버전. 정규화·가중 방식을 바꾸면 올려서 메모 캐시(memo.SCORE 계층)를 무효화합니다.
+SCORE_VERSION = 1
+
 
 def normalize_min_max(value: Optional[float], good_value: float, bad_value: float, direction: str = 'high') -> float:
     """
@@ -0,0 +1,199 @@
+# screen.py
+
+import re
+import argparse
+import logging
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from tabulate import tabulate
+
+from store import ResultStore, INFO_COLUMNS, LATEST_SNAPSHOT, config_hash
+from statement_store import ANNUAL
+from ttm import QUARTERS
+from config import RESULTS_DB_PATH, METRIC_TARGETS, SCORING_WEIGHTS
+
+logger = logging.getLogger(__name__)
+
+# 스크린에서 쓸 수 있는 필드: 스코어러가 아는 지표 + 종합 점수
+FIELDS = {name.lower(): name for name in list(METRIC_TARGETS) + list(SCORING_WEIGHTS) + ["score"]}
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<num>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"   # 지수 표기(1e10) 허용: 거래대금 등 원 단위 임계값
+    r"|(?P<op>>=|<=|==|!=|>|<|=)|(?P<paren>[()])|(?P<word>[A-Za-z_][A-Za-z0-9_]*))"
+)
+
+
+class ScreenSyntaxError(ValueError):
+    """스크린 쿼리 문법 오류 또는 알 수 없는 지표명."""
+
+
+@dataclass
+class Screen:
+    """파싱된 스크린: SQL WHERE 절과 바인딩 값, 정렬, 개수 제한."""
+    where: str
+    params: List[float] = field(default_factory=list)
+    order_by: str = "score"
+    ascending: bool = False
+    limit: Optional[int] = None
+
+    @property
+    def fields(self) -> List[str]:
+        return re.findall(r'"([^"]+)"', self.where)
+
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    tokens, pos = [], 0
+    query = query.strip()
+    while pos < len(query):
+        m = _TOKEN.match(query, pos)
+        if not m or m.end() == pos:
+            raise ScreenSyntaxError(f"해석할 수 없는 문자: '{query[pos:].strip()[:10]}'")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+        while pos < len(query) and query[pos].isspace():
+            pos += 1
+    return tokens
+
+
+def _field(word: str) -> str:
+    name = FIELDS.get(word.lower())
+    if name is None:
+        raise ScreenSyntaxError(f"알 수 없는 지표 '{word}' (사용 가능: {', '.join(sorted(FIELDS.values()))})")
+    return name
+
+
+class _Parser:
+    """
+    문법:
+        screen := expr? ('order' 'by' FIELD ('asc'|'desc')?)? ('limit' NUM)?
+        expr   := term ('or' term)*
+        term   := factor ('and' factor)*
+        factor := '(' expr ')' | FIELD OP NUM
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+        self.params: List[float] = []
+
+    def peek(self, word: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        if self.pos >= len(self.tokens):
+            return None
+        tok = self.tokens[self.pos]
+        if word is not None and not (tok[0] == "word" and tok[1].lower() == word):
+            return None
+        return tok
+
+    def take(self, kind: str) -> str:
+        tok = self.peek()
+        if tok is None or tok[0] != kind:
+            found = tok[1] if tok else "쿼리 끝"
+            raise ScreenSyntaxError(f"{kind} 토큰이 필요하지만 '{found}' 이(가) 있습니다.")
+        self.pos += 1
+        return tok[1]
+
+    def parse(self) -> Screen:
+        where = "1 = 1"
+        if self.peek() and not (self.peek("order") or self.peek("limit")):
+            where = self.expr()
+
+        screen = Screen(where=where, params=self.params)
+        if self.peek("order"):
+            self.pos += 1
+            if not self.peek("by"):
+                raise ScreenSyntaxError("'order' 뒤에는 'by' 가 와야 합니다.")
+            self.pos += 1
+            screen.order_by = _field(self.take("word"))
+            if self.peek("asc") or self.peek("desc"):
+                screen.ascending = self.take("word").lower() == "asc"
+        if self.peek("limit"):
+            self.pos += 1
+            screen.limit = int(float(self.take("num")))
+        if self.peek() is not None:
+            raise ScreenSyntaxError(f"예상하지 못한 토큰: '{self.peek()[1]}'")
+        return screen
+
+    def expr(self) -> str:
+        parts = [self.term()]
+        while self.peek("or"):
+            self.pos += 1
+            parts.append(self.term())
+        return " OR ".join(parts)
+
+    def term(self) -> str:
+        parts = [self.factor()]
+        while self.peek("and"):
+            self.pos += 1
+            parts.append(self.factor())
+        return " AND ".join(parts)
+
+    def factor(self) -> str:
+        tok = self.peek()
+        if tok == ("paren", "("):
+            self.pos += 1
+            inner = self.expr()
+            if self.take("paren") != ")":
+                raise ScreenSyntaxError("닫는 괄호가 필요합니다.")
+            return f"({inner})"
+        name = _field(self.take("word"))
+        op = self.take("op")
+        op = "=" if op == "==" else op
+        self.params.append(float(self.take("num")))
+        return f'"{name}" {op} ?'
+
+
+def parse_screen(query: str) -> Screen:
+    """
+    'ROE > 15 and PER < 10 order by score desc limit 50' 형태의 스크린 쿼리를 파싱합니다.
+    지표명은 METRIC_TARGETS / SCORING_WEIGHTS 기준으로 검증합니다 (대소문자 무시).
+    """
+    return _Parser(_tokenize(query)).parse()
+
+
+def run_screen(query: str, store: ResultStore, year: Optional[int] = None, reprt_code: str = ANNUAL) -> pd.DataFrame:
+    """
+    결과 저장소의 (year, reprt_code) 기업별 최신 스냅샷에 스크린을 실행합니다.
+    조건·정렬·LIMIT 은 모두 SQL 로 내려가 조건을 만족하는 행만 읽습니다.
+    """
+    screen = parse_screen(query)
+    cfg = config_hash()
+    year = year or next(iter(store.years()), None)
+    columns = ["corp_code"] + list(INFO_COLUMNS) + list(METRIC_TARGETS)
+    if year is None or store.latest_as_of(year, cfg, reprt_code) is None:
+        return pd.DataFrame(columns=columns)
+
+    where = f"({LATEST_SNAPSHOT}) AND ({screen.where})"
+    params = [year, reprt_code, cfg] + screen.params
+    order_by = (
+        f'"{screen.order_by}" IS NULL, "{screen.order_by}" '
+        f'{"ASC" if screen.ascending else "DESC"}, corp_code'
+    )
+    return store.select(where, params, columns, order_by, limit=screen.limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 지표·점수에 대한 스크린 실행")
+    parser.add_argument("query", help="예: \"ROE > 15 and PER < 10 order by score desc limit 50\"")
+    parser.add_argument("--year", type=int, default=None, help="기준 연도 (기본: 저장된 최신 연도)")
+    parser.add_argument(
+        "--quarter", default=None, choices=[c for c in QUARTERS if c != ANNUAL],
+        help="분기·반기 보고서 기준 TTM 결과 (batch.py --quarter 로 저장한 결과, 기본: 사업보고서)",
+    )
+    parser.add_argument("--db", default=RESULTS_DB_PATH, help="결과 저장소(SQLite) 경로")
+    args = parser.parse_args()
+
+    try:
+        with ResultStore(args.db) as store:
+            result = run_screen(args.query, store, args.year, args.quarter or ANNUAL)
+    except ScreenSyntaxError as e:
+        parser.error(str(e))
+
+    shown = list(dict.fromkeys(["stock_code", "corp_name", "score"] + parse_screen(args.query).fields))
+    print(tabulate(result[shown], headers="keys", tablefmt="github", showindex=False, floatfmt=".2f"))
+    print(f"\n{len(result)}개 종목")
+
+
+if __name__ == "__main__":
+    main()
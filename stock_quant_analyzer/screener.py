@@ -0,0 +1,60 @@
+# screener.py
+
+import logging
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from store import ResultStore, INFO_COLUMNS, LATEST_SNAPSHOT, SECTOR_COLUMNS, config_hash
+from statement_store import ANNUAL
+from config import SCREENER_PAGE_SIZE, METRIC_TARGETS
+
+logger = logging.getLogger(__name__)
+
+# 범위 필터: {지표명: (최소값 또는 None, 최대값 또는 None)}
+RangeFilters = Dict[str, Tuple[Optional[float], Optional[float]]]
+
+# 스크리너 화면에 내보내는 컬럼 (정규화 점수 컬럼은 제외)
+SCREEN_COLUMNS = ["corp_code"] + list(INFO_COLUMNS) + list(SECTOR_COLUMNS) + list(METRIC_TARGETS)
+
+
+def query_score_table(
+    store: ResultStore,
+    year: int,
+    filters: Optional[RangeFilters] = None,
+    sort_by: str = "score",
+    ascending: bool = False,
+    page: int = 1,
+    page_size: int = SCREENER_PAGE_SIZE,
+    reprt_code: str = ANNUAL,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    결과 저장소에서 해당 연도·보고서(reprt_code)의 기업별 최신 점수 스냅샷을 대상으로
+    지표 범위 필터 → 정렬 → 페이징을 SQL 로 수행합니다.
+    반환: (요청한 페이지의 행, 필터를 통과한 전체 행 수)
+    """
+    cfg = config_hash()
+    if store.latest_as_of(year, cfg, reprt_code) is None:
+        return pd.DataFrame(columns=SCREEN_COLUMNS), 0
+
+    clauses: List[str] = [f"({LATEST_SNAPSHOT})"]
+    params: List = [year, reprt_code, cfg]
+    for name, (low, high) in (filters or {}).items():
+        if name not in METRIC_TARGETS:
+            logger.warning(f"필터 대상 '{name}' 은(는) 등록된 지표가 아니므로 무시합니다.")
+            continue
+        if low is not None:
+            clauses.append(f'"{name}" >= ?')
+            params.append(low)
+        if high is not None:
+            clauses.append(f'"{name}" <= ?')
+            params.append(high)
+    where = " AND ".join(clauses)
+
+    order_by = ""
+    if sort_by == "score" or sort_by in METRIC_TARGETS:
+        # NULL 은 방향과 관계없이 맨 뒤로
+        order_by = f'"{sort_by}" IS NULL, "{sort_by}" {"ASC" if ascending else "DESC"}, corp_code'
+
+    total = store.count(where, params)
+    start = (max(page, 1) - 1) * page_size
+    rows = store.select(where, params, SCREEN_COLUMNS, order_by, limit=page_size, offset=start)
+    return rows, total
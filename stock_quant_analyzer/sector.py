@@ -0,0 +1,231 @@
+# sector.py
+
+import os
+import logging
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from config import SCORING_WEIGHTS, METRIC_TARGETS, SECTOR_DIR, SECTOR_MIN_COUNT
+from statement_store import ANNUAL
+
+logger = logging.getLogger(__name__)
+
+MARKET = "전체"          # 업종 표본이 적을 때 대신 쓰는 시장 전체 분포
+UNCLASSIFIED = "미분류"   # 업종 정보가 없는 종목
+QUANTILES = np.linspace(0.0, 1.0, 21)   # 5% 간격 분위수 (백분위 보간용)
+Q_COLUMNS = [f"q{int(round(q * 100)):03d}" for q in QUANTILES]
+STAT_COLUMNS = ["count", "mean", "std"] + Q_COLUMNS
+
+
+# ---------------------------------------------------------------------- #
+# 1. 업종 인덱스 (corp_code → KRX 업종)
+# ---------------------------------------------------------------------- #
+def build_industry_index(classifications: pd.DataFrame, corp_list: pd.DataFrame) -> pd.DataFrame:
+    """
+    KRX 업종 분류(stock_code, sector, market)와 DART 고유번호 목록을 합쳐
+    corp_code / stock_code / sector / market 인덱스를 만듭니다. 업종이 없는 종목은 UNCLASSIFIED.
+    """
+    listed = corp_list[["corp_code", "stock_code"]].copy()
+    listed["stock_code"] = listed["stock_code"].fillna("").astype(str).str.strip()
+    listed = listed[listed["stock_code"].str.len() == 6]
+    index = listed.merge(classifications[["stock_code", "sector", "market"]], on="stock_code", how="left")
+    index["sector"] = index["sector"].fillna(UNCLASSIFIED)
+    return index.drop_duplicates("corp_code").reset_index(drop=True)
+
+
+def load_industry_index(
+    date: str,
+    fetch: Callable[[str], pd.DataFrame],
+    corp_list: Callable[[], pd.DataFrame],
+    root: str = SECTOR_DIR,
+) -> pd.DataFrame:
+    """
+    date 기준 업종 인덱스를 {root}/industry_{date}.parquet 에서 읽고, 없으면 fetch(date)·corp_list() 로 만들어 저장합니다.
+    fetch 는 data_provider.get_sector_classifications 와 같은 모양의 DataFrame 을 반환해야 합니다.
+    """
+    path = os.path.join(root, f"industry_{date}.parquet")
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    index = build_industry_index(fetch(date), corp_list())
+    os.makedirs(root, exist_ok=True)
+    index.to_parquet(path, index=False)
+    logger.info(f"업종 인덱스 저장: {path} ({index['sector'].nunique()}개 업종, {len(index)}개 종목)")
+    return index
+
+
+# ---------------------------------------------------------------------- #
+# 2. 업종별 지표 분포
+# ---------------------------------------------------------------------- #
+def group_stats(
+    results: pd.DataFrame,
+    index: pd.DataFrame,
+    metrics: Optional[Iterable[str]] = None,
+    min_count: int = SECTOR_MIN_COUNT,
+) -> pd.DataFrame:
+    """
+    결과 행(corp_code + 지표 컬럼)을 업종별로 묶어 지표 분포를 한 번의 groupby 로 계산합니다.
+    반환: (sector, metric) 인덱스 × count/mean/std/q000~q100. 시장 전체 분포는 sector=MARKET 으로 함께 담고,
+    표본이 min_count 보다 적은 업종-지표는 제외해 조회 시 시장 분포를 쓰게 합니다.
+    """
+    metrics = [m for m in (metrics or METRIC_TARGETS) if m in results.columns]
+    frame = results[["corp_code"] + metrics].merge(index[["corp_code", "sector"]], on="corp_code", how="left")
+    frame["sector"] = frame["sector"].fillna(UNCLASSIFIED)
+
+    long = frame.melt(id_vars="sector", value_vars=metrics, var_name="metric")
+    # 저장소에서 전부 NULL 인 지표 컬럼은 object 로 읽히므로 숫자로 맞춤
+    long["value"] = pd.to_numeric(long["value"], errors="coerce")
+    long = long.dropna(subset=["value"])
+    market = long.assign(sector=MARKET)
+    grouped = pd.concat([long, market], ignore_index=True).groupby(["sector", "metric"])["value"]
+
+    stats = grouped.agg(["count", "mean", "std"])
+    quantiles = grouped.quantile(QUANTILES).unstack()
+    quantiles.columns = Q_COLUMNS
+    stats = stats.join(quantiles)
+    keep = (stats["count"] >= min_count) | (stats.index.get_level_values("sector") == MARKET)
+    return stats[keep]
+
+
+def _percentile(values: np.ndarray, quantiles: np.ndarray) -> np.ndarray:
+    """
+    분위수 표에 값을 보간해 0~100 백분위를 구합니다.
+    같은 값이 여러 분위수에 걸친 경우(배당 0 등) 양쪽에서 보간한 값의 가운데를 씁니다.
+    """
+    pct = QUANTILES * 100
+    lo = np.interp(values, quantiles, pct)
+    hi = np.interp(-values, -quantiles[::-1], pct[::-1])
+    return (lo + hi) / 2
+
+
+class SectorStats:
+    """
+    업종 인덱스 + 업종별 분포 표. 한 번 만들면 종목별 조회는 표 조회와 보간만 합니다.
+    - relative(): 지표별 업종 내 z-score 와 백분위
+    - score(): 백분위를 SCORING_WEIGHTS 로 가중평균한 업종 상대 점수 (0~100)
+    """
+
+    def __init__(self, stats: pd.DataFrame, index: pd.DataFrame):
+        self.stats = stats
+        self.index = index
+        self._sector = dict(zip(index["corp_code"], index["sector"]))
+        self._sector.update(zip(index["stock_code"], index["sector"]))
+        self._rows: Dict[Tuple[str, str], np.ndarray] = {
+            key: row for key, row in zip(stats.index, stats[STAT_COLUMNS].to_numpy(dtype=float))
+        }
+
+    def sector_of(self, code: str) -> str:
+        """corp_code 또는 종목코드의 업종."""
+        return self._sector.get(code, UNCLASSIFIED)
+
+    def _row(self, sector: str, metric: str) -> Optional[np.ndarray]:
+        return self._rows.get((sector, metric), self._rows.get((MARKET, metric)))
+
+    def relative(self, metrics: Dict[str, Optional[float]], sector: str) -> Dict[str, Dict[str, float]]:
+        """{지표: {'z': 업종 내 z-score, 'pct': 업종 내 백분위(방향 보정 전)}}"""
+        out = {}
+        for name, value in metrics.items():
+            if value is None or pd.isna(value):
+                continue
+            row = self._row(sector, name)
+            if row is None:
+                continue
+            mean, std = row[1], row[2]
+            z = (value - mean) / std if std and not np.isnan(std) else 0.0
+            pct = float(_percentile(np.array([float(value)]), row[3:])[0])
+            out[name] = {"z": float(np.clip(z, -3, 3)), "pct": pct}
+        return out
+
+    def score(self, metrics: Dict[str, Optional[float]], sector: str) -> Tuple[Optional[float], Dict[str, float]]:
+        """
+        업종 상대 점수와 지표별 점수(방향 보정된 백분위)를 반환합니다.
+        METRIC_TARGETS 의 direction 이 'low' 인 지표는 100 - 백분위. 값이 없는 지표는 가중치에서 뺍니다.
+        """
+        relative = self.relative({k: metrics.get(k) for k in SCORING_WEIGHTS}, sector)
+        detail, total, weight_sum = {}, 0.0, 0.0
+        for name, weight in SCORING_WEIGHTS.items():
+            if name not in relative:
+                continue
+            pct = relative[name]["pct"]
+            if METRIC_TARGETS.get(name, {}).get("direction") == "low":
+                pct = 100.0 - pct
+            detail[name] = pct
+            total += pct * weight
+            weight_sum += weight
+        return (total / weight_sum if weight_sum else None), detail
+
+    def score_frame(self, results: pd.DataFrame) -> pd.DataFrame:
+        """결과 행 전체의 sector / sector_score 를 업종·지표 단위로 벡터화해 계산합니다."""
+        out = pd.DataFrame(index=results.index)
+        out["sector"] = results["corp_code"].map(self.sector_of)
+        total = pd.Series(0.0, index=results.index)
+        weight_sum = pd.Series(0.0, index=results.index)
+        groups = out.groupby("sector").groups
+        for name, weight in SCORING_WEIGHTS.items():
+            if name not in results.columns:
+                continue
+            values = pd.to_numeric(results[name], errors="coerce")
+            pct = pd.Series(np.nan, index=results.index)
+            for sector, idx in groups.items():
+                row = self._row(sector, name)
+                if row is None:
+                    continue
+                v = values.loc[idx]
+                valid = v.notna()
+                pct.loc[v.index[valid]] = _percentile(v[valid].to_numpy(dtype=float), row[3:])
+            if METRIC_TARGETS.get(name, {}).get("direction") == "low":
+                pct = 100.0 - pct
+            total += pct.fillna(0.0) * weight
+            weight_sum += pct.notna() * weight
+        out["sector_score"] = (total / weight_sum).where(weight_sum > 0)
+        return out
+
+    # ------------------------------------------------------------------ #
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.stats.reset_index().to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path: str, index: pd.DataFrame) -> "SectorStats":
+        return cls(pd.read_parquet(path).set_index(["sector", "metric"]), index)
+
+
+def stats_path(year: int, as_of: str, cfg: str, digest: str, root: str = SECTOR_DIR) -> str:
+    return os.path.join(root, f"stats_{year}_{as_of}_{cfg}_{digest}.parquet")
+
+
+@lru_cache(maxsize=8)
+def _cached_stats(path: str, index_path: str) -> Optional[SectorStats]:
+    if not (os.path.exists(path) and os.path.exists(index_path)):
+        return None
+    return SectorStats.load(path, pd.read_parquet(index_path))
+
+
+def sector_stats(
+    store, year: int, index: pd.DataFrame, index_date: str, root: str = SECTOR_DIR, reprt_code: str = ANNUAL,
+) -> Optional[SectorStats]:
+    """
+    ResultStore 의 (year, reprt_code, 기업별 최신) 결과로 업종 분포를 만들거나, 같은 결과로 만든 분포가 저장돼 있으면 그대로 읽습니다.
+    저장 키에 결과 내용의 지문을 넣으므로, 일부 종목만 처리한 실행(--limit, analyze.py --save)이 만든 분포를
+    같은 날 전체 실행이 다시 쓰지 않습니다 (sector / sector_score 컬럼은 지문에서 제외).
+    프로세스 안에서도 캐시하므로 단일 종목 조회가 반복돼도 시장 전체를 다시 계산하지 않습니다.
+    결과가 없으면 None.
+    """
+    from memo import fingerprint
+    from store import SECTOR_COLUMNS, config_hash
+
+    as_of = store.latest_as_of(year, reprt_code=reprt_code)
+    if as_of is None:
+        return None
+    rows = store.latest_rows(year, reprt_code=reprt_code)
+    digest = fingerprint(rows.drop(columns=[c for c in SECTOR_COLUMNS if c in rows.columns]))[:12]
+    path = stats_path(year, as_of, config_hash(), digest, root)
+    index_path = os.path.join(root, f"industry_{index_date}.parquet")
+    cached = _cached_stats(path, index_path)
+    if cached is not None:
+        return cached
+    stats = SectorStats(group_stats(rows, index), index)
+    stats.save(path)
+    _cached_stats.cache_clear()
+    logger.info(f"업종 분포 저장: {path} ({stats.stats.index.get_level_values('sector').nunique()}개 그룹)")
+    return stats
@@ -0,0 +1,126 @@
+# snapshot.py
+
+import math
+from array import array
+import pandas as pd
+from typing import Dict, Optional
+from metrics import ALIASES, SOURCES, _match_row
+
+# 스냅샷에 담는 기간 컬럼 (finstate_all 금액 컬럼 전체)
+PERIODS = (
+    "thstrm_amount",      # 당기
+    "frmtrm_amount",      # 전기
+    "bfefrmtrm_amount",   # 전전기
+    "thstrm_add_amount",  # 당기 누적 (분기/반기 보고서)
+    "frmtrm_add_amount",  # 전기 누적 (분기/반기 보고서)
+)
+ACCOUNTS = tuple(ALIASES)
+
+_NAN = float("nan")
+_ACCOUNT_INDEX = {name: i for i, name in enumerate(ACCOUNTS)}
+_PERIOD_INDEX = {name: i for i, name in enumerate(PERIODS)}
+
+
+def _to_float(value) -> float:
+    value = pd.to_numeric(value, errors="coerce")
+    return _NAN if value is None or pd.isna(value) else float(value)
+
+
+class FinancialSnapshot:
+    """
+    지표 계산에 필요한 계정(ALIASES)만 추려 담은 기업·연도별 재무 스냅샷.
+    - values: 계정 × 기간(PERIODS) 금액을 담은 float64 array (결측은 NaN)
+    - prev:   전년도 손익계산서 당기 금액 (성장 지표용)
+    - raw:    keep_raw=True 일 때만 원본 {'bs','is','cf'} DataFrame 보관
+    DataFrame 대신 __slots__ + array 로 보관해 기업당 수백 바이트 수준으로 유지합니다.
+    """
+
+    __slots__ = ("corp_code", "year", "reprt_code", "values", "prev", "raw")
+
+    def __init__(
+        self,
+        corp_code: Optional[str],
+        year: Optional[int],
+        reprt_code: str,
+        values: array,
+        prev: array,
+        raw: Optional[Dict[str, pd.DataFrame]] = None,
+    ):
+        self.corp_code = corp_code
+        self.year = year
+        self.reprt_code = reprt_code
+        self.values = values
+        self.prev = prev
+        self.raw = raw
+
+    @classmethod
+    def from_statements(
+        cls,
+        dart_data: Dict[str, pd.DataFrame],
+        is_prev: Optional[pd.DataFrame] = None,
+        keep_raw: bool = False,
+    ) -> "FinancialSnapshot":
+        """
+        {'bs','is','cf'} DataFrame 에서 ALIASES 계정의 모든 기간 금액을 추출합니다.
+        계정 매칭 규칙은 metrics._lookup 과 동일합니다.
+        """
+        values = array("d", [_NAN]) * (len(ACCOUNTS) * len(PERIODS))
+        prev = array("d", [_NAN]) * len(ACCOUNTS)
+        for i, name in enumerate(ACCOUNTS):
+            df = dart_data.get(SOURCES[name], pd.DataFrame())
+            row = _match_row(df, ALIASES[name])
+            if row is not None:
+                for j, period in enumerate(PERIODS):
+                    if period in row.index:
+                        values[i * len(PERIODS) + j] = _to_float(row[period])
+            if SOURCES[name] == "is" and is_prev is not None:
+                prev_row = _match_row(is_prev, ALIASES[name])
+                if prev_row is not None:
+                    prev[i] = _to_float(prev_row.get("thstrm_amount"))
+
+        corp_code = year = None
+        reprt_code = "11011"
+        for df in dart_data.values():
+            if df is not None and not df.empty and "corp_code" in df.columns:
+                corp_code = df["corp_code"].iloc[0]
+                if "bsns_year" in df.columns:
+                    year = int(df["bsns_year"].iloc[0])
+                if "reprt_code" in df.columns:
+                    reprt_code = df["reprt_code"].iloc[0]
+                break
+
+        raw = {k: dart_data.get(k) for k in ("bs", "is", "cf")} if keep_raw else None
+        return cls(corp_code, year, reprt_code, values, prev, raw)
+
+    @classmethod
+    def blank(cls, corp_code: Optional[str], year: Optional[int], reprt_code: str) -> "FinancialSnapshot":
+        """모든 금액이 결측(NaN)인 스냅샷 (ttm.py 등에서 값을 직접 채울 때 사용)."""
+        values = array("d", [_NAN]) * (len(ACCOUNTS) * len(PERIODS))
+        prev = array("d", [_NAN]) * len(ACCOUNTS)
+        return cls(corp_code, year, reprt_code, values, prev)
+
+    # ------------------------------------------------------------------ #
+    def set(self, account: str, value: Optional[float], period: str = "thstrm_amount") -> None:
+        self.values[_ACCOUNT_INDEX[account] * len(PERIODS) + _PERIOD_INDEX[period]] = _NAN if value is None else value
+
+    def set_prev(self, account: str, value: Optional[float]) -> None:
+        self.prev[_ACCOUNT_INDEX[account]] = _NAN if value is None else value
+
+    def get(self, account: str, period: str = "thstrm_amount") -> Optional[float]:
+        """계정 금액을 반환합니다. 없으면 None."""
+        value = self.values[_ACCOUNT_INDEX[account] * len(PERIODS) + _PERIOD_INDEX[period]]
+        return None if math.isnan(value) else value
+
+    def get_prev(self, account: str) -> Optional[float]:
+        """전년도 손익계산서 금액. is_prev 가 없으면 당기 보고서의 전기(frmtrm) 금액으로 대체."""
+        value = self.prev[_ACCOUNT_INDEX[account]]
+        if math.isnan(value):
+            return self.get(account, "frmtrm_amount")
+        return value
+
+    def nbytes(self) -> int:
+        """금액 버퍼 크기 (원본 DataFrame 제외)."""
+        return self.values.itemsize * len(self.values) + self.prev.itemsize * len(self.prev)
+
+    def __repr__(self) -> str:
+        return f"FinancialSnapshot({self.corp_code}, {self.year}, {self.reprt_code})"
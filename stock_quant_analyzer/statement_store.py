@@ -0,0 +1,302 @@
+# statement_store.py
+
+import os
+import json
+import shutil
+import logging
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import STATEMENT_STORE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 동작 (동시 작성자는 하나만 안전)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ANNUAL = "11011"   # 사업보고서
+
+# 기업·연도 간에 같은 문자열이 반복되는 컬럼 → 전역 사전 코드(int32)로 저장, 로드시 category
+CATEGORY_COLUMNS = (
+    "corp_code", "stock_code", "bsns_year", "reprt_code", "sj_div", "sj_nm",
+    "account_id", "account_nm", "account_detail", "currency",
+)
+# 금액 컬럼 → 저장 시 한 번만 숫자로 파싱 (정수면 Int64, 소수 포함 시 float64)
+AMOUNT_COLUMNS = (
+    "thstrm_amount", "thstrm_add_amount", "frmtrm_amount", "frmtrm_q_amount",
+    "frmtrm_add_amount", "bfefrmtrm_amount",
+)
+
+
+def parse_amounts(values: pd.Series) -> pd.Series:
+    """'1,234' / '-' / '' 형태의 금액 문자열을 Int64(정수) 또는 float64 로 변환합니다."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    parsed = pd.to_numeric(values.astype(str).str.replace(",", "", regex=False).str.strip(), errors="coerce")
+    valid = parsed.dropna()
+    if (valid == np.floor(valid)).all() and (valid.abs() < 2 ** 63).all():
+        return parsed.astype("Int64")
+    return parsed
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """path 잠금 파일에 대한 프로세스 간 배타 잠금 (fcntl 이 없는 환경에서는 잠그지 않음)."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _write_json(path: str, payload) -> None:
+    """임시 파일에 쓴 뒤 교체해 읽는 쪽이 쓰다 만 파일을 보지 않게 합니다."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class CategoryDictionary:
+    """
+    CATEGORY_COLUMNS 값 → 정수 코드 전역 사전 ({root}/dictionary.json).
+    코드는 추가만 되고 바뀌지 않으므로 모든 파일이 같은 카테고리 집합을 공유합니다.
+    처음 보는 값은 stage() 로 메모리에 모아 두었다가 save() 에서 한 번에 코드를 매기고 저장합니다:
+    파일 잠금 안에서 디스크 사전을 다시 읽어 합치고 그 뒤에 이어 붙이므로,
+    여러 프로세스(스케줄러·배치)가 함께 써도 코드가 어긋나지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.values: Dict[str, List[str]] = {}
+        self._index: Dict[str, Dict[str, int]] = {}
+        self._categories: Dict[str, pd.Index] = {}
+        self._staged: Dict[str, Dict[str, None]] = {}   # 컬럼 → 아직 코드가 없는 값 (순서 유지)
+        self._load()
+
+    def _load(self) -> None:
+        """디스크 사전을 메모리 사전에 합칩니다. 코드는 추가만 되므로 디스크 목록이 더 길면 그 목록을 따릅니다."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as fh:
+            disk = json.load(fh)
+        for column, values in disk.items():
+            known = self.values.get(column, [])
+            if len(values) <= len(known):
+                continue
+            if values[:len(known)] != known:
+                logger.warning(f"사전 {self.path} 의 '{column}' 코드가 메모리 사전과 다릅니다 — 디스크 사전을 따릅니다.")
+            self.values[column] = list(values)
+            self._index[column] = {v: i for i, v in enumerate(values)}
+            self._categories.pop(column, None)
+
+    @staticmethod
+    def _strings(values: pd.Series) -> pd.Series:
+        return values.astype(str).where(values.notna())
+
+    def stage(self, column: str, values: pd.Series) -> None:
+        """처음 보는 값을 메모리에만 모아 둡니다. 코드는 save() 에서 매겨집니다."""
+        index = self._index.get(column, {})
+        staged = self._staged.setdefault(column, {})
+        for value in pd.unique(self._strings(values).dropna()):
+            if value not in index:
+                staged[value] = None
+
+    def save(self) -> None:
+        """모아 둔 새 값에 코드를 매기고 파일 잠금 안에서 디스크 사전과 합쳐 한 번에 저장합니다."""
+        if not any(self._staged.values()):
+            return
+        with _file_lock(self.path + ".lock"):
+            self._load()   # 다른 프로세스가 그사이 추가한 코드 뒤에 이어 붙임
+            for column, new in self._staged.items():
+                known = self.values.setdefault(column, [])
+                index = self._index.setdefault(column, {})
+                for value in new:
+                    if value not in index:
+                        index[value] = len(known)
+                        known.append(value)
+                self._categories.pop(column, None)
+            _write_json(self.path, self.values)
+        self._staged.clear()
+
+    def encode(self, column: str, values: pd.Series) -> np.ndarray:
+        """문자열 Series 를 코드 배열로 변환합니다 (결측은 -1). stage() 하지 않은 새 값이 있으면 먼저 save()."""
+        values = self._strings(values)
+        self.stage(column, values)
+        if self._staged.get(column):
+            self.save()
+        return values.map(self._index.get(column, {}), na_action="ignore").fillna(-1).astype("int32").to_numpy()
+
+    def categories(self, column: str) -> pd.Index:
+        if column not in self._categories:
+            self._categories[column] = pd.Index(self.values.get(column, []), dtype=object)
+        return self._categories[column]
+
+    def decode(self, column: str, codes: pd.Series) -> pd.Categorical:
+        codes = codes.to_numpy()
+        if len(codes) and codes.max() >= len(self.values.get(column, [])):
+            self._load()   # 이 인스턴스를 연 뒤 다른 프로세스가 추가한 코드
+        return pd.Categorical.from_codes(codes, categories=self.categories(column))
+
+
+class StatementStore:
+    """
+    finstate_all 형태의 재무제표를 (corp_code, year, reprt_code) 단위로 보관하는 로컬 저장소.
+    디렉터리 구조: {root}/{year}/{reprt_code}/{corp_code}/{sj_div}.parquet
+    - 재무제표 종류(sj_div)별 파일로 나눠 저장하므로 덤프 파일을 종류별로 흘려 넣을 수 있음
+    - codes.json 에 종목코드(6자리) → corp_code 매핑을 보관해 두 코드 모두로 조회 가능
+    - 반복 문자열 컬럼은 전역 사전 코드로, 금액은 숫자로 저장해 파일 크기와 로드 비용을 줄임
+    - put_part 는 메모리에 모아 두고 flush() 에서 사전을 한 번 저장한 뒤 parquet 를 씀
+      (사전에 없는 코드를 가진 파일이 보이는 일이 없고, flush 전에 중단되면 아무것도 남지 않음)
+    read_only=True 면 조회만 하고 put / put_part / register_codes 는 아무것도 쓰지 않습니다.
+    사전 파일을 덮어쓰지 않으므로 여러 프로세스가 같은 저장소를 동시에 읽을 때 사용합니다.
+    """
+
+    def __init__(self, root: str = STATEMENT_STORE_DIR, read_only: bool = False, flush_rows: int = 500_000):
+        self.root = root
+        self.read_only = read_only
+        self.flush_rows = flush_rows   # 모아 둔 행이 이만큼 쌓이면 put_part 안에서 flush
+        if not read_only:
+            os.makedirs(root, exist_ok=True)
+        self._codes: Optional[Dict[str, str]] = None
+        self.dictionary = CategoryDictionary(os.path.join(root, "dictionary.json"))
+        # parquet 경로 → (기존 파일에 이어 붙일지, 아직 쓰지 않은 프레임들)
+        self._pending: Dict[str, Tuple[bool, List[pd.DataFrame]]] = {}
+        self._pending_rows = 0
+
+    # ------------------------------------------------------------------ #
+    @property
+    def codes(self) -> Dict[str, str]:
+        if self._codes is None:
+            path = os.path.join(self.root, "codes.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as fh:
+                    self._codes = json.load(fh)
+            else:
+                self._codes = {}
+        return self._codes
+
+    def register_codes(self, mapping: Dict[str, str]) -> None:
+        """종목코드 → corp_code 매핑을 추가하고 codes.json 에 저장합니다."""
+        if self.read_only:
+            return
+        path = os.path.join(self.root, "codes.json")
+        with _file_lock(path + ".lock"):
+            # 다른 프로세스가 그사이 등록한 매핑을 덮어쓰지 않도록 디스크 내용과 합쳐 저장
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as fh:
+                    self.codes.update({k: v for k, v in json.load(fh).items() if k not in mapping})
+            self.codes.update(mapping)
+            _write_json(path, self.codes)
+
+    def resolve(self, code: str) -> str:
+        """6자리 종목코드면 corp_code 로 변환, 그 외는 그대로 반환."""
+        return self.codes.get(code, code)
+
+    def _dir(self, corp_code: str, year: int, reprt_code: str) -> str:
+        return os.path.join(self.root, str(year), reprt_code, self.resolve(corp_code))
+
+    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        out = df.reset_index(drop=True).copy()
+        for col in out.columns:
+            if col in CATEGORY_COLUMNS:
+                out[col] = self.dictionary.encode(col, out[col].astype(object))
+            elif col in AMOUNT_COLUMNS:
+                out[col] = parse_amounts(out[col])
+        return out
+
+    def _decode(self, df: pd.DataFrame) -> pd.DataFrame:
+        for col in df.columns:
+            if col in CATEGORY_COLUMNS:
+                if pd.api.types.is_integer_dtype(df[col]):
+                    df[col] = self.dictionary.decode(col, df[col])
+                else:   # 사전 도입 이전에 저장된 문자열 파일
+                    df[col] = df[col].astype("category")
+            elif col in AMOUNT_COLUMNS:
+                df[col] = parse_amounts(df[col])
+        return df
+
+    def flush(self) -> None:
+        """모아 둔 새 사전 값을 한 번에 저장한 뒤, 그 코드로 모아 둔 parquet 들을 씁니다."""
+        self.dictionary.save()
+        for fn, (append, frames) in self._pending.items():
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            df = self._encode(pd.concat(frames, ignore_index=True))
+            if append and os.path.exists(fn):
+                df = pd.concat([pd.read_parquet(fn), df], ignore_index=True)
+            df.to_parquet(fn, index=False)
+        self._pending.clear()
+        self._pending_rows = 0
+
+    # ------------------------------------------------------------------ #
+    def has(self, corp_code: str, year: int, reprt_code: str = ANNUAL) -> bool:
+        return os.path.isdir(self._dir(corp_code, year, reprt_code))
+
+    def put_part(
+        self, corp_code: str, year: int, reprt_code: str, sj_div: str, df: pd.DataFrame, append: bool = False
+    ) -> None:
+        """
+        재무제표 한 종류(sj_div)를 저장 대기열에 넣습니다. append=True 면 기존 행 뒤에 이어 붙입니다.
+        실제 파일은 flush() (또는 대기 행이 flush_rows 를 넘을 때) 에 쓰입니다.
+        """
+        if self.read_only:
+            return
+        fn = os.path.join(self._dir(corp_code, year, reprt_code), f"{sj_div}.parquet")
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                self.dictionary.stage(col, df[col])
+        if append and fn in self._pending:
+            self._pending[fn][1].append(df)
+        else:
+            self._pending[fn] = (append, [df])
+        self._pending_rows += len(df)
+        if self._pending_rows >= self.flush_rows:
+            self.flush()
+
+    def put(self, corp_code: str, year: int, full_df: pd.DataFrame, reprt_code: str = ANNUAL) -> None:
+        """finstate_all 결과 전체를 sj_div 별로 나눠 저장합니다."""
+        if self.read_only or full_df is None or full_df.empty or "sj_div" not in full_df.columns:
+            return
+        for sj_div, part in full_df.groupby("sj_div", sort=False, observed=True):
+            self.put_part(corp_code, year, reprt_code, sj_div, part)
+        self.flush()
+
+    def get(self, corp_code: str, year: int, reprt_code: str = ANNUAL) -> pd.DataFrame:
+        """저장된 재무제표를 finstate_all 과 같은 하나의 DataFrame으로 반환합니다. 없으면 빈 DataFrame."""
+        path = self._dir(corp_code, year, reprt_code)
+        if not os.path.isdir(path):
+            return pd.DataFrame()
+        parts = [pd.read_parquet(os.path.join(path, fn)) for fn in sorted(os.listdir(path)) if fn.endswith(".parquet")]
+        if not parts:
+            return pd.DataFrame()
+        # 코드 상태로 합친 뒤 한 번만 category 로 복원
+        return self._decode(pd.concat(parts, ignore_index=True))
+
+    def invalidate(self, corp_code: str, year: int, reprt_code: str = ANNUAL) -> bool:
+        """해당 키의 저장본을 삭제합니다. 삭제했으면 True."""
+        path = self._dir(corp_code, year, reprt_code)
+        self._pending = {fn: entry for fn, entry in self._pending.items() if os.path.dirname(fn) != path}
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+            return True
+        return False
+
+    def keys(self, year: Optional[int] = None, reprt_code: Optional[str] = None) -> Iterator[Tuple[str, int, str]]:
+        """저장된 (corp_code, year, reprt_code) 키를 순회합니다."""
+        years = [str(year)] if year is not None else sorted(os.listdir(self.root))
+        for y in years:
+            ydir = os.path.join(self.root, y)
+            if not y.isdigit() or not os.path.isdir(ydir):
+                continue
+            for rc in ([reprt_code] if reprt_code else sorted(os.listdir(ydir))):
+                rdir = os.path.join(ydir, rc)
+                if os.path.isdir(rdir):
+                    for corp_code in sorted(os.listdir(rdir)):
+                        yield corp_code, int(y), rc
@@ -0,0 +1,233 @@
+# store.py
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import datetime
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Sequence
+from config import RESULTS_DB_PATH, SCORING_WEIGHTS, METRIC_TARGETS
+from statement_store import ANNUAL
+
+logger = logging.getLogger(__name__)
+
+# 결과 테이블 키 (조회 인덱스 겸 upsert 충돌 기준). reprt_code: 기준 보고서 (사업보고서 또는 분기·반기 TTM)
+KEY_COLUMNS = ("corp_code", "year", "reprt_code", "as_of", "config_hash")
+INFO_COLUMNS = ("stock_code", "corp_name", "score", "comment")
+SCORE_SUFFIX = "_score"   # 지표별 0~100 정규화 점수 컬럼 접미사
+SECTOR_COLUMNS = {"sector": "TEXT", "sector_score": "REAL"}   # 업종 상대 점수 (sector.py, 배치 후처리)
+
+
+def config_hash() -> str:
+    """SCORING_WEIGHTS/METRIC_TARGETS 내용으로 만든 짧은 해시. 설정이 바뀌면 값도 바뀝니다."""
+    payload = json.dumps({"weights": SCORING_WEIGHTS, "targets": METRIC_TARGETS}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def make_row(
+    corp_code: str,
+    year: int,
+    metrics: Dict[str, Optional[float]],
+    score: Optional[float],
+    comment: str,
+    detail: Dict[str, float],
+    stock_code: Optional[str] = None,
+    corp_name: Optional[str] = None,
+    as_of: Optional[str] = None,
+    reprt_code: str = ANNUAL,
+) -> Dict:
+    """calculate_metrics / calculate_score 결과를 결과 테이블의 한 행으로 변환합니다."""
+    row = {
+        "corp_code":   corp_code,
+        "year":        int(year),
+        "reprt_code":  reprt_code,
+        "as_of":       as_of or datetime.date.today().isoformat(),
+        "config_hash": config_hash(),
+        "stock_code":  stock_code,
+        "corp_name":   corp_name,
+        "score":       score,
+        "comment":     comment,
+    }
+    for name in METRIC_TARGETS:
+        value = metrics.get(name)
+        row[name] = float(value) if value is not None else None
+        row[name + SCORE_SUFFIX] = detail.get(name)
+    return row
+
+
+# 기업별 최신 스냅샷 조건 (파라미터: year, reprt_code, config_hash).
+# 일부 기업만 다시 계산해도(analyze.py --save, 스케줄러) 나머지 기업은 각자의 최신 행으로 남도록
+# 전역 MAX(as_of) 대신 기업마다 상관 서브쿼리로 고릅니다. 사업보고서와 분기 TTM 결과는 서로 섞지 않습니다.
+LATEST_SNAPSHOT = (
+    "year = ? AND reprt_code = ? AND config_hash = ? AND as_of = ("
+    "SELECT MAX(as_of) FROM results r WHERE r.corp_code = results.corp_code "
+    "AND r.year = results.year AND r.reprt_code = results.reprt_code AND r.config_hash = results.config_hash)"
+)
+
+
+class ResultStore:
+    """
+    지표/점수 결과를 (corp_code, year, reprt_code, as_of, config_hash) 키로 저장하는 SQLite 저장소.
+    - 원시 지표, 지표별 정규화 점수, 종합 점수를 컬럼으로 보관
+    - 배치 실행 결과를 upsert_many 로 한 트랜잭션에 일괄 반영
+    """
+
+    def __init__(self, path: str = RESULTS_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    # ------------------------------------------------------------------ #
+    def metric_columns(self) -> List[str]:
+        cols = []
+        for name in METRIC_TARGETS:
+            cols += [name, name + SCORE_SUFFIX]
+        return cols
+
+    def _create_table(self) -> None:
+        value_cols = ", ".join(f'"{c}" REAL' for c in self.metric_columns())
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS results (
+                corp_code   TEXT    NOT NULL,
+                year        INTEGER NOT NULL,
+                reprt_code  TEXT    NOT NULL DEFAULT '{ANNUAL}',
+                as_of       TEXT    NOT NULL,
+                config_hash TEXT    NOT NULL,
+                stock_code  TEXT,
+                corp_name   TEXT,
+                score       REAL,
+                comment     TEXT,
+                sector      TEXT,
+                sector_score REAL,
+                {value_cols},
+                PRIMARY KEY (corp_code, year, reprt_code, as_of, config_hash)
+            )
+        """)
+
+    def _ensure_schema(self) -> None:
+        previous = {r[1]: r[2] for r in self.conn.execute("PRAGMA table_info(results)")}
+        if previous and "reprt_code" not in previous:
+            # 이전 버전 DB: 키에 reprt_code 가 없으므로 테이블을 새로 만들어 옮김 (기존 행은 모두 사업보고서 기준)
+            logger.info(f"결과 저장소 {self.path} 를 보고서 코드(reprt_code) 키로 옮깁니다.")
+            self.conn.execute("ALTER TABLE results RENAME TO results_old")
+            self.conn.execute("DROP INDEX IF EXISTS ix_results_snapshot")
+        self._create_table()
+        # 설정에 새 지표가 추가된 경우 (또는 이전 버전 DB) 컬럼 확장
+        existing = {r[1] for r in self.conn.execute("PRAGMA table_info(results)")}
+        columns = [(c, "REAL") for c in self.metric_columns()] + list(SECTOR_COLUMNS.items()) + list(previous.items())
+        for col, kind in columns:
+            if col not in existing:
+                self.conn.execute(f'ALTER TABLE results ADD COLUMN "{col}" {kind}')
+                existing.add(col)
+        if previous and "reprt_code" not in previous:
+            col_sql = ", ".join(f'"{c}"' for c in previous)
+            self.conn.execute(f"INSERT INTO results ({col_sql}) SELECT {col_sql} FROM results_old")
+            self.conn.execute("DROP TABLE results_old")
+        # 스크리너/백테스트용 스냅샷 인덱스
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_results_snapshot "
+            "ON results (year, reprt_code, config_hash, as_of, score)"
+        )
+        self.conn.commit()
+
+    # ------------------------------------------------------------------ #
+    def upsert_many(self, rows: Iterable[Dict]) -> int:
+        """행 묶음을 한 트랜잭션으로 upsert 합니다. 반영한 행 수를 반환합니다."""
+        columns = list(KEY_COLUMNS) + list(INFO_COLUMNS) + self.metric_columns()
+        col_sql = ", ".join(f'"{c}"' for c in columns)
+        marks = ", ".join("?" for _ in columns)
+        updates = ", ".join(f'"{c}"=excluded."{c}"' for c in columns if c not in KEY_COLUMNS)
+        sql = (
+            f"INSERT INTO results ({col_sql}) VALUES ({marks}) "
+            f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates}"
+        )
+        params = [tuple(row.get(c) for c in columns) for row in rows]
+        with self.conn:
+            self.conn.executemany(sql, params)
+        return len(params)
+
+    def upsert(self, row: Dict) -> None:
+        self.upsert_many([row])
+
+    def update_sectors(self, rows: pd.DataFrame) -> int:
+        """키 컬럼 + sector/sector_score 를 가진 행으로 업종 상대 점수만 갱신합니다."""
+        params = [
+            (r.sector, None if pd.isna(r.sector_score) else float(r.sector_score),
+             r.corp_code, int(r.year), r.reprt_code, r.as_of, r.config_hash)
+            for r in rows.itertuples(index=False)
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE results SET sector = ?, sector_score = ? "
+                "WHERE corp_code = ? AND year = ? AND reprt_code = ? AND as_of = ? AND config_hash = ?",
+                params,
+            )
+        return len(params)
+
+    # ------------------------------------------------------------------ #
+    def latest_as_of(self, year: int, cfg: Optional[str] = None, reprt_code: str = ANNUAL) -> Optional[str]:
+        """해당 연도·보고서·설정의 가장 최근 as_of 를 반환합니다. 결과가 없으면 None."""
+        cur = self.conn.execute(
+            "SELECT MAX(as_of) FROM results WHERE year = ? AND reprt_code = ? AND config_hash = ?",
+            (year, reprt_code, cfg or config_hash()),
+        )
+        return cur.fetchone()[0]
+
+    def latest_rows(self, year: int, cfg: Optional[str] = None, reprt_code: str = ANNUAL) -> pd.DataFrame:
+        """기업별로 해당 연도·보고서·설정의 가장 최근 as_of 행 하나씩을 반환합니다."""
+        return self.select(LATEST_SNAPSHOT, (year, reprt_code, cfg or config_hash()), order_by="corp_code")
+
+    def years(self) -> List[int]:
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT year FROM results ORDER BY year DESC")]
+
+    def reports(self, year: int) -> List[str]:
+        """해당 연도에 저장된 기준 보고서 코드 (사업보고서가 있으면 맨 앞)."""
+        cur = self.conn.execute("SELECT DISTINCT reprt_code FROM results WHERE year = ?", (year,))
+        return sorted((r[0] for r in cur), key=lambda code: (code != ANNUAL, code))
+
+    def select(
+        self,
+        where: str = "",
+        params: Sequence = (),
+        columns: Optional[Sequence[str]] = None,
+        order_by: str = "",
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> pd.DataFrame:
+        """WHERE/ORDER BY/LIMIT 을 SQLite 에 그대로 내려 필요한 행만 읽습니다."""
+        col_sql = ", ".join(f'"{c}"' for c in columns) if columns else "*"
+        sql = f"SELECT {col_sql} FROM results"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        return pd.read_sql_query(sql, self.conn, params=list(params))
+
+    def count(self, where: str = "", params: Sequence = ()) -> int:
+        sql = "SELECT COUNT(*) FROM results" + (f" WHERE {where}" if where else "")
+        return self.conn.execute(sql, list(params)).fetchone()[0]
+
+    def history(self, corp_code: str, cfg: Optional[str] = None, reprt_code: str = ANNUAL) -> pd.DataFrame:
+        """한 기업의 연도·기준일별 결과 이력 (PK 인덱스 범위 조회). reprt_code 보고서 기준 결과만."""
+        return self.select(
+            "corp_code = ? AND reprt_code = ? AND config_hash = ?",
+            (corp_code, reprt_code, cfg or config_hash()),
+            order_by="year, as_of",
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,448 @@
+# synthetic.py
+
+import time
+import argparse
+import datetime
+import logging
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from backend import JsonResponse
+from benchmark import install
+from statement_store import ANNUAL, StatementStore
+from store import ResultStore
+
+logger = logging.getLogger(__name__)
+
+ANCHOR_YEAR = 2000        # 재무·주가 경로의 기준 연도 (이후 연도만 생성)
+NOT_STANDARD = "-표준계정코드 미사용-"   # DART 가 비표준 계정에 쓰는 account_id
+
+# 계정명 표기 방식 (metrics._match_row 의 세 경로를 모두 타도록 기업마다 하나씩 배정)
+#   id       : account_id 로 매칭 (ids 가 없는 계정은 한글 정식명 exact)
+#   ko / en  : ALIASES names 의 한글/영문 표기를 돌아가며 사용 (exact)
+#   contains : "Ⅰ. 매출액" 처럼 앞뒤에 표기가 붙은 이름 (contains fallback)
+STYLES = ("id", "ko", "en", "contains")
+
+# (키, sj_div, 한글명, 영문명, 표준 account_id 후보) — 키가 metrics.ALIASES 에 있으면 지표 계산에 쓰이는 계정
+ACCOUNTS = (
+    ("current_assets",      "BS", ["유동자산"], ["Current assets"], ["ifrs-full_CurrentAssets"]),
+    ("cash",                "BS", ["현금및현금성자산"], ["Cash and cash equivalents"], ["ifrs-full_CashAndCashEquivalents"]),
+    ("inventories",         "BS", ["재고자산"], ["Inventories"], ["ifrs-full_Inventories"]),
+    ("noncurrent_assets",   "BS", ["비유동자산"], ["Non-current assets"], ["ifrs-full_NoncurrentAssets"]),
+    ("total_assets",        "BS", ["자산총계"], ["Total assets"], ["ifrs-full_Assets"]),
+    ("current_liabilities", "BS", ["유동부채"], ["Current liabilities"], ["ifrs-full_CurrentLiabilities"]),
+    ("noncurrent_liab",     "BS", ["비유동부채"], ["Non-current liabilities"], ["ifrs-full_NoncurrentLiabilities"]),
+    ("total_liabilities",   "BS", ["부채총계"], ["Total liabilities"], ["ifrs-full_Liabilities"]),
+    ("capital",             "BS", ["자본금"], ["Issued capital"], ["ifrs-full_IssuedCapital"]),
+    ("equity",              "BS", ["자본총계"], ["Total equity"], ["ifrs-full_Equity"]),
+    ("revenue",             "IS", ["매출액"], ["Revenue", "Sales revenue"],
+     ["ifrs-full_Revenue", "ifrs-full_SalesRevenueGoods"]),
+    ("cost_of_sales",       "IS", ["매출원가"], ["Cost of sales"], ["ifrs-full_CostOfSales"]),
+    ("gross_profit",        "IS", ["매출총이익"], ["Gross profit"], ["ifrs-full_GrossProfit"]),
+    ("operating_income",    "IS", ["영업이익", "영업이익(손실)", "영업이익(또는손실)"],
+     ["Operating income", "Operating income(loss)"],
+     ["ifrs-full_ProfitLossFromOperatingActivities", "ifrs-full_OperatingIncomeLoss"]),
+    ("pretax_income",       "IS", ["법인세비용차감전순이익"], ["Income before income taxes"],
+     ["ifrs-full_ProfitLossBeforeTax"]),
+    ("net_income",          "IS", ["당기순이익", "당기순이익(손실)"], ["Net income", "Profit(loss)"],
+     ["ifrs-full_ProfitLoss"]),
+    ("op_cf",               "CF", ["영업활동현금흐름"], ["Net cash from operating activities"],
+     ["ifrs-full_CashFlowsFromUsedInOperatingActivities"]),
+    ("inv_cf",              "CF", ["투자활동현금흐름"], ["Net cash used in investing activities"],
+     ["ifrs-full_CashFlowsFromUsedInInvestingActivities"]),
+    ("fin_cf",              "CF", ["재무활동현금흐름"], ["Net cash from financing activities"],
+     ["ifrs-full_CashFlowsFromUsedInFinancingActivities"]),
+)
+SJ_NAMES = {"BS": "재무상태표", "IS": "손익계산서", "CF": "현금흐름표"}
+# KRX 업종명 (기업 번호로 결정적으로 배정)
+SECTORS = ("전기전자", "화학", "서비스업", "유통업", "의약품", "기계", "운수장비", "철강금속", "음식료품", "건설업")
+OHLCV_COLUMNS = ["시가", "고가", "저가", "종가", "거래량", "거래대금", "등락률"]
+FUNDAMENTAL_COLUMNS = ["BPS", "PER", "PBR", "EPS", "DIV", "DPS"]
+
+
+def _rng(*key: int) -> np.random.Generator:
+    return np.random.default_rng([int(k) for k in key])
+
+
+def _label(style: str, index: int, ko: List[str], en: List[str], ids: List[str]):
+    """표기 방식과 기업 번호로 (account_id, account_nm) 을 고릅니다 (기업마다 다른 변형이 돌아가며 나오도록)."""
+    if style == "id":
+        return ids[index % len(ids)], ko[0]
+    if style == "ko":
+        return NOT_STANDARD, ko[index % len(ko)]
+    if style == "en":
+        return NOT_STANDARD, en[index % len(en)]
+    return NOT_STANDARD, f"Ⅰ. {ko[index % len(ko)]}"
+
+
+class SyntheticUniverse:
+    """
+    seed 로 결정되는 가상 상장사 n 개.
+    - DART: corp_codes / find_corp_code / company / finstate_all (+ fnlttSinglAcntAll 응답을 돌려주는 get)
+    - KRX : pykrx.stock 의 get_market_ohlcv_by_date / fundamental / cap / index 와 같은 모양
+    benchmark.install(universe) 로 data_provider·utils 에 연결하면 배치 경로를 네트워크 없이 그대로 탈 수 있습니다.
+    같은 (seed, 기업, 연도)는 항상 같은 값을 만들며, 요청한 연도 범위와 무관하게 결정됩니다.
+    """
+
+    def __init__(self, n: int, seed: int = 0, missing_rate: float = 0.02):
+        self.n = n
+        self.seed = seed
+        self.missing_rate = missing_rate
+        self.api_key = "synthetic"
+        self.stock_codes = [f"{i:06d}" for i in range(1, n + 1)]
+        self.corp_codes = pd.DataFrame({
+            "corp_code":   [f"{10_000_000 + i:08d}" for i in range(1, n + 1)],
+            "corp_name":   [f"가상기업{i:05d}" for i in range(1, n + 1)],
+            "stock_code":  self.stock_codes,
+            "modify_date": "20240101",
+        })
+        self._index = {code: i for i, code in enumerate(self.stock_codes)}
+        self._index.update({code: i for i, code in enumerate(self.corp_codes["corp_code"])})
+
+    # ------------------------------------------------------------------ #
+    # 기업 속성
+    # ------------------------------------------------------------------ #
+    def company_index(self, code: str) -> Optional[int]:
+        """종목코드 또는 corp_code → 0 부터 시작하는 기업 번호."""
+        return self._index.get(code)
+
+    def style(self, i: int) -> str:
+        return STYLES[i % len(STYLES)]
+
+    def _profile(self, i: int) -> Dict[str, float]:
+        return _profile(self.seed, i)
+
+    def accounts(self, i: int, year: int) -> Dict[str, float]:
+        """기업 i 의 year 사업연도 계정 금액 (원)."""
+        return _accounts(self.seed, i, year)
+
+    def has_report(self, i: int, year: int) -> bool:
+        return _rng(self.seed, i, year, 2).random() >= self.missing_rate
+
+    # ------------------------------------------------------------------ #
+    # DART
+    # ------------------------------------------------------------------ #
+    def find_corp_code(self, code: str) -> Optional[str]:
+        i = self.company_index(code)
+        return None if i is None else self.corp_codes["corp_code"].iat[i]
+
+    def company(self, corp_code: str) -> Dict:
+        i = self.company_index(corp_code)
+        return {"corp_code": self.corp_codes["corp_code"].iat[i], "corp_name": self.corp_codes["corp_name"].iat[i]}
+
+    def company_by_name(self, name: str) -> pd.DataFrame:
+        return self.corp_codes[self.corp_codes["corp_name"] == name]
+
+    def finstate_all(self, code: str, year: int, reprt_code: str = ANNUAL, fs_div: str = "CFS") -> pd.DataFrame:
+        """OpenDartReader.finstate_all 과 같은 컬럼의 사업보고서 재무제표. 보고서가 없으면 빈 DataFrame."""
+        return pd.DataFrame(self.statement_rows(code, year, reprt_code))
+
+    def statement_rows(self, code: str, year: int, reprt_code: str = ANNUAL) -> List[Dict[str, str]]:
+        i = self.company_index(code)
+        if i is None or reprt_code != ANNUAL or year <= ANCHOR_YEAR + 2 or not self.has_report(i, year):
+            return []
+        corp_code = self.corp_codes["corp_code"].iat[i]
+        style = self.style(i)
+        periods = [self.accounts(i, year - k) for k in range(3)]
+        rows = []
+        for key, sj_div, ko, en, ids in ACCOUNTS:
+            account_id, account_nm = _label(style, i // len(STYLES), ko, en, ids)
+            rows.append({
+                "rcept_no":         f"{year + 1}0315{i % 1_000_000:06d}",
+                "reprt_code":       reprt_code,
+                "bsns_year":        str(year),
+                "corp_code":        corp_code,
+                "sj_div":           sj_div,
+                "sj_nm":            SJ_NAMES[sj_div],
+                "account_id":       account_id,
+                "account_nm":       account_nm,
+                "account_detail":   "-",
+                "thstrm_nm":        f"제 {year - 1969} 기",
+                "thstrm_amount":    str(int(periods[0][key])),
+                "frmtrm_nm":        f"제 {year - 1970} 기",
+                "frmtrm_amount":    str(int(periods[1][key])),
+                "bfefrmtrm_nm":     f"제 {year - 1971} 기",
+                "bfefrmtrm_amount": str(int(periods[2][key])),
+                "ord":              str(len(rows) + 1),
+                "currency":         "KRW",
+            })
+        return rows
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> JsonResponse:
+        """공유 HTTP 세션 자리에서 DART fnlttSinglAcntAll.json 응답을 돌려줍니다."""
+        params = params or {}
+        rows = self.statement_rows(params.get("corp_code"), int(params.get("bsns_year")), params.get("reprt_code", ANNUAL))
+        if not rows:
+            return JsonResponse({"status": "013", "message": "조회된 데이타가 없습니다."})
+        return JsonResponse({"status": "000", "message": "정상", "list": rows})
+
+    # ------------------------------------------------------------------ #
+    # KRX (pykrx.stock)
+    # ------------------------------------------------------------------ #
+    def _ohlcv(self, i: int, start: str, end: str) -> pd.DataFrame:
+        first, last = int(start[:4]), int(end[:4])
+        frames = [_ohlcv_year(self.seed, i, y) for y in range(max(first, ANCHOR_YEAR + 1), last + 1)]
+        if not frames:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        df = pd.concat(frames)
+        return df.loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+    def get_market_ohlcv_by_date(self, fromdate: str, todate: str, ticker: str) -> pd.DataFrame:
+        i = self.company_index(ticker)
+        if i is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        return self._ohlcv(i, fromdate, todate)
+
+    def get_market_fundamental_by_date(self, fromdate: str, todate: str, ticker: str) -> pd.DataFrame:
+        """직전 사업연도 재무 기준 BPS/PER/PBR/EPS/DIV/DPS (pykrx 처럼 적자면 PER 0)."""
+        i = self.company_index(ticker)
+        close = self.get_market_ohlcv_by_date(fromdate, todate, ticker)["종가"]
+        shares = self._profile(i)["shares"]
+        rows = []
+        for day, price in close.items():
+            acct = self.accounts(i, day.year - 1)
+            eps = acct["net_income"] / shares
+            bps = acct["equity"] / shares
+            dps = max(eps, 0) * self._profile(i)["payout"]
+            rows.append({
+                "BPS": round(bps), "PER": round(price / eps, 2) if eps > 0 else 0.0,
+                "PBR": round(price / bps, 2) if bps > 0 else 0.0, "EPS": round(eps),
+                "DIV": round(dps / price * 100, 2), "DPS": round(dps),
+            })
+        return pd.DataFrame(rows, index=close.index, columns=FUNDAMENTAL_COLUMNS)
+
+    def get_market_cap_by_date(self, fromdate: str, todate: str, ticker: str) -> pd.DataFrame:
+        i = self.company_index(ticker)
+        ohlcv = self.get_market_ohlcv_by_date(fromdate, todate, ticker)
+        shares = self._profile(i)["shares"]
+        return pd.DataFrame({
+            "시가총액": (ohlcv["종가"] * shares).astype("int64"),
+            "거래량": ohlcv["거래량"],
+            "거래대금": ohlcv["거래대금"],
+            "상장주식수": int(shares),
+        }, index=ohlcv.index)
+
+    def get_nearest_business_day_in_a_week(self, date: str, prev: bool = True) -> str:
+        return date
+
+    def get_market_sector_classifications(self, date: str, market: str = "KOSPI") -> pd.DataFrame:
+        """pykrx 와 같은 모양(종목코드 인덱스, 종목명/업종명 컬럼). 짝수 번호는 KOSPI, 홀수는 KOSDAQ."""
+        offset = 0 if market == "KOSPI" else 1
+        rows = range(offset, self.n, 2)
+        return pd.DataFrame({
+            "종목명": [self.corp_codes["corp_name"].iat[i] for i in rows],
+            "업종명": [SECTORS[_rng(self.seed, i, 3).integers(len(SECTORS))] for i in rows],
+        }, index=pd.Index([self.stock_codes[i] for i in rows], name="종목코드"))
+
+    def get_index_ohlcv_by_date(self, fromdate: str, todate: str, ticker: str = "1001") -> pd.DataFrame:
+        first, last = int(fromdate[:4]), int(todate[:4])
+        df = pd.concat([_index_year(self.seed, y) for y in range(max(first, ANCHOR_YEAR + 1), last + 1)])
+        return df.loc[pd.Timestamp(fromdate):pd.Timestamp(todate)]
+
+
+# ---------------------------------------------------------------------- #
+# 결정적 생성 함수 (seed, 기업, 연도 단위로 캐시)
+# ---------------------------------------------------------------------- #
+@lru_cache(maxsize=65536)
+def _profile(seed: int, i: int) -> Dict[str, float]:
+    """기업 고유 속성 (규모·마진·재무구조·주식수·베타)."""
+    rng = _rng(seed, i)
+    revenue = float(np.exp(rng.normal(np.log(3e11), 1.5)))
+    margin = float(rng.normal(0.07, 0.06))
+    equity_ratio = float(rng.uniform(0.25, 0.8))
+    price = float(np.exp(rng.uniform(np.log(1_000), np.log(300_000))))
+    pbr = float(np.exp(rng.normal(0.0, 0.6)))
+    turnover = float(rng.uniform(0.4, 1.5))
+    return {
+        "revenue":       revenue,
+        "margin":        margin,
+        "turnover":      turnover,
+        "equity_ratio":  equity_ratio,
+        "current_share": float(rng.uniform(0.3, 0.6)),
+        "current_ratio": float(rng.uniform(0.6, 3.0)),
+        "capex":         float(rng.uniform(0.02, 0.12)),
+        "payout":        float(rng.uniform(0.0, 0.5)),
+        "price":         price,
+        "shares":        max(1.0, round(revenue / turnover * equity_ratio * pbr / price)),
+        "beta":          float(rng.uniform(0.4, 1.8)),
+        "idio":          float(rng.uniform(0.01, 0.035)),
+    }
+
+
+@lru_cache(maxsize=65536)
+def _growth(seed: int, i: int, year: int) -> float:
+    """ANCHOR_YEAR 대비 year 매출 배율."""
+    if year <= ANCHOR_YEAR:
+        return 1.0
+    g = float(np.clip(_rng(seed, i, year).normal(0.05, 0.15), -0.6, 1.5))
+    return _growth(seed, i, year - 1) * (1 + g)
+
+
+@lru_cache(maxsize=65536)
+def _accounts(seed: int, i: int, year: int) -> Dict[str, float]:
+    p = _profile(seed, i)
+    rng = _rng(seed, i, year, 1)
+    revenue = p["revenue"] * _growth(seed, i, year)
+    op_income = revenue * (p["margin"] + rng.normal(0, 0.02))
+    pretax = op_income + revenue * rng.normal(0.005, 0.01)
+    net_income = pretax * (0.78 if pretax > 0 else 1.0)
+    assets = revenue / p["turnover"] * (1 + rng.normal(0, 0.03))
+    equity = assets * p["equity_ratio"]
+    current_assets = assets * p["current_share"]
+    current_liab = current_assets / p["current_ratio"]
+    liabilities = assets - equity
+    op_cf = net_income * 1.2 + revenue * (0.04 + rng.normal(0, 0.02))
+    inv_cf = -revenue * p["capex"] * (1 + rng.normal(0, 0.2))
+    return {
+        "current_assets":      current_assets,
+        "cash":                current_assets * 0.35,
+        "inventories":         current_assets * 0.25,
+        "noncurrent_assets":   assets - current_assets,
+        "total_assets":        assets,
+        "current_liabilities": current_liab,
+        "noncurrent_liab":     max(liabilities - current_liab, 0.0),
+        "total_liabilities":   liabilities,
+        "capital":             p["shares"] * 500,
+        "equity":              equity,
+        "revenue":             revenue,
+        "cost_of_sales":       revenue * 0.7,
+        "gross_profit":        revenue * 0.3,
+        "operating_income":    op_income,
+        "pretax_income":       pretax,
+        "net_income":          net_income,
+        "op_cf":               op_cf,
+        "inv_cf":              inv_cf,
+        "fin_cf":              -(op_cf + inv_cf) * 0.5,
+    }
+
+
+def _bridge(increments: np.ndarray, target: float) -> np.ndarray:
+    """로그수익률 경로를 마지막 누적값이 target 이 되도록 보정 (연도 경계에서 가격이 이어지도록)."""
+    path = np.cumsum(increments)
+    t = np.arange(1, len(path) + 1) / len(path)
+    return path - t * (path[-1] - target)
+
+
+def _business_days(year: int) -> pd.DatetimeIndex:
+    return pd.bdate_range(f"{year}-01-01", f"{year}-12-31", name="날짜")
+
+
+@lru_cache(maxsize=64)
+def _market_returns(seed: int, year: int) -> np.ndarray:
+    return _rng(seed, 0, year, 9).normal(0.0003, 0.01, len(_business_days(year)))
+
+
+def _market_level(seed: int, year: int) -> float:
+    """year 첫 거래일 전 지수 수준 (연도별 수익률을 ANCHOR_YEAR 부터 누적)."""
+    return 1000.0 * float(np.exp(sum(_market_returns(seed, y).sum() for y in range(ANCHOR_YEAR + 1, year))))
+
+
+@lru_cache(maxsize=64)
+def _index_year(seed: int, year: int) -> pd.DataFrame:
+    days = _business_days(year)
+    close = _market_level(seed, year) * np.exp(np.cumsum(_market_returns(seed, year)))
+    prev = np.r_[_market_level(seed, year), close[:-1]]
+    volume = _rng(seed, 0, year, 10).integers(300_000_000, 900_000_000, len(days))
+    return pd.DataFrame({
+        "시가": prev.round(2), "고가": np.maximum(prev, close).round(2), "저가": np.minimum(prev, close).round(2),
+        "종가": close.round(2), "거래량": volume, "거래대금": (volume * 30_000).astype("int64"),
+    }, index=days)
+
+
+def _price_level(seed: int, i: int, year: int) -> float:
+    """year 첫 거래일 전 주가 수준: 기준 주가 × (매출 배율)^0.8 × 기업별 잡음."""
+    p = _profile(seed, i)
+    if year <= ANCHOR_YEAR + 1:
+        return p["price"]
+    noise = float(np.exp(_rng(seed, i, year, 4).normal(0, 0.15)))
+    return p["price"] * _growth(seed, i, year - 1) ** 0.8 * noise
+
+
+@lru_cache(maxsize=256)
+def _ohlcv_year(seed: int, i: int, year: int) -> pd.DataFrame:
+    p = _profile(seed, i)
+    rng = _rng(seed, i, year, 3)
+    days = _business_days(year)
+    start, end = _price_level(seed, i, year), _price_level(seed, i, year + 1)
+    increments = p["beta"] * (_market_returns(seed, year) - 0.0003) + rng.normal(0, p["idio"], len(days))
+    close = np.maximum(start * np.exp(_bridge(increments, np.log(end / start))), 1.0).round()
+    prev = np.r_[round(start), close[:-1]]
+    open_ = (prev * (1 + rng.normal(0, 0.004, len(days)))).round()
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, len(days))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, len(days))))
+    volume = (p["shares"] * np.exp(rng.normal(np.log(0.003), 0.5, len(days)))).astype("int64")
+    return pd.DataFrame({
+        "시가": open_.astype("int64"), "고가": high.round().astype("int64"), "저가": low.round().astype("int64"),
+        "종가": close.astype("int64"), "거래량": volume, "거래대금": (volume * close).astype("int64"),
+        "등락률": ((close / prev - 1) * 100).round(2),
+    }, index=days)
+
+
+# ---------------------------------------------------------------------- #
+# 스트레스 실행
+# ---------------------------------------------------------------------- #
+def stress(
+    universe: SyntheticUniverse,
+    years: Sequence[int],
+    statements: StatementStore,
+    results: ResultStore,
+    batch_size: int = 500,
+) -> Dict[str, float]:
+    """
+    가상 유니버스를 data_provider 에 연결해 batch.score_company 경로(재무제표 저장소 적재 →
+    지표 → 점수 → 결과 저장소 upsert)를 그대로 실행하고 처리량을 반환합니다.
+    """
+    install(universe)
+    from batch import score_company
+    for name in ("data_provider", "batch", "scorer", "metrics"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    as_of = datetime.date.today().isoformat()
+    statements.register_codes(dict(zip(universe.corp_codes["stock_code"], universe.corp_codes["corp_code"])))
+    started = time.perf_counter()
+    scored = 0
+    pending: List[Dict] = []
+    for year in years:
+        for item in universe.corp_codes.itertuples(index=False):
+            row = score_company(item.corp_code, item.corp_name, item.stock_code, year, as_of, statements=statements)
+            if row:
+                pending.append(row)
+                scored += 1
+            if len(pending) >= batch_size:
+                results.upsert_many(pending)
+                pending.clear()
+        logger.info(f"{year}: 누적 {scored}건 ({time.perf_counter() - started:.1f}s)")
+    results.upsert_many(pending)
+    elapsed = time.perf_counter() - started
+    units = universe.n * len(years)
+    return {
+        "units": units,
+        "scored": scored,
+        "seconds": round(elapsed, 2),
+        "ms_per_unit": round(elapsed * 1000 / max(units, 1), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 KRX 유니버스로 지표·점수·저장소 부하 테스트")
+    parser.add_argument("--companies", type=int, default=25_000, help="가상 기업 수 (기본: 운영 유니버스의 약 10배)")
+    parser.add_argument("--years", type=int, nargs="+", default=[datetime.date.today().year - 1], help="점수 기준 연도")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--missing-rate", type=float, default=0.02, help="사업보고서가 없는 (기업, 연도) 비율")
+    parser.add_argument("--statements", default="data/synthetic/statements", help="재무제표 저장소 경로")
+    parser.add_argument("--db", default="data/synthetic/results.db", help="결과 저장소(SQLite) 경로")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    universe = SyntheticUniverse(args.companies, args.seed, args.missing_rate)
+    with ResultStore(args.db) as results:
+        stats = stress(universe, args.years, StatementStore(args.statements), results)
+    logger.info(
+        f"{stats['units']}건 중 {stats['scored']}건 저장, {stats['seconds']}s ({stats['ms_per_unit']}ms/건)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# test_aio.py
+
+import time
+import asyncio
+import threading
+import pytest
+import http_session
+from aio import CPU, DART, KRX, AsyncAnalyzer, aanalyze, afind_corp_info, aget_combined_data, ascore
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+
+
+class Tracker:
+    """동시에 실행 중인 블로킹 호출 수를 기록합니다."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.active = self.peak = self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return value
+
+
+def test_semaphore_limits_concurrency_per_backend():
+    async def main():
+        client = AsyncAnalyzer(dart=3, krx=2, cpu=1)
+        dart, krx = Tracker(), Tracker()
+        results = await asyncio.gather(
+            *[client._call((DART,), dart, i) for i in range(30)],
+            *[client._call((KRX,), krx, i) for i in range(30)],
+        )
+        client.close()
+        return dart, krx, results
+
+    dart, krx, results = asyncio.run(main())
+    assert results == list(range(30)) * 2
+    assert dart.peak == 3 and krx.peak == 2
+
+
+def test_timeout_keeps_slot_until_running_call_finishes():
+    async def main():
+        client = AsyncAnalyzer(dart=1, krx=1, cpu=1)
+        slow = Tracker(delay=0.3)
+        with pytest.raises(asyncio.TimeoutError):
+            await client._call((CPU,), slow, 1, timeout=0.05)
+        # 시간 초과 뒤에도 실행 중인 호출이 슬롯을 잡고 있으므로 다음 호출은 그 뒤에 시작
+        started = time.perf_counter()
+        await client._call((CPU,), Tracker(delay=0), 2)
+        client.close()
+        return time.perf_counter() - started, slow
+
+    waited, slow = asyncio.run(main())
+    assert waited >= 0.15
+    assert slow.peak == 1
+
+
+def test_cancelled_queued_calls_never_run():
+    async def main():
+        client = AsyncAnalyzer(dart=1, krx=1, cpu=1)
+        tracker = Tracker(delay=0.05)
+        tasks = [asyncio.create_task(client._call((DART,), tracker, i)) for i in range(20)]
+        await asyncio.sleep(0.01)
+        for task in tasks[1:]:
+            task.cancel()
+        done = await asyncio.gather(*tasks, return_exceptions=True)
+        client.close()
+        return tracker, done
+
+    tracker, done = asyncio.run(main())
+    assert done[0] == 0
+    assert all(isinstance(d, asyncio.CancelledError) for d in done[1:])
+    assert tracker.calls == 1
+
+
+def test_async_api_matches_blocking_path():
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    from data_provider import get_combined_data
+    from metrics import calculate_metrics
+    from scorer import calculate_score
+    from utils import find_corp_info
+
+    universe = SyntheticUniverse(6, seed=2, missing_rate=0)
+    install(universe)
+    codes = universe.stock_codes
+
+    async def main():
+        infos = await asyncio.gather(*[afind_corp_info(code) for code in codes])
+        datas = await asyncio.gather(*[aget_combined_data(info["corp_code"], 2023) for info in infos])
+        scores = await asyncio.gather(*[ascore(data) for data in datas])
+        rows = await asyncio.gather(*[aanalyze(code, 2023) for code in codes])
+        return infos, scores, rows
+
+    infos, scores, rows = asyncio.run(main())
+    for code, info, result, row in zip(codes, infos, scores, rows):
+        assert info == find_corp_info(code)
+        data = get_combined_data(info["corp_code"], 2023)
+        expected, _, _ = calculate_score(calculate_metrics(data["dart"], data["price"], data["pykrx"]))
+        assert result["score"] == pytest.approx(expected)
+        assert row["score"] == pytest.approx(expected)
@@ -0,0 +1,119 @@
+# test_backend.py
+
+import pytest
+import pandas as pd
+import http_session
+from backend import (
+    Archive, Recorder, Replayer, ReplayMissError, SessionRecorder, SessionReplayer, call_key, install,
+)
+from synthetic import SyntheticUniverse
+
+
+class Counting:
+    """호출 수를 세는 래퍼 (replay 중 원본이 호출되지 않았는지 확인용)."""
+
+    def __init__(self, target):
+        self.target = target
+        self.calls = 0
+
+    def __getattr__(self, name):
+        value = getattr(self.target, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            self.calls += 1
+            return value(*args, **kwargs)
+        return call
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+
+
+def _run(code, year):
+    import data_provider
+    from utils import find_corp_info
+    data = data_provider.get_combined_data(code, year)
+    return find_corp_info(code), data, data_provider.get_corp_list()
+
+
+def test_replay_reproduces_recorded_run_without_source(tmp_path):
+    path = str(tmp_path / "archive.zip")
+    live = Counting(SyntheticUniverse(3, seed=5, missing_rate=0))
+    with Archive(path, "a") as archive:
+        install(Recorder(live, archive, "dart"), SessionRecorder(live, archive), Recorder(live, archive, "krx"))
+        info, recorded, corp_list = _run("000002", 2023)
+    assert live.calls > 0
+
+    before = live.calls
+    with Archive(path, "r") as archive:
+        install(Replayer(archive, "dart"), SessionReplayer(archive), Replayer(archive, "krx"))
+        info2, replayed, corp_list2 = _run("000002", 2023)
+        assert live.calls == before
+        with pytest.raises(ReplayMissError):
+            _replay_unrecorded()
+
+    assert info == info2 and info["corp_code"] == "10000002"
+    for part in ("bs", "is", "cf"):
+        pd.testing.assert_frame_equal(recorded["dart"][part], replayed["dart"][part])
+    pd.testing.assert_frame_equal(recorded["price"], replayed["price"])
+    pd.testing.assert_frame_equal(corp_list, corp_list2)
+    assert recorded["pykrx"] == replayed["pykrx"]
+
+
+def _replay_unrecorded():
+    import data_provider
+    data_provider.stock.get_market_ohlcv_by_date("20100101", "20101231", "000003")
+
+
+def test_archive_keeps_first_record_and_replays_errors(tmp_path):
+    path = str(tmp_path / "archive.zip")
+
+    class Source:
+        api_key = "secret"
+        value = 1
+
+        def lookup(self, x):
+            return self.value
+
+        def fail(self):
+            raise LookupError("없음")
+
+    source = Source()
+    with Archive(path, "a") as archive:
+        rec = Recorder(source, archive, "dart")
+        assert rec.lookup(1) == 1
+        source.value = 2
+        assert rec.lookup(1) == 2
+        with pytest.raises(LookupError):
+            rec.fail()
+        assert rec.api_key == "secret"
+        assert len(archive) == 2
+
+    with Archive(path, "r") as archive:
+        rep = Replayer(archive, "dart")
+        assert rep.lookup(1) == 1   # 같은 키는 처음 기록 유지
+        with pytest.raises(LookupError, match="없음"):
+            rep.fail()
+        assert rep.api_key == "replay"
+
+
+def test_call_key_ignores_kwarg_order_and_separates_attributes():
+    assert call_key("krx", "f", (1,), {"a": 1, "b": 2}) == call_key("krx", "f", (1,), {"b": 2, "a": 1})
+    assert call_key("dart", "corp_codes") != call_key("dart", "corp_codes", ())
+
+
+def test_live_installs_shared_session_for_price_only_paths(monkeypatch):
+    import importlib
+    import backend
+    webio = importlib.import_module(http_session.KRX_MODULE)
+    monkeypatch.setattr(webio, "requests", webio.requests)
+    monkeypatch.setattr(http_session, "_session", None)
+    monkeypatch.setattr(backend, "_active", backend._active)
+
+    assert backend.use(backend.LIVE) is None
+    assert http_session._session is not None
+    assert webio.requests.Session() is http_session._session   # DART 조회 전에도 pykrx 가 공유 세션 사용
@@ -0,0 +1,90 @@
+# test_batch.py
+
+import pandas as pd
+import pytest
+import http_session
+
+# DART 재무제표로만 계산되는 지표 (시세만으로는 채워지지 않음)
+DART_METRICS = ("ROE", "OperatingMargin", "DebtRatio", "RevenueGrowth")
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+
+
+def test_batch_rows_include_dart_metrics():
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    from store import ResultStore
+    import batch
+
+    universe = SyntheticUniverse(5, seed=5, missing_rate=0)
+    install(universe)
+    item = universe.corp_codes.iloc[0]
+    row = batch.score_company(item.corp_code, item.corp_name, item.stock_code, 2023)
+    for name in DART_METRICS:
+        assert pd.notna(row[name]), name
+
+    store = ResultStore(":memory:")
+    batch.run_universe(universe.corp_codes[["corp_code", "corp_name", "stock_code"]], 2023, store)
+    rows = store.latest_rows(2023)
+    assert len(rows) == 5
+    assert rows[list(DART_METRICS)].notna().all().all()
+
+
+def test_export_latest_covers_rows_from_earlier_runs(tmp_path):
+    import json
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    from store import ResultStore
+    from reporter import TopN, open_writer
+    import batch
+
+    universe = SyntheticUniverse(6, seed=5, missing_rate=0)
+    install(universe)
+    items = universe.corp_codes[["corp_code", "corp_name", "stock_code"]]
+    store = ResultStore(":memory:")
+    batch.run_universe(items.iloc[:3], 2023, store)   # 중단된 첫 실행
+    batch.run_universe(items.iloc[3:], 2023, store)   # --resume 으로 나머지만 계산
+    store.upsert(dict(store.latest_rows(2023).iloc[0].to_dict(), corp_code="99999999"))   # 유니버스 밖 기업
+
+    path = str(tmp_path / "out.jsonl")
+    top = TopN(3)
+    with open_writer(path) as writer:
+        assert batch.export_latest(store, 2023, items, writer, top) == 6
+    with open(path, encoding="utf-8") as fh:
+        exported = [json.loads(line) for line in fh]
+    assert sorted(row["corp_code"] for row in exported) == sorted(items["corp_code"])
+    best = sorted(exported, key=lambda row: -row["score"])[:3]
+    assert [row["corp_code"] for row in top.rows()] == [row["corp_code"] for row in best]
+
+
+def test_annual_and_quarter_batches_keep_separate_rows():
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    from store import ResultStore
+    from screen import run_screen
+    from screener import query_score_table
+    import batch
+
+    universe = SyntheticUniverse(4, seed=5, missing_rate=0)
+    install(universe)
+    items = universe.corp_codes[["corp_code", "corp_name", "stock_code"]]
+    store = ResultStore(":memory:")
+    batch.run_universe(items, 2023, store)
+    batch.run_universe(items, 2023, store, reprt_code="11014")   # 같은 날 --quarter 11014 실행
+
+    assert store.count() == 8
+    assert store.reports(2023) == ["11011", "11014"]
+    annual, quarter = store.latest_rows(2023), store.latest_rows(2023, reprt_code="11014")
+    assert set(annual["reprt_code"]) == {"11011"} and set(quarter["reprt_code"]) == {"11014"}
+    assert annual[list(DART_METRICS)].notna().all().all()   # 분기 실행이 사업보고서 결과를 덮어쓰지 않음
+    assert not annual["score"].equals(quarter["score"])
+
+    assert set(run_screen("score > 0", store, 2023)["score"]) == set(annual["score"])
+    assert set(run_screen("score > 0", store, 2023, "11014")["score"]) == set(quarter["score"])
+    assert query_score_table(store, 2023)[1] == 4
+    assert query_score_table(store, 2023, reprt_code="11014")[1] == 4
+    assert list(store.history(items["corp_code"].iloc[0])["reprt_code"]) == ["11011"]
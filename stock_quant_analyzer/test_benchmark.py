@@ -0,0 +1,50 @@
+# test_benchmark.py
+
+import copy
+import pytest
+import http_session
+import benchmark
+
+
+@pytest.fixture()
+def fixture(monkeypatch):
+    # install() 이 바꾸는 전역을 테스트 후 되돌림
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+    return benchmark.load_fixture()
+
+
+def test_suite_counts_remote_calls_per_company(fixture):
+    result = benchmark.run_suite(3, fixture)
+    stages = result["stages"]
+    assert set(stages) == {"find_corp_info", "get_combined_data", "_lookup", "calculate_metrics", "calculate_score"}
+    # 고유번호 조회 + 기업개황
+    assert stages["find_corp_info"]["calls_per_company"] == 2
+    # 고유번호 2 + 재무제표 2 + 시세·펀더멘털·시가총액 3, 지수는 구간당 한 번
+    assert stages["get_combined_data"]["calls_per_company"] == round((3 * 7 + 1) / 3, 4)
+    assert stages["calculate_metrics"]["calls_per_company"] == 0
+    assert result["score_checksum"] > 0
+
+
+def test_compare_flags_slower_stage_extra_calls_and_changed_scores(fixture):
+    report = {"runs": {"3": benchmark.run_suite(3, fixture)}}
+    assert benchmark.compare(report, report) == []
+
+    worse = copy.deepcopy(report)
+    run = worse["runs"]["3"]
+    run["stages"]["_lookup"]["ms_per_company"] = report["runs"]["3"]["stages"]["_lookup"]["ms_per_company"] * 2 + 1
+    run["stages"]["get_combined_data"]["calls_per_company"] += 1
+    run["score_checksum"] += 1
+    problems = benchmark.compare(worse, report)
+    assert len(problems) == 3
+    assert any("_lookup" in p for p in problems)
+
+
+def test_committed_baseline_matches_scores_and_calls(fixture):
+    import json
+    from config import BENCH_BASELINE_PATH
+    with open(BENCH_BASELINE_PATH, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    report = benchmark.run_all(sizes=(1, 100))
+    # 시간은 머신마다 달라 비교하지 않고, 점수 합계·원격 호출 수만 확인 (계산식을 바꾸면 --update-baseline)
+    assert benchmark.compare(report, baseline, tolerance=float("inf")) == []
@@ -0,0 +1,82 @@
+# test_checkpoint.py
+
+from checkpoint import Checkpoint
+
+
+def test_resume_skips_finished_and_keeps_meta(tmp_path):
+    path = str(tmp_path / "batch.jsonl")
+    with Checkpoint(path, meta={"as_of": "2024-06-01"}) as cp:
+        cp.mark("00126380", 2023, "done")
+        cp.mark("00164779", 2023, "failed", error="timeout")
+        cp.mark("00401731", 2023, "empty")
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('{"corp_code": "0012')   # 기록 도중 끊긴 줄
+
+    with Checkpoint(path, resume=True, meta={"as_of": "2024-06-02"}) as cp:
+        assert cp.meta["as_of"] == "2024-06-01"
+        assert cp.is_finished("00126380", 2023) and cp.is_finished("00401731", 2023)
+        assert cp.failed() == {("00164779", 2023)}
+        cp.mark("00164779", 2023, "done")
+
+    assert Checkpoint(path, resume=True).failed() == set()
+
+
+def test_fresh_run_truncates_journal(tmp_path):
+    path = str(tmp_path / "batch.jsonl")
+    with Checkpoint(path) as cp:
+        cp.mark("00126380", 2023, "done")
+    with Checkpoint(path) as cp:
+        assert not cp.is_finished("00126380", 2023)
+
+
+def test_fetch_error_is_failed_and_rescored_on_resume(tmp_path, monkeypatch):
+    import pandas as pd
+    import requests
+    import http_session
+    import data_provider
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    from negative_cache import FETCH_ERROR, NegativeCache
+    from store import ResultStore
+    from statement_store import ANNUAL
+
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+    universe = SyntheticUniverse(6, seed=4, missing_rate=0)
+    install(universe)
+    import batch
+
+    target = universe.corp_codes["corp_code"].iloc[2]
+
+    class FlakySession:
+        """target 의 첫 재무제표 조회에서만 연결 오류를 내는 DART 대역."""
+
+        def __init__(self, inner):
+            self.inner, self.raised = inner, False
+
+        def get(self, url, params=None, **kwargs):
+            if not self.raised and params and params.get("corp_code") == target:
+                self.raised = True
+                raise requests.ConnectionError("connection reset")
+            return self.inner.get(url, params=params, **kwargs)
+
+    flaky = FlakySession(data_provider.get_session())
+    monkeypatch.setattr(data_provider, "get_session", lambda: flaky)
+
+    items = universe.corp_codes[["corp_code", "corp_name", "stock_code"]]
+    path = str(tmp_path / "batch.jsonl")
+    store, negative = ResultStore(":memory:"), NegativeCache(":memory:")
+    with Checkpoint(path, meta={"as_of": "2024-06-01"}) as cp:
+        batch.run_universe(items, 2023, store, checkpoint=cp, negative=negative)
+        assert flaky.raised and cp.failed() == {(target, 2023)}
+    assert target not in set(store.latest_rows(2023)["corp_code"])   # 부분 데이터로 저장하지 않음
+    hit = negative.get(target, 2023, ANNUAL)
+    assert hit is None or hit[0] != FETCH_ERROR   # 일시적 실패는 네거티브 캐시가 아닌 체크포인트로 재시도
+
+    with Checkpoint(path, resume=True) as cp:
+        batch.run_universe(items, 2023, store, checkpoint=cp, negative=negative)
+        assert cp.failed() == set()
+    rows = store.latest_rows(2023).set_index("corp_code")
+    expected = batch.score_company(target, "", universe.corp_codes["stock_code"].iloc[2], 2023)
+    assert rows.loc[target, "score"] == expected["score"]
+    assert pd.notna(rows.loc[target, "ROE"])
@@ -0,0 +1,72 @@
+# test_dart_bulk.py
+
+from dart_bulk import ingest_dumps
+from statement_store import StatementStore
+
+HEADER = "재무제표종류\t종목코드\t회사명\t시장구분\t업종\t업종명\t결산월\t결산기준일\t보고서종류\t통화\t항목코드\t항목명\t당기\t전기\t전전기\t"
+BS_ROWS = [
+    "재무상태표, 유동/비유동법-연결재무제표\t[005930]\t삼성전자\t유가증권시장상장법인\t264\t통신 및 방송 장비 제조업\t12\t2023-12-31\t사업보고서\tKRW\tifrs_Assets\t자산총계\t455,905,980\t448,424,507\t426,621,158\t",
+    "재무상태표, 유동/비유동법-연결재무제표\t[005930]\t삼성전자\t유가증권시장상장법인\t264\t통신 및 방송 장비 제조업\t12\t2023-12-31\t사업보고서\tKRW\tifrs-full_Equity\t자본총계\t363,677,865\t354,749,604\t304,899,931\t",
+    "재무상태표, 유동/비유동법-연결재무제표\t[000660]\tSK하이닉스\t유가증권시장상장법인\t261\t반도체 제조업\t12\t2023-12-31\t사업보고서\tKRW\tifrs_Assets\t자산총계\t100,330,000\t103,871,000\t96,000,000\t",
+]
+IS_ROWS = [
+    "손익계산서, 기능별 분류 - 연결재무제표\t[005930]\t삼성전자\t유가증권시장상장법인\t264\t통신 및 방송 장비 제조업\t12\t2023-12-31\t사업보고서\tKRW\tifrs_Revenue\t매출액\t258,935,494\t302,231,360\t279,604,799\t",
+]
+
+
+def _write(path, rows):
+    path.write_text("\n".join([HEADER] + rows) + "\n", encoding="cp949")
+    return str(path)
+
+
+def test_ingest_splits_by_company_and_statement(tmp_path):
+    files = [_write(tmp_path / "bs.txt", BS_ROWS), _write(tmp_path / "is.txt", IS_ROWS)]
+    store = StatementStore(str(tmp_path / "store"))
+    # chunksize=1 로 chunk 경계에 걸친 회사 처리까지 확인
+    written = ingest_dumps(files, store, corp_codes={"005930": "00126380"}, chunksize=1)
+    assert written == 3
+
+    full = store.get("005930", 2023)   # 종목코드로도 조회 가능
+    assert set(full["sj_div"]) == {"BS", "IS"}
+    assert full["corp_code"].unique().tolist() == ["00126380"]
+    assets = full[full["account_id"] == "ifrs-full_Assets"].iloc[0]
+    assert assets["thstrm_amount"] == 455905980
+    assert assets["frmtrm_amount"] == 448424507
+
+    # 매핑이 없는 종목은 종목코드가 corp_code 로 사용됨
+    assert store.has("000660", 2023)
+    assert sorted(k[0] for k in store.keys(2023)) == ["000660", "00126380"]
+
+
+def test_cli_maps_stock_codes_to_corp_codes(tmp_path, monkeypatch):
+    import sys
+    import json
+    import http_session
+    import dart_bulk
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+    universe = SyntheticUniverse(3, seed=2)
+    install(universe)
+    stock_code, corp_code = universe.corp_codes[["stock_code", "corp_code"]].iloc[1]
+    rows = [row.replace("[005930]", f"[{stock_code}]") for row in BS_ROWS[:2]]
+    _write(tmp_path / "bs.txt", rows)
+
+    root = str(tmp_path / "store")
+    monkeypatch.setattr(sys, "argv", ["dart_bulk.py", str(tmp_path / "*.txt"), "--store", root])
+    dart_bulk.main()
+
+    store = StatementStore(root)
+    assert [k[0] for k in store.keys(2023)] == [corp_code]
+    assert store.get(stock_code, 2023)["corp_code"].unique().tolist() == [corp_code]
+    with open(f"{root}/codes.json", encoding="utf-8") as fh:
+        assert json.load(fh) == {stock_code: corp_code}
+
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as d:
+        test_ingest_splits_by_company_and_statement(pathlib.Path(d))
+    print("▶ dart_bulk OK")
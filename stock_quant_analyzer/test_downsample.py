@@ -0,0 +1,77 @@
+# test_downsample.py
+
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from downsample import LTTB, MINMAX, ChartCache, downsample, lttb_indices, minmax_indices, point_budget
+
+
+def _prices(years=20, seed=0):
+    index = pd.bdate_range("2004-01-02", periods=252 * years)
+    rng = np.random.default_rng(seed)
+    return pd.Series(10000 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index)))), index=index)
+
+
+def test_lttb_keeps_endpoints_and_budget():
+    x = np.arange(5000)
+    y = np.sin(x / 200.0)
+    idx = lttb_indices(x, y, 300)
+    assert len(idx) == 300
+    assert idx[0] == 0 and idx[-1] == 4999
+    assert np.all(np.diff(idx) > 0)
+    # 사인파 꼭짓점 근처 점이 선택되어 진폭이 유지됨
+    assert y[idx].max() > 0.99 and y[idx].min() < -0.99
+
+
+def test_minmax_preserves_spikes_within_budget():
+    y = np.zeros(10_000)
+    y[1234], y[8765] = 50.0, -50.0
+    idx = minmax_indices(y, 100)
+    assert len(idx) <= 100
+    assert 1234 in idx and 8765 in idx
+    assert idx[0] == 0 and idx[-1] == 9999
+
+
+def test_downsample_series_handles_short_and_missing():
+    prices = _prices(1)
+    prices.iloc[10:20] = np.nan
+    assert downsample(prices, 1000).equals(prices.dropna())
+    for method in (LTTB, MINMAX):
+        out = downsample(prices, 50, method)
+        assert len(out) <= 50 and out.notna().all()
+        assert out.index.is_monotonic_increasing
+    with pytest.raises(ValueError):
+        downsample(prices, 50, "mean")
+
+
+def test_cache_reuses_per_window_and_resamples_on_zoom():
+    prices = _prices()
+    cache = ChartCache(max_items=4)
+    full = cache.series("005930", prices, width_px=800)
+    assert len(full) == point_budget(800)
+    assert cache.series("005930", prices, width_px=800) is full
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 확대: 좁은 구간을 같은 점 예산으로 다시 뽑아 원본 해상도에 가까워짐
+    start, end = pd.Timestamp("2010-01-01"), pd.Timestamp("2011-12-31")
+    zoomed = cache.series("005930", prices, start, end, width_px=800)
+    assert zoomed.index[0] >= start and zoomed.index[-1] <= end
+    assert len(zoomed) == len(prices.loc[start:end])
+
+    # 새 시세가 붙으면 다른 키
+    longer = pd.concat([prices, pd.Series([1.0], index=[prices.index[-1] + pd.offsets.BDay()])])
+    cache.series("005930", longer, width_px=800)
+    assert cache.misses == 3
+
+    for width in (400, 500, 600):
+        cache.series("005930", prices, width_px=width)
+    assert len(cache) == 4
+
+
+def test_twenty_years_downsamples_quickly():
+    prices = _prices(20)
+    started = time.perf_counter()
+    out = downsample(prices, point_budget(1200))
+    assert time.perf_counter() - started < 0.5
+    assert len(out) == 1200
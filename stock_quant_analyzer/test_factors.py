@@ -0,0 +1,56 @@
+# test_factors.py
+
+import numpy as np
+import pandas as pd
+from factors import FACTORS, compute_factors, single_ticker_factors
+
+
+def _panel(n: int = 300, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2023-01-02", periods=n)
+    market = rng.normal(0.0005, 0.01, n)
+    close = pd.DataFrame({
+        "A": 1000 * np.cumprod(1 + market),
+        "B": 1000 * np.cumprod(1 + 2 * market),
+    }, index=index)
+    return close
+
+
+def test_momentum_and_beta():
+    close = _panel()
+    out = compute_factors(close, benchmark=close["A"])
+    assert list(out.columns) == list(FACTORS)
+    assert np.isclose(out.loc["A", "Mom1M"], close["A"].iloc[-1] / close["A"].iloc[-22] - 1)
+    assert np.isclose(out.loc["A", "Mom12_1M"], close["A"].iloc[-22] / close["A"].iloc[-253] - 1)
+    assert np.isclose(out.loc["A", "Beta"], 1.0)
+    assert np.isclose(out.loc["B", "Beta"], 2.0)
+    assert out["AvgTradedValue"].isna().all()
+
+
+def test_drawdown_and_missing_columns():
+    index = pd.bdate_range("2024-01-01", periods=5)
+    close = pd.DataFrame({"A": [100, 120, 60, 90, 110], "B": np.nan}, index=index)
+    out = compute_factors(close)
+    assert np.isclose(out.loc["A", "MaxDrawdown"], 0.5)
+    assert out.loc["B"].isna().all()
+    assert np.isnan(out.loc["A", "Mom1M"])   # 이력 부족
+
+
+def test_single_ticker_uses_volume_when_no_traded_value():
+    index = pd.bdate_range("2024-01-01", periods=30)
+    price_df = pd.DataFrame({"종가": np.linspace(100, 130, 30), "거래량": 10}, index=index)
+    result = single_ticker_factors(price_df)
+    assert np.isclose(result["AvgTradedValue"], (price_df["종가"] * 10).iloc[-20:].mean())
+    assert result["Beta"] is None
+    assert single_ticker_factors(pd.DataFrame()) == {name: None for name in FACTORS}
+
+
+def test_single_ticker_masks_halted_days_like_the_panel():
+    close = _panel()[["A"]]
+    close.iloc[[100, 250, 290]] = 0.0   # 거래정지
+    price_df = pd.DataFrame({"종가": close["A"], "거래대금": 1e9}, index=close.index)
+    single = single_ticker_factors(price_df, benchmark=_panel()["B"])
+    panel = compute_factors(close.where(close > 0), price_df[["거래대금"]].set_axis(["A"], axis=1), _panel()["B"])
+    for name in FACTORS:
+        assert np.isclose(single[name], panel.loc["A", name], equal_nan=True), name
+    assert single["MaxDrawdown"] < 0.5   # 종가 0 을 -100% 로 보지 않음
@@ -0,0 +1,30 @@
+# test_filings.py
+
+import pandas as pd
+from filings import parse_report_name, periodic_reports, relevant_reports
+
+
+def test_parse_report_name():
+    assert parse_report_name("사업보고서 (2023.12)") == (2023, "11011")
+    assert parse_report_name("[기재정정]반기보고서 (2024.06)") == (2024, "11012")
+    assert parse_report_name("분기보고서 (2024.03)") == (2024, "11013")
+    assert parse_report_name("분기보고서 (2024.09)") == (2024, "11014")
+    assert parse_report_name("주요사항보고서(자기주식취득결정)") is None
+    assert parse_report_name(None) is None
+
+
+def test_periodic_reports_dedups_amendments():
+    filings = pd.DataFrame({
+        "corp_code": ["00126380", "00126380", "00164779"],
+        "corp_name": ["삼성전자", "삼성전자", "SK하이닉스"],
+        "stock_code": ["005930", "005930", "000660"],
+        "report_nm": ["사업보고서 (2023.12)", "[기재정정]사업보고서 (2023.12)", "임원ㆍ주요주주특정증권등소유상황보고서"],
+    })
+    reports = periodic_reports(filings)
+    assert reports[["corp_code", "year", "reprt_code"]].values.tolist() == [["00126380", 2023, "11011"]]
+    assert periodic_reports(pd.DataFrame()).empty
+
+
+def test_relevant_reports():
+    assert relevant_reports(2023) == {(2023, "11011"), (2022, "11011")}
+    assert relevant_reports(2024, "11012") == {(2024, "11012"), (2023, "11011"), (2023, "11012")}
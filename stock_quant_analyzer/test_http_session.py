@@ -0,0 +1,56 @@
+# test_http_session.py
+
+import sys
+import importlib
+import pytest
+import requests
+from http_session import DART_MODULES, PooledSession, QuotaExceededError, _check_dart_quota, install
+
+
+def _response(url, body, content_type="application/json;charset=UTF-8"):
+    resp = requests.Response()
+    resp.url = url
+    resp.headers["Content-Type"] = content_type
+    resp._content = body
+    return resp
+
+
+def test_quota_hook_only_for_dart_quota_status():
+    url = "https://opendart.fss.or.kr/api/fnlttSinglAcntAll.json?crtfc_key=x"
+    with pytest.raises(QuotaExceededError):
+        _check_dart_quota(_response(url, b'{"status": "020", "message": "limit"}'))
+    _check_dart_quota(_response(url, b'{"status":"013","message":"no data"}'))
+    _check_dart_quota(_response("https://data.krx.co.kr/x", b'{"status":"020"}'))
+
+
+def test_pooled_session_defaults():
+    session = PooledSession(pool_size=4, timeout=5)
+    adapter = session.get_adapter("https://opendart.fss.or.kr")
+    assert adapter._pool_maxsize == 4
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+
+def test_install_routes_module_requests_to_session(monkeypatch):
+    importlib.import_module("OpenDartReader.dart")
+    for name in DART_MODULES:
+        module = sys.modules.get(name)
+        if module is not None and hasattr(module, "requests"):
+            monkeypatch.setattr(module, "requests", module.requests)   # 테스트 후 원복
+
+    class FakeSession:
+        def __init__(self):
+            self.calls = []
+            self.adapters = {}
+
+        def get(self, url, **kwargs):
+            self.calls.append(url)
+            return "ok"
+
+    session = FakeSession()
+    monkeypatch.setattr(importlib.import_module("http_session"), "KRX_MODULE", "not_installed_module")
+    install(session)
+    finstate = sys.modules["OpenDartReader.dart_finstate"]
+    assert finstate.requests.get("https://opendart.fss.or.kr/api/x.json") == "ok"
+    assert finstate.requests.Session() is session
+    assert finstate.requests.exceptions is requests.exceptions
+    assert session.calls == ["https://opendart.fss.or.kr/api/x.json"]
@@ -0,0 +1,112 @@
+# test_memo.py
+
+import numpy as np
+import pandas as pd
+import pytest
+import metrics as metrics_module
+import scorer
+from config import SCORING_WEIGHTS
+from memo import METRICS, SCORE, Memo, fingerprint, layer_hash
+from metrics import ALIASES
+from snapshot import FinancialSnapshot
+
+
+def _statements(net_income=100.0):
+    rows = lambda sj, pairs: pd.DataFrame({
+        "sj_div": sj, "account_id": "-", "account_nm": [n for n, _ in pairs],
+        "thstrm_amount": [v for _, v in pairs], "frmtrm_amount": [v * 0.9 for _, v in pairs],
+    })
+    return {
+        "bs": rows("BS", [("자산총계", 1000.0), ("자본총계", 400.0), ("부채총계", 600.0),
+                          ("유동자산", 300.0), ("유동부채", 200.0)]),
+        "is": rows("IS", [("매출액", 800.0), ("영업이익", 80.0), ("당기순이익", net_income)]),
+        "cf": rows("CF", [("영업활동현금흐름", 120.0), ("투자활동현금흐름", -50.0)]),
+    }
+
+
+def _inputs(net_income=100.0):
+    snapshot = FinancialSnapshot.from_statements(_statements(net_income), _statements(net_income)["is"])
+    price = pd.DataFrame({"종가": np.linspace(100, 120, 30)}, index=pd.bdate_range("2023-01-02", periods=30))
+    return snapshot, price, {"PER": 10.0, "PBR": 1.2}
+
+
+class Counter:
+    def __init__(self, fn):
+        self.fn, self.calls = fn, 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.fn(*args, **kwargs)
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    calc_metrics = Counter(metrics_module.calculate_metrics)
+    calc_score = Counter(scorer.calculate_score)
+    monkeypatch.setattr(metrics_module, "calculate_metrics", calc_metrics)
+    monkeypatch.setattr(scorer, "calculate_score", calc_score)
+    return calc_metrics, calc_score
+
+
+def test_fingerprint_follows_content_not_identity():
+    a, b = _inputs(), _inputs()
+    assert fingerprint(*a) == fingerprint(*b)
+    assert fingerprint(*a) != fingerprint(*_inputs(net_income=101.0))
+    assert fingerprint({"x": 1.0, "y": None}) == fingerprint({"y": None, "x": 1.0})
+    assert fingerprint({"x": 1}) != fingerprint({"x": 1.0})
+    assert fingerprint(_statements()) != fingerprint(_statements(net_income=99.0))
+
+
+def test_weight_change_recomputes_scores_only(counted, monkeypatch):
+    calc_metrics, calc_score = counted
+    memo = Memo(None)
+    snapshot, price, pkrx = _inputs()
+
+    first = memo.score(memo.metrics(snapshot, price, pkrx))
+    again = memo.score(memo.metrics(*_inputs()))
+    assert (calc_metrics.calls, calc_score.calls) == (1, 1)
+    assert again == first
+
+    metrics_hash = layer_hash(METRICS)
+    monkeypatch.setitem(SCORING_WEIGHTS, "ROE", SCORING_WEIGHTS["ROE"] * 2)
+    assert layer_hash(METRICS) == metrics_hash
+    memo.score(memo.metrics(snapshot, price, pkrx))
+    assert (calc_metrics.calls, calc_score.calls) == (1, 2)
+
+    monkeypatch.setitem(ALIASES, "revenue", {"names": ["매출액"]})
+    memo.metrics(snapshot, price, pkrx)
+    assert calc_metrics.calls == 2
+
+
+def test_formula_version_bump_invalidates_layer(monkeypatch):
+    metrics_hash, score_hash = layer_hash(METRICS), layer_hash(SCORE)
+    monkeypatch.setattr(metrics_module, "METRICS_VERSION", metrics_module.METRICS_VERSION + 1)
+    assert layer_hash(METRICS) != metrics_hash
+    assert layer_hash(SCORE) == score_hash
+    monkeypatch.setattr(scorer, "SCORE_VERSION", scorer.SCORE_VERSION + 1)
+    assert layer_hash(SCORE) != score_hash
+
+
+def test_disk_tier_survives_new_process_and_lru_is_bounded(tmp_path, counted):
+    calc_metrics, _ = counted
+    path = str(tmp_path / "memo.db")
+    with Memo(path, max_items=2) as memo:
+        for n in (1.0, 2.0, 3.0):
+            memo.metrics(*_inputs(net_income=n))
+        assert len(memo._lru[METRICS]) == 2
+        memo.metrics(*_inputs(net_income=1.0))   # 메모리에서 밀려났지만 디스크에 있음
+        assert calc_metrics.calls == 3
+        assert memo.stats()[METRICS] == {"hits": 1, "misses": 3}
+
+    with Memo(path) as memo:
+        memo.metrics(*_inputs(net_income=2.0))
+        assert calc_metrics.calls == 3
+
+
+def test_purge_drops_only_stale_layer(tmp_path, monkeypatch):
+    with Memo(str(tmp_path / "memo.db")) as memo:
+        memo.score(memo.metrics(*_inputs()))
+        monkeypatch.setitem(SCORING_WEIGHTS, "ROE", 0.5)
+        assert memo.purge() == 1
+        rows = memo.conn.execute("SELECT layer FROM memo").fetchall()
+        assert rows == [(METRICS,)]
@@ -0,0 +1,63 @@
+# test_metric_graph.py
+
+import pandas as pd
+import pytest
+from config import SCORING_WEIGHTS
+from metric_graph import METRIC_INPUTS, active_metrics, plan, required_inputs
+from metrics import calculate_metrics
+from snapshot import FinancialSnapshot
+from test_snapshot import _dart
+
+
+def test_price_only_weights_need_no_dart():
+    metrics, inputs = plan({"Mom12M": 0.5, "Volatility": 0.5, "ROE": 0.0})
+    assert metrics == {"Mom12M", "Volatility"}
+    assert inputs == {"ohlcv"}
+
+
+def test_inputs_follow_dependencies():
+    assert required_inputs(["RevenueGrowth"]) == {"dart", "dart_prev"}
+    assert required_inputs(["PER"]) == {"fundamental", "ohlcv"}
+    assert required_inputs(["Beta"]) == {"ohlcv", "benchmark"}
+
+
+def test_default_weights_are_all_declared():
+    assert active_metrics() <= set(METRIC_INPUTS)
+    assert active_metrics() == {name for name, w in SCORING_WEIGHTS.items() if w > 0}
+    with pytest.raises(ValueError):
+        active_metrics({"Unknown": 1.0})
+
+
+def test_only_matches_full_computation():
+    snap = FinancialSnapshot.from_statements(_dart())
+    price = pd.DataFrame({"종가": [100.0, 110.0, 105.0, 120.0]})
+    pkrx = {"PER": 8.0, "BPS": 60.0}
+    full = calculate_metrics(snap, price, pkrx)
+    subset = calculate_metrics(snap, price, pkrx, only={"ROE", "RevenueGrowth", "PER"})
+    assert subset == {name: full[name] for name in ("ROE", "RevenueGrowth", "PER")}
+
+
+def test_price_factors_computed_only_when_planned(monkeypatch):
+    import http_session
+    import data_provider
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    from factors import FACTORS
+
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+    universe = SyntheticUniverse(2, seed=1, missing_rate=0)
+    install(universe)
+    calls = []
+    original = data_provider.single_ticker_factors
+    monkeypatch.setattr(data_provider, "single_ticker_factors", lambda *a: calls.append(1) or original(*a))
+    code = universe.corp_codes["stock_code"].iloc[0]
+
+    metrics, inputs = plan()
+    data = data_provider.get_combined_data(code, 2023, inputs=inputs, metrics=metrics)
+    assert metrics.isdisjoint(FACTORS) and calls == []
+    assert data["pykrx"]["Mom12M"] is not None
+
+    metrics, inputs = plan({"Mom12M": 0.5, "Beta": 0.5})
+    data = data_provider.get_combined_data(code, 2023, inputs=inputs, metrics=metrics)
+    assert calls == [1] and data["pykrx"]["Beta"] is not None
@@ -0,0 +1,35 @@
+# test_negative_cache.py
+
+import datetime
+import pytest
+from negative_cache import NO_REPORT, FETCH_ERROR, NegativeCache
+
+
+def test_get_respects_ttl_and_discard():
+    cache = NegativeCache(":memory:", ttl_days={FETCH_ERROR: 0})
+    cache.add("00126380", 2023, "11011", NO_REPORT)
+    cache.add("005930", 2023, "ohlcv", FETCH_ERROR, "timeout")
+
+    assert cache.get("00126380", 2023, "11011") == (NO_REPORT, "")
+    assert cache.get("005930", 2023, "ohlcv") is None        # TTL 0 → 즉시 만료
+    assert cache.get("00126380", 2022, "11011") is None
+
+    assert list(cache.entries()["code"]) == ["00126380"]
+    assert len(cache.entries(include_expired=True)) == 2
+    assert cache.purge() == 1
+
+    cache.discard("00126380", 2023, "11011")
+    assert cache.get("00126380", 2023, "11011") is None
+
+
+def test_expired_entry_is_ignored(monkeypatch):
+    cache = NegativeCache(":memory:")
+    cache.add("00126380", 2023, "11011", NO_REPORT)
+    later = datetime.datetime.now() + datetime.timedelta(days=8)
+    monkeypatch.setattr(NegativeCache, "_now", staticmethod(lambda: later))
+    assert cache.get("00126380", 2023, "11011") is None
+
+
+def test_unknown_reason_rejected():
+    with pytest.raises(ValueError):
+        NegativeCache(":memory:").add("x", 2023, "11011", "OOPS")
@@ -0,0 +1,112 @@
+# test_parallel.py
+
+import os
+import multiprocessing
+import pytest
+import http_session
+from parallel import score_parallel
+from statement_store import StatementStore
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="합성 백엔드를 작업 프로세스에 물려주려면 fork 필요",
+)
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+
+
+@pytest.fixture
+def universe():
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    universe = SyntheticUniverse(16, seed=3)
+    install(universe)
+    return universe
+
+
+def _tasks(universe):
+    from batch import Company
+    return [(Company(r.corp_code, r.corp_name, r.stock_code), None) for r in universe.corp_codes.itertuples(index=False)]
+
+
+def test_workers_read_statements_without_writing(tmp_path, universe):
+    import batch
+    root = str(tmp_path / "statements")
+    statements = StatementStore(root)
+    expected = {}
+    for item, _ in _tasks(universe):
+        row = batch.score_company(item.corp_code, item.corp_name, item.stock_code, 2023, statements=statements)
+        if row:
+            expected[item.corp_code] = row["score"]
+    before = {path: os.path.getmtime(path) for path in (os.path.join(root, "dictionary.json"),)}
+
+    results = list(score_parallel(
+        _tasks(universe), 2023, workers=2, chunk_size=3, statements_root=root, start_method="fork",
+    ))
+    assert len(results) == 16
+    got = {item.corp_code: row["score"] for item, row, status, _ in results if status == "done"}
+    assert got == pytest.approx(expected)
+    assert all(isinstance(error, (str, type(None))) for *_, error in results)
+    assert {path: os.path.getmtime(path) for path in before} == before
+
+
+def test_read_only_store_ignores_writes(tmp_path):
+    import pandas as pd
+    store = StatementStore(str(tmp_path / "ro"), read_only=True)
+    store.put("00000001", 2023, pd.DataFrame({"sj_div": ["BS"], "account_nm": ["자산총계"], "thstrm_amount": [1.0]}))
+    store.register_codes({"000001": "00000001"})
+    assert not store.has("00000001", 2023)
+    assert not os.path.exists(str(tmp_path / "ro"))
+
+
+def _session_ids(_):
+    import sys
+    import http_session
+    webio = sys.modules.get(http_session.KRX_MODULE)
+    return id(http_session._session), id(webio.requests._session) if webio is not None else None
+
+
+def test_live_workers_do_not_share_parent_http_session():
+    from concurrent.futures import ProcessPoolExecutor
+    from backend import LIVE
+    import parallel
+
+    parent = http_session.get_session()   # 부모가 keep-alive 커넥션을 연 상태를 흉내
+    pool = ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("fork"), initializer=parallel._init,
+        initargs=((LIVE, None), None, None, None, False, {}),
+    )
+    with pool:
+        session_id, shim_id = pool.submit(_session_ids, None).result()
+    assert session_id != id(parent)
+    assert shim_id in (None, session_id)   # pykrx 도 새 세션으로 다시 주입됨
+
+
+def test_record_backend_is_refused(monkeypatch):
+    import backend
+    monkeypatch.setattr(backend, "_active", (backend.RECORD, "archive.zip"))
+    with pytest.raises(ValueError, match="record"):
+        next(score_parallel([], 2023, workers=2))
+
+
+def test_run_universe_with_workers_matches_pipeline(tmp_path, universe, monkeypatch):
+    import parallel
+    from store import ResultStore
+    from checkpoint import Checkpoint
+    import batch
+
+    original = parallel.score_parallel
+    monkeypatch.setattr(batch, "score_parallel", lambda *a, **k: original(*a, start_method="fork", **k))
+    items = universe.corp_codes[["corp_code", "corp_name", "stock_code"]]
+    sequential, pooled = ResultStore(":memory:"), ResultStore(":memory:")
+    batch.run_universe(items, 2023, sequential, batch_size=4)
+    checkpoint = Checkpoint(str(tmp_path / "ckpt.jsonl"), meta={"as_of": "2024-01-02"})
+    saved = batch.run_universe(items, 2023, pooled, batch_size=4, workers=2, checkpoint=checkpoint)
+
+    expected = sequential.latest_rows(2023).set_index("corp_code")["score"].to_dict()
+    assert saved == len(expected)
+    assert pooled.latest_rows(2023).set_index("corp_code")["score"].to_dict() == pytest.approx(expected)
+    assert all(checkpoint.is_finished(code, 2023) for code in expected)
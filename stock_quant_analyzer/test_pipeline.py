@@ -0,0 +1,111 @@
+# test_pipeline.py
+
+import os
+import time
+import logging
+import threading
+import numpy as np
+import pytest
+import http_session
+from pipeline import IDLE, Stage, stream
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+
+
+def _alive():
+    return [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
+
+
+def test_stages_run_in_order_and_drop_none(tmp_path):
+    stages = [Stage("double", lambda x: x * 2), Stage("odd", lambda x: None if x % 4 == 0 else x)]
+    assert list(stream(range(10), stages, spill_dir=str(tmp_path))) == [2, 6, 10, 14, 18]
+    assert not _alive()
+
+
+def test_bounded_queues_apply_backpressure(tmp_path):
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    ahead = []
+    for i, _ in enumerate(stream(source(), [Stage("a", lambda x: x), Stage("b", lambda x: x)],
+                                 maxsize=2, spill_dir=str(tmp_path))):
+        time.sleep(0.002)
+        ahead.append(len(produced) - i)
+    # 큐 3개 × 2 + 단계별 처리 중 1개씩 + 공급 중 1개 정도만 앞서감
+    assert max(ahead) <= 10
+
+
+def test_spills_to_disk_over_memory_ceiling(tmp_path, caplog):
+    caplog.set_level(logging.INFO, logger="pipeline")
+    spill_dir = str(tmp_path / "spill")
+    gate = threading.Event()
+
+    def slow(x):
+        gate.wait()
+        return x
+
+    arrays = (np.full(50_000, i, dtype=float) for i in range(40))   # 400KB 씩
+    out = stream(arrays, [Stage("load", lambda a: a), Stage("slow", slow)],
+                 maxsize=100, memory_mb=1, spill_dir=spill_dir)
+    threading.Timer(0.3, gate.set).start()
+    values = [int(a[0]) for a in out]
+    assert values == list(range(40))
+    assert "디스크에 내려썼습니다" in caplog.text
+    assert os.listdir(spill_dir) == []
+
+
+def test_stage_error_is_raised_to_consumer(tmp_path):
+    def boom(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    with pytest.raises(ValueError, match="bad item"):
+        list(stream(range(100), [Stage("boom", boom)], maxsize=2, spill_dir=str(tmp_path)))
+    assert not _alive()
+
+
+def test_idle_marker_and_early_close(tmp_path):
+    def slow(x):
+        time.sleep(0.2 if x == 1 else 0)
+        return x
+
+    out = stream(range(1000), [Stage("slow", slow)], maxsize=4, spill_dir=str(tmp_path), idle=0.05)
+    seen = []
+    for item in out:
+        seen.append(item)
+        if len(seen) > 5:
+            break
+    out.close()
+    assert seen[:2] == [0, IDLE]
+    assert not _alive()
+
+
+def test_run_universe_matches_score_company(tmp_path):
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    from store import ResultStore
+
+    universe = SyntheticUniverse(12, seed=1)
+    install(universe)
+    import batch
+
+    items = universe.corp_codes[["corp_code", "corp_name", "stock_code"]]
+    store = ResultStore(":memory:")
+    saved = batch.run_universe(items, 2023, store, batch_size=5, memory_mb=0.01)
+    expected = [
+        batch.score_company(r.corp_code, r.corp_name, r.stock_code, 2023)
+        for r in items.itertuples(index=False)
+    ]
+    expected = {r["corp_code"]: r["score"] for r in expected if r}
+    assert saved == len(expected)
+    got = store.latest_rows(2023).set_index("corp_code")["score"].to_dict()
+    assert got == pytest.approx(expected)
@@ -0,0 +1,81 @@
+# test_portfolio.py
+
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from portfolio import RiskModel, build_portfolio
+
+
+def _close(n_days: int = 160, n_names: int = 8, seed: int = 5, missing: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0003, 0.01, n_days)
+    returns = market[:, None] * rng.uniform(0.5, 1.5, n_names) + rng.normal(0, 0.02, (n_days, n_names))
+    close = 1000 * np.cumprod(1 + returns, axis=0)
+    close[rng.random(close.shape) < missing] = 0.0   # 거래정지
+    index = pd.bdate_range("2023-01-02", periods=n_days)
+    return pd.DataFrame(close, index=index, columns=[f"{i:06d}" for i in range(n_names)])
+
+
+def test_incremental_window_matches_full_recompute():
+    close = _close()
+    incremental = RiskModel(window=100, min_obs=20)
+    incremental.update_prices(close.iloc[:70])
+    for day, row in close.iloc[70:].iterrows():
+        incremental.update_day(row, day.strftime("%Y%m%d"))
+
+    full = RiskModel(window=100, min_obs=20)
+    full.update_prices(close)
+    assert len(incremental.dates) == 100
+    sample = incremental.sample_covariance(incremental.tickers)
+    expected = close.pct_change().iloc[-100:].cov(ddof=0).to_numpy()
+    assert np.allclose(sample, expected)
+    assert np.allclose(incremental.covariance().to_numpy(), full.covariance().to_numpy())
+
+
+def test_shrinkage_keeps_covariance_positive_definite_when_names_exceed_days():
+    close = _close(n_days=40, n_names=60, missing=0.05)
+    model = RiskModel(window=30, min_obs=10)
+    model.update_prices(close)
+    tickers = model.covered()
+    delta = model.shrinkage(tickers, model.sample_covariance(tickers))
+    assert 0.0 < delta <= 1.0
+    assert np.linalg.eigvalsh(model.covariance().to_numpy())[0] > 0
+
+
+def test_build_portfolio_respects_caps_and_liquidity_floor():
+    names = [f"{i:06d}" for i in range(40)]
+    cov = pd.DataFrame(np.eye(40) * 0.09, index=names, columns=names)
+    scores = pd.Series(np.linspace(20, 90, 40), index=names)
+    sectors = pd.Series(["A"] * 20 + ["B"] * 10 + ["C"] * 10, index=names)
+    traded = pd.Series(1e10, index=names)
+    traded.iloc[-1] = 1e6   # 최고 점수지만 유동성 미달
+
+    w = build_portfolio(scores, cov, sectors, traded, position_cap=0.08, sector_cap=0.4, min_traded_value=1e9)
+    assert w["weight"].sum() == pytest.approx(1.0)
+    assert w["weight"].max() <= 0.08 + 1e-6
+    assert w.groupby("sector")["weight"].sum().max() <= 0.4 + 1e-4
+    assert names[-1] not in w.index
+    # 같은 위험이면 같은 업종 안에서 점수가 높은 종목의 비중이 더 큼
+    by_score = w.sort_values("score")
+    assert by_score.groupby("sector")["weight"].apply(lambda s: s.is_monotonic_increasing).all()
+
+
+def test_build_portfolio_rejects_infeasible_caps():
+    names = ["000001", "000002"]
+    cov = pd.DataFrame(np.eye(2) * 0.04, index=names, columns=names)
+    with pytest.raises(ValueError):
+        build_portfolio(pd.Series([50.0, 60.0], index=names), cov, position_cap=0.3)
+
+
+def test_five_hundred_names_in_seconds():
+    close = _close(n_days=300, n_names=500, seed=11, missing=0.02)
+    rng = np.random.default_rng(0)
+    started = time.perf_counter()
+    model = RiskModel()
+    model.update_prices(close)
+    cov = model.covariance()
+    sectors = pd.Series(rng.choice(list("ABCDEFGHIJ"), 500), index=close.columns)
+    w = build_portfolio(pd.Series(rng.uniform(20, 90, 500), index=close.columns), cov, sectors)
+    assert time.perf_counter() - started < 5.0
+    assert w["weight"].sum() == pytest.approx(1.0)
@@ -0,0 +1,62 @@
+# test_price_engine.py
+
+import numpy as np
+import pandas as pd
+from price_engine import PriceMetricEngine, price_metrics
+
+
+def _closes(n: int, seed: int = 7) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(10000 * np.cumprod(1 + rng.normal(0.0005, 0.02, n)))
+
+
+def test_incremental_matches_full_recompute():
+    close = _closes(400)
+    engine = PriceMetricEngine(momentum_window=252, volatility_window=252)
+    engine.seed("005930", close)
+
+    expected = price_metrics(close)   # 2년치를 넘겨도 엔진과 같은 최근 252 거래일 구간
+    assert np.isclose(expected["Mom12M"], close.iloc[-1] / close.iloc[-253] - 1)
+    got = engine.metrics("005930")
+    assert np.isclose(got["Mom12M"], expected["Mom12M"])
+    assert np.isclose(got["Volatility"], expected["Volatility"], rtol=1e-9)
+
+
+def test_short_history_matches_price_metrics():
+    close = _closes(30)
+    engine = PriceMetricEngine()
+    engine.seed("000660", close)
+    expected = price_metrics(close)
+    assert np.isclose(engine.metrics("000660")["Mom12M"], expected["Mom12M"])
+    assert np.isclose(engine.metrics("000660")["Volatility"], expected["Volatility"])
+
+
+def test_halted_days_are_skipped_like_the_engine():
+    close = _closes(300)
+    close.iloc[[50, 280, 281]] = 0.0    # 거래정지
+    close.iloc[120] = np.nan
+    engine = PriceMetricEngine()
+    engine.seed("035720", close)
+    expected = price_metrics(close)
+    assert np.isclose(engine.metrics("035720")["Mom12M"], expected["Mom12M"])
+    assert np.isclose(engine.metrics("035720")["Volatility"], expected["Volatility"], rtol=1e-9)
+
+
+def test_update_day_skips_stale_dates_and_roundtrips(tmp_path):
+    engine = PriceMetricEngine(momentum_window=2, volatility_window=2)
+    engine.update_day({"A": 100.0, "B": 50.0}, date="20240102")
+    engine.update_day({"A": 110.0, "B": 0.0}, date="20240103")   # B 거래정지
+    engine.update_day({"A": 999.0}, date="20240103")              # 중복 날짜 무시
+
+    path = str(tmp_path / "state.pkl")
+    engine.save(path)
+    restored = PriceMetricEngine.load(path)
+    assert np.isclose(restored.metrics("A")["Mom12M"], 0.10)
+    assert restored.metrics("B")["Mom12M"] is None
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_recompute()
+    test_short_history_matches_price_metrics()
+    test_halted_days_are_skipped_like_the_engine()
+    print("▶ price_engine OK")
@@ -0,0 +1,60 @@
+# test_reporter.py
+
+import json
+import pandas as pd
+import pyarrow.parquet as pq
+from reporter import open_writer, TopN
+
+
+def _rows(n: int):
+    for i in range(n):
+        yield {"corp_code": f"{i:08d}", "year": 2023, "score": float(i % 7), "ROE": None if i % 3 else 1.5}
+
+
+def test_parquet_writer_appends_row_groups(tmp_path):
+    path = str(tmp_path / "out.parquet")
+    with open_writer(path, batch_size=10) as writer:
+        writer.write_many(_rows(25))
+    meta = pq.ParquetFile(path).metadata
+    assert meta.num_rows == 25
+    assert meta.num_row_groups == 3
+
+
+def test_arrow_schema_does_not_depend_on_first_batch(tmp_path):
+    import pyarrow as pa
+    empty = [{"corp_code": f"{i:08d}", "year": 2023, "stock_code": None, "score": None, "ROE": None} for i in range(2)]
+    full = [{
+        "corp_code": "00000009", "year": 2023, "stock_code": "000009", "comment": "양호", "score": 71,
+        "ROE": 0.12, "ROE_score": 80.0, "sector": "반도체", "sector_score": 65.0,
+    }]
+    for path in (str(tmp_path / "out.parquet"), str(tmp_path / "out.arrow")):
+        with open_writer(path, batch_size=2) as writer:
+            writer.write_many(empty + full)
+        table = pq.read_table(path) if path.endswith(".parquet") else pa.ipc.open_file(path).read_all()
+        assert table.schema.field("stock_code").type == pa.string()
+        assert table.schema.field("score").type == pa.float64()
+        assert table.column("sector").to_pylist() == [None, None, "반도체"]
+        assert table.column("ROE_score").to_pylist() == [None, None, 80.0]
+
+
+def test_jsonl_and_csv_writers(tmp_path):
+    with open_writer(str(tmp_path / "out.jsonl"), batch_size=4) as writer:
+        writer.write_many(_rows(5))
+    lines = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 5 and json.loads(lines[1])["ROE"] is None
+
+    with open_writer(str(tmp_path / "out.csv")) as writer:
+        writer.write_many(_rows(5))
+    assert len(pd.read_csv(tmp_path / "out.csv")) == 5
+
+
+def test_top_n_keeps_highest_scores():
+    top = TopN(3)
+    for row in _rows(20):
+        top.add(row)
+    assert [r["score"] for r in top.rows()] == [6.0, 6.0, 5.0]
+
+
+if __name__ == "__main__":
+    test_top_n_keeps_highest_scores()
+    print("▶ reporter OK")
@@ -0,0 +1,158 @@
+# test_scheduler.py
+
+import pandas as pd
+import pytest
+import http_session
+from statement_store import StatementStore
+from store import ResultStore
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    monkeypatch.setattr(http_session, "dart_reader", http_session.dart_reader)
+    monkeypatch.setattr(http_session, "get_session", http_session.get_session)
+
+
+@pytest.fixture
+def universe():
+    from synthetic import SyntheticUniverse
+    from benchmark import install
+    universe = SyntheticUniverse(6, seed=5, missing_rate=0)
+    install(universe)
+    return universe
+
+
+@pytest.fixture
+def scored(tmp_path, universe):
+    """2023 사업연도 점수를 2024-01-02 기준으로 저장해 둔 결과 저장소·재무제표 저장소."""
+    import batch
+    statements = StatementStore(str(tmp_path / "statements"))
+    store = ResultStore(":memory:")
+    for item in universe.corp_codes.itertuples(index=False):
+        row = batch.score_company(item.corp_code, item.corp_name, item.stock_code, 2023, "2024-01-02", statements=statements)
+        assert row
+        store.upsert(row)
+    return store, statements
+
+
+def _filings(universe, *report_names):
+    first = universe.corp_codes.iloc[0]
+    return pd.DataFrame({
+        "corp_code": [first.corp_code] * len(report_names),
+        "corp_name": [first.corp_name] * len(report_names),
+        "stock_code": [first.stock_code] * len(report_names),
+        "report_nm": list(report_names),
+    })
+
+
+def test_refresh_prices_uses_trailing_window(universe, scored):
+    from data_provider import stock
+    from metric_graph import PRICE_METRICS, active_metrics
+    from price_engine import price_metrics
+    from scheduler import refresh_prices
+
+    store, _ = scored
+    row = store.latest_rows(2023).iloc[0].to_dict()
+    refreshed = refresh_prices(row, 2023, active_metrics() & PRICE_METRICS, as_of="2024-06-28")
+
+    closes = stock.get_market_ohlcv_by_date("20220629", "20240628", row["stock_code"])["종가"]
+    assert refreshed["as_of"] == "2024-06-28"
+    assert refreshed["Mom12M"] == pytest.approx(price_metrics(closes)["Mom12M"])
+    assert refreshed["Mom12M"] != pytest.approx(row["Mom12M"])   # 끝난 사업연도 구간을 다시 쓰지 않음
+    assert refreshed["ROE"] == pytest.approx(row["ROE"])          # 재무 지표는 그대로
+
+
+def test_run_schedule_rescores_filers_and_bumps_everyone(universe, scored, monkeypatch):
+    import scheduler
+
+    store, statements = scored
+    first, stale = universe.corp_codes.iloc[0].corp_code, universe.corp_codes.iloc[1].corp_code
+    before = store.latest_rows(2023).set_index("corp_code")
+    original = scheduler.refresh_prices
+
+    def flaky(row, *args, **kwargs):
+        if row["corp_code"] == stale:
+            raise ConnectionError("KRX 응답 없음")
+        return original(row, *args, **kwargs)
+
+    monkeypatch.setattr(scheduler, "refresh_prices", flaky)
+    filings = _filings(universe, "사업보고서 (2023.12)", "주요사항보고서(자기주식취득결정)")
+    stats = scheduler.run_schedule(filings, 2023, store, statements, as_of="2024-06-28")
+
+    assert stats == {"filed": 1, "invalidated": 1, "rescored": 1, "price_refreshed": 4, "carried": 1}
+    assert statements.has(universe.corp_codes.iloc[0].stock_code, 2023)   # 무효화 후 다시 받아 적재
+    after = store.latest_rows(2023).set_index("corp_code")
+    assert len(after) == 6
+    assert set(after["as_of"]) == {"2024-06-28"}
+    # 시세 갱신에 실패한 기업은 값을 그대로 옮김
+    assert after.loc[stale, "score"] == pytest.approx(before.loc[stale, "score"])
+    assert after.loc[stale, "Mom12M"] == pytest.approx(before.loc[stale, "Mom12M"])
+    refreshed = after.index.difference([first, stale])
+    assert (after.loc[refreshed, "Mom12M"] != before.loc[refreshed, "Mom12M"]).all()
+
+
+def test_run_schedule_without_filings_refreshes_prices(universe, scored):
+    import scheduler
+    store, statements = scored
+    stats = scheduler.run_schedule(pd.DataFrame(), 2023, store, statements, as_of="2024-06-28")
+    assert (stats["filed"], stats["rescored"], stats["price_refreshed"]) == (0, 0, 6)
+    assert set(store.latest_rows(2023)["as_of"]) == {"2024-06-28"}
+
+
+def test_price_state_feeds_scheduler_refresh(tmp_path, universe, scored, caplog):
+    from data_provider import stock
+    from metric_graph import PRICE_METRICS, active_metrics
+    from price_engine import PriceMetricEngine
+    from batch import with_price_state
+    import scheduler
+
+    store, statements = scored
+    engine = PriceMetricEngine()
+    for code in universe.corp_codes["stock_code"]:
+        engine.seed(code, stock.get_market_ohlcv_by_date("20230101", "20240628", code)["종가"])
+    engine.last_date = "20240628"
+    path = str(tmp_path / "price_state.pkl")
+    engine.save(path)
+
+    assert with_price_state(None, path, "20240701") is None   # 다른 시점의 상태는 쓰지 않음
+    assert with_price_state(None, str(tmp_path / "missing.pkl"), "20240628") is None
+    skipped = [r.getMessage() for r in caplog.records if r.levelname == "ERROR"]
+    assert len(skipped) == 2 and all("--price-state" in m for m in skipped)
+    assert "20240628" in skipped[0] and "20240701" in skipped[0]   # 어느 날짜가 달랐는지 남김
+    table = with_price_state(None, path, "20240628")
+    assert set(table.columns) == {"Mom12M", "Volatility"}
+
+    row = store.latest_rows(2023).iloc[0].to_dict()
+    direct = scheduler.refresh_prices(row, 2023, active_metrics() & PRICE_METRICS, as_of="2024-06-28")
+    stats = scheduler.run_schedule(pd.DataFrame(), 2023, store, statements, as_of="2024-06-28", factor_table=table)
+    assert stats["price_refreshed"] == 6
+    after = store.latest_rows(2023).set_index("corp_code")
+    expected = engine.metrics(row["stock_code"])
+    assert after.loc[row["corp_code"], "Mom12M"] == pytest.approx(expected["Mom12M"])
+    assert after.loc[row["corp_code"], "Volatility"] == pytest.approx(expected["Volatility"])
+    # 엔진과 종목별 조회가 같은 구간 정의를 쓰므로 값도 같음
+    assert direct["Mom12M"] == pytest.approx(expected["Mom12M"])
+
+
+def test_refresh_prices_skips_ohlcv_when_factors_cover_price_metrics(universe, scored, monkeypatch):
+    import data_provider
+    from scheduler import refresh_prices
+
+    store, _ = scored
+    row = store.latest_rows(2023).iloc[0].to_dict()
+    calls = []
+    original = data_provider.stock
+
+    class Counting:
+        def __getattr__(self, name):
+            calls.append(name)
+            return getattr(original, name)
+
+    monkeypatch.setattr(data_provider, "stock", Counting())
+    factors = {"Mom12M": 0.25, "Volatility": 0.3}
+    refreshed = refresh_prices(row, 2023, frozenset(factors), as_of="2024-06-28", factors=factors)
+    assert calls == []   # 엔진 상태로 모두 채워지므로 2년치 시세를 받지 않음
+    assert (refreshed["Mom12M"], refreshed["Volatility"]) == (0.25, 0.3)
+
+    refresh_prices(row, 2023, frozenset({"Mom12M", "Volatility", "PER"}), as_of="2024-06-28", factors=factors)
+    assert "get_market_ohlcv_by_date" in calls   # PER 은 시세 마지막 거래일 기준 펀더멘털이 필요
@@ -0,0 +1,48 @@
+# test_screen.py
+
+import pytest
+from store import ResultStore, make_row
+from screen import parse_screen, run_screen, ScreenSyntaxError
+
+
+def test_parse_builds_parameterized_where():
+    screen = parse_screen("roe > 15 and (PER < 10 or PBR <= 1) order by ROE asc limit 5")
+    assert screen.where == '"ROE" > ? AND ("PER" < ? OR "PBR" <= ?)'
+    assert screen.params == [15.0, 10.0, 1.0]
+    assert (screen.order_by, screen.ascending, screen.limit) == ("ROE", True, 5)
+
+
+def test_parse_accepts_exponent_literals():
+    screen = parse_screen("AvgTradedValue > 1e10 and Volatility < 2.5E-1 and PER > -1e+2")
+    assert screen.where == '"AvgTradedValue" > ? AND "Volatility" < ? AND "PER" > ?'
+    assert screen.params == [1e10, 0.25, -100.0]
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ScreenSyntaxError):
+        parse_screen("ROIC > 10")
+    with pytest.raises(ScreenSyntaxError):
+        parse_screen("ROE >")
+
+
+def test_run_screen_against_store():
+    store = ResultStore(":memory:")
+    store.upsert_many([
+        make_row("A", 2023, {"ROE": 20.0, "PER": 8.0, "DebtRatio": 50.0}, 80.0, "", {}, as_of="2024-01-02"),
+        make_row("B", 2023, {"ROE": 18.0, "PER": 9.0, "DebtRatio": 150.0}, 90.0, "", {}, as_of="2024-01-02"),
+        make_row("C", 2023, {"ROE": 16.0, "PER": 6.0, "DebtRatio": 40.0}, 85.0, "", {}, as_of="2024-01-02"),
+        make_row("D", 2023, {"ROE": 5.0, "PER": 4.0, "DebtRatio": 20.0}, 95.0, "", {}, as_of="2024-01-02"),
+    ])
+    result = run_screen("ROE > 15 and PER < 10 and DebtRatio < 100 order by score desc limit 50", store)
+    assert list(result["corp_code"]) == ["C", "A"]
+
+    # 한 기업만 새 기준일로 다시 계산해도 다른 기업은 각자의 최신 행으로 남음
+    store.upsert(make_row("B", 2023, {"ROE": 18.0, "PER": 9.0, "DebtRatio": 60.0}, 90.0, "", {}, as_of="2024-03-05"))
+    result = run_screen("ROE > 15 and PER < 10 and DebtRatio < 100 order by score desc limit 50", store)
+    assert list(result["corp_code"]) == ["B", "C", "A"]
+
+
+if __name__ == "__main__":
+    test_parse_builds_parameterized_where()
+    test_run_screen_against_store()
+    print("▶ screen OK")
@@ -0,0 +1,59 @@
+# test_screener.py
+
+from store import ResultStore, make_row
+from screener import query_score_table
+
+
+def _store() -> ResultStore:
+    store = ResultStore(":memory:")
+    rows = [
+        ("A", 80.0, 18.0, 7.0),
+        ("B", 55.0, 9.0, 12.0),
+        ("C", 91.0, 22.0, 9.5),
+        ("D", None, 16.0, 5.0),
+        ("E", 67.0, 15.5, 11.0),
+    ]
+    store.upsert_many(
+        make_row(code, 2023, {"ROE": roe, "PER": per}, score, "", {}, as_of="2024-01-02")
+        for code, score, roe, per in rows
+    )
+    # 과거 스냅샷은 조회 대상이 아님 (Z 는 최신 행만)
+    store.upsert(make_row("Z", 2023, {"ROE": 99.0, "PER": 1.0}, 99.0, "", {}, as_of="2023-06-01"))
+    store.upsert(make_row("Z", 2023, {"ROE": 1.0, "PER": 50.0}, 10.0, "", {}, as_of="2024-01-02"))
+    return store
+
+
+def test_filter_sort_and_total():
+    rows, total = query_score_table(_store(), 2023, {"ROE": (15, None), "PER": (None, 10)})
+    assert total == 3
+    # None 점수는 정렬 시 맨 뒤로
+    assert list(rows["corp_code"]) == ["C", "A", "D"]
+
+
+def test_paging_returns_only_requested_rows():
+    rows, total = query_score_table(_store(), 2023, sort_by="ROE", ascending=True, page=2, page_size=2)
+    assert total == 6
+    assert list(rows["corp_code"]) == ["E", "D"]
+
+
+def test_unknown_filter_column_is_ignored():
+    _, total = query_score_table(_store(), 2023, {"Unknown": (0, None)})
+    assert total == 6
+
+
+def test_partial_rescore_keeps_other_companies():
+    # analyze.py --save 나 스케줄러가 일부 기업만 새 기준일로 저장한 경우
+    store = _store()
+    store.upsert(make_row("A", 2023, {"ROE": 30.0, "PER": 6.0}, 88.0, "", {}, as_of="2024-03-05"))
+    rows, total = query_score_table(store, 2023, sort_by="ROE")
+    assert total == 6
+    assert list(rows["corp_code"]) == ["A", "C", "D", "E", "B", "Z"]
+    assert rows.set_index("corp_code").loc["A", "ROE"] == 30.0
+
+
+if __name__ == "__main__":
+    test_filter_sort_and_total()
+    test_paging_returns_only_requested_rows()
+    test_unknown_filter_column_is_ignored()
+    test_partial_rescore_keeps_other_companies()
+    print("▶ screener OK")
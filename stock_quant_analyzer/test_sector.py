@@ -0,0 +1,121 @@
+# test_sector.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sector import (
+    MARKET, UNCLASSIFIED, SectorStats, build_industry_index, group_stats, load_industry_index, sector_stats,
+)
+from store import KEY_COLUMNS, ResultStore, make_row
+
+
+def _universe(n_big=20, n_small=3):
+    codes = [f"{10_000_000 + i:08d}" for i in range(n_big + n_small)]
+    index = pd.DataFrame({
+        "corp_code": codes,
+        "stock_code": [f"{i:06d}" for i in range(len(codes))],
+        "sector": ["전기전자"] * n_big + ["화학"] * n_small,
+        "market": "KOSPI",
+    })
+    results = pd.DataFrame({
+        "corp_code": codes,
+        "ROE": list(np.linspace(0, 19, n_big)) + [100.0] * n_small,
+        "DebtRatio": list(np.linspace(50, 240, n_big)) + [10.0] * n_small,
+    })
+    return results, index
+
+
+def test_build_industry_index_marks_unclassified():
+    corp_list = pd.DataFrame({"corp_code": ["A", "B", "C"], "stock_code": ["000001", "000002", None]})
+    classes = pd.DataFrame({"stock_code": ["000001"], "sector": ["화학"], "market": ["KOSPI"]})
+    index = build_industry_index(classes, corp_list)
+    assert dict(zip(index["corp_code"], index["sector"])) == {"A": "화학", "B": UNCLASSIFIED}
+
+
+def test_load_industry_index_caches_by_date(tmp_path):
+    calls = []
+
+    def fetch(date):
+        calls.append(date)
+        return pd.DataFrame({"stock_code": ["000001"], "sector": ["화학"], "market": ["KOSPI"]})
+
+    corp_list = lambda: pd.DataFrame({"corp_code": ["A"], "stock_code": ["000001"]})
+    first = load_industry_index("20240102", fetch, corp_list, root=str(tmp_path))
+    second = load_industry_index("20240102", fetch, corp_list, root=str(tmp_path))
+    assert calls == ["20240102"]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_small_sector_falls_back_to_market():
+    results, index = _universe()
+    stats = group_stats(results, index, min_count=10)
+    sectors = set(stats.index.get_level_values("sector"))
+    assert sectors == {"전기전자", MARKET}
+    assert stats.loc[(MARKET, "ROE"), "count"] == 23
+
+    table = SectorStats(stats, index)
+    # 표본이 적은 화학 업종은 시장 전체 분포로 비교
+    assert table.relative({"ROE": 5.0}, "화학") == table.relative({"ROE": 5.0}, MARKET)
+
+
+def test_percentile_direction_and_score_frame_matches_score():
+    results, index = _universe()
+    table = SectorStats(group_stats(results, index, min_count=10), index)
+
+    rel = table.relative({"ROE": 19.0, "DebtRatio": 50.0}, "전기전자")
+    assert rel["ROE"]["pct"] == pytest.approx(100.0)
+    assert rel["DebtRatio"]["pct"] == pytest.approx(0.0)
+    # 부채비율은 낮을수록 좋으므로 점수는 100 - 백분위
+    score, detail = table.score({"ROE": 19.0, "DebtRatio": 50.0}, "전기전자")
+    assert detail == {"ROE": pytest.approx(100.0), "DebtRatio": pytest.approx(100.0)}
+    assert score == pytest.approx(100.0)
+
+    frame = table.score_frame(results)
+    for i, row in results.iterrows():
+        sector = table.sector_of(row["corp_code"])
+        expected, _ = table.score({"ROE": row["ROE"], "DebtRatio": row["DebtRatio"]}, sector)
+        assert frame.loc[i, "sector"] == sector
+        assert frame.loc[i, "sector_score"] == pytest.approx(expected)
+
+
+def test_update_sectors_writes_only_sector_columns():
+    results, index = _universe()
+    store = ResultStore(":memory:")
+    store.upsert_many([
+        make_row(r.corp_code, 2023, {"ROE": r.ROE, "DebtRatio": r.DebtRatio}, 50.0, "", {}, as_of="2024-06-01")
+        for r in results.itertuples()
+    ])
+    rows = store.latest_rows(2023)
+    table = SectorStats(group_stats(rows, index, min_count=10), index)
+    assert store.update_sectors(rows[list(KEY_COLUMNS)].join(table.score_frame(rows))) == len(rows)
+
+    updated = store.latest_rows(2023).set_index("corp_code")
+    assert updated.loc["10000000", "sector"] == "전기전자"
+    assert updated["sector_score"].notna().all()
+    assert (updated["score"] == 50.0).all()
+
+
+def test_partial_run_stats_are_not_reused_for_full_universe(tmp_path):
+    results, index = _universe()
+    root = str(tmp_path)
+    pd.DataFrame(index).to_parquet(tmp_path / "industry_20240601.parquet")
+    rows = [
+        make_row(r.corp_code, 2023, {"ROE": r.ROE, "DebtRatio": r.DebtRatio}, 50.0, "", {}, as_of="2024-06-01")
+        for r in results.itertuples()
+    ]
+    store = ResultStore(":memory:")
+    store.upsert_many(rows[:3])   # 같은 날 --limit 3 실행
+    partial = sector_stats(store, 2023, index, "20240601", root=root)
+    assert partial.stats.loc[(MARKET, "ROE"), "count"] == 3
+
+    store.upsert_many(rows[3:])   # 같은 날 전체 실행
+    full = sector_stats(store, 2023, index, "20240601", root=root)
+    assert full.stats.loc[(MARKET, "ROE"), "count"] == len(rows)
+
+    # 업종 점수 갱신만으로는 다시 만들지 않음
+    latest = store.latest_rows(2023)
+    store.update_sectors(latest[list(KEY_COLUMNS)].join(full.score_frame(latest)))
+    again = sector_stats(store, 2023, index, "20240601", root=root)
+    pd.testing.assert_frame_equal(again.stats, full.stats, check_names=False)
+    assert len(list(tmp_path.glob("stats_*.parquet"))) == 2
@@ -0,0 +1,62 @@
+# test_snapshot.py
+
+import pandas as pd
+from metrics import calculate_metrics
+from snapshot import FinancialSnapshot
+
+
+def _frame(sj_div, rows):
+    return pd.DataFrame([
+        {"corp_code": "00126380", "bsns_year": "2023", "reprt_code": "11011", "sj_div": sj_div,
+         "account_id": aid, "account_nm": nm, "thstrm_amount": cur, "frmtrm_amount": prev}
+        for aid, nm, cur, prev in rows
+    ])
+
+
+def _dart():
+    return {
+        "bs": _frame("BS", [
+            ("ifrs-full_Assets", "자산총계", "1000", "900"),
+            ("ifrs-full_Equity", "자본총계", "600", "550"),
+            ("ifrs-full_Liabilities", "부채총계", "400", "350"),
+            ("ifrs-full_CurrentAssets", "유동자산", "300", "280"),
+            ("ifrs-full_CurrentLiabilities", "유동부채", "200", "190"),
+        ]),
+        "is": _frame("IS", [
+            ("ifrs-full_Revenue", "매출액", "500", "400"),
+            ("dart_OperatingIncomeLoss", "영업이익(손실)", "60", "50"),
+            ("ifrs-full_ProfitLoss", "당기순이익", "90", "80"),
+        ]),
+        "cf": _frame("CF", [
+            ("x", "영업활동현금흐름", "120", "100"),
+            ("y", "투자활동현금흐름", "-70", "-60"),
+        ]),
+    }
+
+
+def test_snapshot_extracts_all_periods():
+    snap = FinancialSnapshot.from_statements(_dart())
+    assert (snap.corp_code, snap.year) == ("00126380", 2023)
+    assert snap.get("revenue") == 500.0
+    assert snap.get("revenue", "frmtrm_amount") == 400.0
+    assert snap.get("revenue", "bfefrmtrm_amount") is None
+    # is_prev 가 없으면 전기 금액으로 성장률 계산
+    assert snap.get_prev("net_income") == 80.0
+    assert snap.raw is None and snap.nbytes() < 1024
+
+
+def test_metrics_match_dataframe_path():
+    price = pd.DataFrame({"종가": [100.0, 110.0, 105.0, 120.0]})
+    pkrx = {"PER": 8.0, "BPS": 60.0}
+    dart = _dart()
+    is_prev = _frame("IS", [("ifrs-full_Revenue", "매출액", "400", ""), ("ifrs-full_ProfitLoss", "당기순이익", "80", "")])
+
+    from_frames = calculate_metrics({**dart, "is_prev": is_prev}, price, pkrx)
+    from_snapshot = calculate_metrics(FinancialSnapshot.from_statements(dart, is_prev), price, pkrx)
+    assert from_frames == from_snapshot
+
+
+if __name__ == "__main__":
+    test_snapshot_extracts_all_periods()
+    test_metrics_match_dataframe_path()
+    print("▶ snapshot OK")
@@ -0,0 +1,90 @@
+# test_statement_store.py
+
+import pandas as pd
+from metrics import ALIASES, _lookup
+from statement_store import StatementStore
+
+
+def _finstate(corp_code: str, revenue: str) -> pd.DataFrame:
+    return pd.DataFrame({
+        "corp_code":     [corp_code] * 3,
+        "bsns_year":     ["2023"] * 3,
+        "sj_div":        ["BS", "IS", "IS"],
+        "account_id":    ["ifrs-full_Assets", "ifrs-full_Revenue", "-표준계정코드 미사용-"],
+        "account_nm":    ["자산총계", "매출액", "기타수익"],
+        "thstrm_amount": ["1,000", revenue, ""],
+    })
+
+
+def test_roundtrip_uses_shared_categories_and_numeric_amounts(tmp_path):
+    store = StatementStore(str(tmp_path))
+    store.put("00126380", 2023, _finstate("00126380", "500"))
+    store.put("00164779", 2023, _finstate("00164779", "700"))
+
+    # 새 인스턴스(다른 프로세스 가정)에서도 같은 사전으로 복원
+    reader = StatementStore(str(tmp_path))
+    a, b = reader.get("00126380", 2023), reader.get("00164779", 2023)
+    assert a["account_nm"].dtype == "category"
+    assert a["account_nm"].cat.categories.equals(b["account_nm"].cat.categories)
+    assert str(a["thstrm_amount"].dtype) == "Int64"
+    assert a["thstrm_amount"].isna().sum() == 1
+
+    # 같은 카테고리를 공유하므로 합쳐도 category 유지
+    both = pd.concat([a, b], ignore_index=True)
+    assert both["account_nm"].dtype == "category"
+
+    # _lookup 은 숫자 금액을 그대로 사용
+    is_ = b[b["sj_div"] == "IS"].reset_index(drop=True)
+    assert _lookup(is_, ALIASES["revenue"]) == 700
+
+
+def test_concurrent_writers_and_crash_keep_codes_consistent(tmp_path):
+    # 같은 사전을 읽어 둔 두 작성자(스케줄러·배치 가정)가 각자 새 계정명을 추가
+    first, second = StatementStore(str(tmp_path)), StatementStore(str(tmp_path))
+    stale_reader = StatementStore(str(tmp_path))
+    crashed = StatementStore(str(tmp_path))
+    first.put_part("00126380", 2023, "11011", "IS", _finstate("00126380", "500").iloc[1:])
+    second.put_part("00164779", 2023, "11011", "IS", _finstate("00164779", "700").iloc[1:].assign(account_nm=["매출", "잡이익"]))
+    crashed.put_part("00999999", 2023, "11011", "IS", _finstate("00999999", "900").iloc[1:].assign(account_nm=["영업수익", "-"]))
+    second.flush()
+    first.flush()
+    # flush() 없이 종료(적재 중단)한 작성자는 파일도 사전 값도 남기지 않음
+    assert not StatementStore(str(tmp_path)).has("00999999", 2023)
+    for reader in (StatementStore(str(tmp_path)), stale_reader):
+        a, b = reader.get("00126380", 2023), reader.get("00164779", 2023)
+        assert list(a["account_nm"].astype(str)) == ["매출액", "기타수익"]
+        assert list(b["account_nm"].astype(str)) == ["매출", "잡이익"]
+        assert "영업수익" not in reader.dictionary.values["account_nm"]
+
+    first.register_codes({"005930": "00126380"})
+    second.register_codes({"000660": "00164779"})
+    assert StatementStore(str(tmp_path)).codes == {"005930": "00126380", "000660": "00164779"}
+
+
+def test_flush_writes_dictionary_once(tmp_path, monkeypatch):
+    import statement_store
+    writes = []
+    original = statement_store._write_json
+    monkeypatch.setattr(statement_store, "_write_json", lambda path, payload: (writes.append(path), original(path, payload)))
+
+    store = StatementStore(str(tmp_path))
+    for i, corp_code in enumerate(["00000001", "00000002", "00000003"]):
+        frame = _finstate(corp_code, str(100 + i)).assign(account_nm=["자산총계", f"매출{i}", "기타수익"])
+        for sj_div, part in frame.groupby("sj_div"):
+            store.put_part(corp_code, 2023, "11011", sj_div, part)
+    assert writes == [] and not store.has("00000001", 2023)   # flush 전에는 아무것도 쓰지 않음
+    store.flush()
+    assert writes == [str(tmp_path / "dictionary.json")]
+    got = StatementStore(str(tmp_path)).get("00000003", 2023)
+    assert sorted(got["account_nm"].astype(str)) == ["기타수익", "매출2", "자산총계"]
+
+    # 대기 행이 flush_rows 를 넘으면 put_part 안에서 바로 씀
+    small = StatementStore(str(tmp_path / "small"), flush_rows=2)
+    small.put_part("00000001", 2023, "11011", "IS", _finstate("00000001", "100").iloc[1:])
+    assert small.has("00000001", 2023)
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as d:
+        test_roundtrip_uses_shared_categories_and_numeric_amounts(d)
+    print("▶ statement_store OK")
@@ -0,0 +1,72 @@
+# test_store.py
+
+from store import ResultStore, make_row, config_hash
+
+
+def test_upsert_overwrites_same_key():
+    store = ResultStore(":memory:")
+    store.upsert(make_row("00126380", 2023, {"ROE": 10.0}, 60.0, "보통", {"ROE": 66.7}, as_of="2024-01-02"))
+    store.upsert(make_row("00126380", 2023, {"ROE": 12.0}, 70.0, "우수", {"ROE": 80.0}, as_of="2024-01-02"))
+    assert store.count() == 1
+
+    row = store.select().iloc[0]
+    assert row["ROE"] == 12.0
+    assert row["ROE_score"] == 80.0
+    assert row["config_hash"] == config_hash()
+
+
+def test_history_orders_by_year_and_as_of():
+    store = ResultStore(":memory:")
+    store.upsert_many([
+        make_row("00126380", 2023, {}, 70.0, "", {}, as_of="2024-06-01"),
+        make_row("00126380", 2022, {}, 50.0, "", {}, as_of="2023-06-01"),
+        make_row("00164779", 2023, {}, 40.0, "", {}, as_of="2024-06-01"),
+    ])
+    hist = store.history("00126380")
+    assert list(hist["year"]) == [2022, 2023]
+    assert store.latest_as_of(2023) == "2024-06-01"
+
+
+def test_latest_rows_per_company():
+    store = ResultStore(":memory:")
+    store.upsert_many([
+        make_row("00126380", 2023, {}, 70.0, "", {}, as_of="2024-06-01"),
+        make_row("00126380", 2023, {}, 72.0, "", {}, as_of="2024-06-03"),
+        make_row("00164779", 2023, {}, 40.0, "", {}, as_of="2024-06-01"),
+        make_row("00164779", 2022, {}, 45.0, "", {}, as_of="2024-06-05"),
+    ])
+    latest = store.latest_rows(2023)
+    assert list(latest["corp_code"]) == ["00126380", "00164779"]
+    assert list(latest["score"]) == [72.0, 40.0]
+
+
+
+def test_migrates_results_without_reprt_code(tmp_path):
+    import sqlite3
+    path = str(tmp_path / "results.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE results (corp_code TEXT NOT NULL, year INTEGER NOT NULL, as_of TEXT NOT NULL, "
+        "config_hash TEXT NOT NULL, stock_code TEXT, corp_name TEXT, score REAL, comment TEXT, "
+        "\"ROE\" REAL, \"Retired\" REAL, PRIMARY KEY (corp_code, year, as_of, config_hash))"
+    )
+    conn.execute(
+        "INSERT INTO results (corp_code, year, as_of, config_hash, score, \"ROE\", \"Retired\") "
+        "VALUES ('00126380', 2023, '2024-06-01', ?, 70.0, 10.0, 1.5)", (config_hash(),),
+    )
+    conn.commit()
+    conn.close()
+
+    with ResultStore(path) as store:
+        row = store.latest_rows(2023).iloc[0]
+        assert (row["reprt_code"], row["ROE"], row["Retired"]) == ("11011", 10.0, 1.5)   # 기존 행은 사업보고서
+        store.upsert(make_row("00126380", 2023, {"ROE": 11.0}, 60.0, "", {}, as_of="2024-06-01", reprt_code="11014"))
+        assert store.count() == 2
+        assert store.latest_rows(2023)["score"].tolist() == [70.0]
+
+
+if __name__ == "__main__":
+    test_upsert_overwrites_same_key()
+    test_history_orders_by_year_and_as_of()
+    test_latest_rows_per_company()
+    print("▶ store OK")
@@ -0,0 +1,73 @@
+# test_synthetic.py
+
+import pandas as pd
+from metrics import ALIASES, SOURCES, _match_row, normalize
+from synthetic import OHLCV_COLUMNS, SyntheticUniverse
+
+
+def _parts(df):
+    return {sj.lower(): df[df["sj_div"] == sj].reset_index(drop=True) for sj in ("BS", "IS", "CF")}
+
+
+def test_same_seed_same_data():
+    a, b, c = SyntheticUniverse(5, seed=3), SyntheticUniverse(5, seed=3), SyntheticUniverse(5, seed=4)
+    pd.testing.assert_frame_equal(a.finstate_all("000002", 2023), b.finstate_all("000002", 2023))
+    pd.testing.assert_frame_equal(
+        a.get_market_ohlcv_by_date("20220101", "20231231", "000002"),
+        b.get_market_ohlcv_by_date("20220101", "20231231", "000002"),
+    )
+    assert not a.finstate_all("000002", 2023).equals(c.finstate_all("000002", 2023))
+    # 조회 구간과 무관하게 같은 날짜는 같은 값
+    short = a.get_market_ohlcv_by_date("20230601", "20230630", "000002")
+    long = a.get_market_ohlcv_by_date("20220101", "20231231", "000002").loc[short.index]
+    pd.testing.assert_frame_equal(short, long)
+
+
+def test_statements_exercise_every_alias_path():
+    universe = SyntheticUniverse(24, seed=0, missing_rate=0)
+    paths = {name: set() for name in ALIASES}
+    for code in universe.stock_codes:
+        parts = _parts(universe.finstate_all(code, 2023))
+        for name, aliases in ALIASES.items():
+            row = _match_row(parts[SOURCES[name]], aliases)
+            assert row is not None, (code, name)
+            nm = normalize(row["account_nm"])
+            if row["account_id"] in aliases.get("ids", []):
+                paths[name].add(("id", row["account_id"]))
+            elif nm in [normalize(x) for x in aliases["names"]]:
+                paths[name].add(("exact", nm))
+            else:
+                paths[name].add(("contains", nm))
+
+    for name, aliases in ALIASES.items():
+        kinds = {kind for kind, _ in paths[name]}
+        assert "contains" in kinds and "exact" in kinds, name
+        assert {("id", i) for i in aliases.get("ids", [])} <= paths[name], name
+        # 한글·영문 표기 각각 하나 이상 exact 매칭
+        exact = {v for kind, v in paths[name] if kind == "exact"}
+        assert any(v.isascii() for v in exact) and any(not v.isascii() for v in exact), name
+
+
+def test_periods_and_market_shapes_line_up():
+    universe = SyntheticUniverse(3, seed=1, missing_rate=0)
+    cur, prev = universe.finstate_all("000001", 2023), universe.finstate_all("000001", 2022)
+    assert list(cur["frmtrm_amount"]) == list(prev["thstrm_amount"])
+
+    ohlcv = universe.get_market_ohlcv_by_date("20220101", "20231231", "000001")
+    assert list(ohlcv.columns) == OHLCV_COLUMNS and ohlcv.index.is_monotonic_increasing
+    # 연도 경계에서도 하루 등락이 가격 경로와 일치
+    change = ohlcv["종가"].pct_change().iloc[1:] * 100
+    assert (change.round(2) - ohlcv["등락률"].iloc[1:]).abs().max() < 0.02
+
+    fund = universe.get_market_fundamental_by_date("20231228", "20231228", "000001")
+    assert list(fund.columns) == ["BPS", "PER", "PBR", "EPS", "DIV", "DPS"]
+    cap = universe.get_market_cap_by_date("20231228", "20231228", "000001")
+    assert cap["시가총액"].iat[0] == ohlcv.loc["2023-12-28", "종가"] * cap["상장주식수"].iat[0]
+
+
+def test_missing_reports_answer_like_dart():
+    universe = SyntheticUniverse(2, seed=0, missing_rate=1.0)
+    assert universe.finstate_all("000001", 2023).empty
+    corp_code = universe.find_corp_code("000001")
+    payload = universe.get("url", params={"corp_code": corp_code, "bsns_year": 2023}).json()
+    assert payload["status"] == "013"
@@ -0,0 +1,52 @@
+# test_ttm.py
+
+import datetime
+from snapshot import FinancialSnapshot
+from ttm import build_ttm, latest_report, previous_report
+
+
+def _snap(year, reprt_code, **accounts):
+    snap = FinancialSnapshot.blank("00126380", year, reprt_code)
+    for account, periods in accounts.items():
+        for period, value in periods.items():
+            snap.set(account, value, period)
+    return snap
+
+
+def test_quarter_ttm_rolls_annual_forward():
+    # 2023 연간 매출 400 (2022 연간 300), 2024 반기 누적 250 (2023 반기 누적 180, 2022 반기 누적 120)
+    annual_prev = _snap(2023, "11011", revenue={"thstrm_amount": 400, "frmtrm_amount": 300})
+    current = _snap(2024, "11012",
+                    revenue={"thstrm_amount": 130, "thstrm_add_amount": 250, "frmtrm_add_amount": 180},
+                    total_assets={"thstrm_amount": 1000})
+    current_prev = _snap(2023, "11012", revenue={"thstrm_add_amount": 180, "frmtrm_add_amount": 120})
+
+    ttm = build_ttm("11012", current, annual_prev, current_prev)
+    assert ttm.get("revenue") == 400 + 250 - 180
+    assert ttm.get_prev("revenue") == 300 + 180 - 120
+    assert ttm.get("total_assets") == 1000
+    assert (ttm.year, ttm.reprt_code) == (2024, "11012")
+
+
+def test_cash_flow_uses_cumulative_thstrm():
+    annual_prev = _snap(2023, "11011", op_cf={"thstrm_amount": 100})
+    current = _snap(2024, "11013", op_cf={"thstrm_amount": 30, "frmtrm_amount": 20})
+    ttm = build_ttm("11013", current, annual_prev)
+    assert ttm.get("op_cf") == 110
+    assert ttm.get_prev("revenue") is None
+
+
+def test_annual_report_is_its_own_ttm():
+    annual_prev = _snap(2023, "11011", net_income={"thstrm_amount": 80})
+    current = _snap(2024, "11011", net_income={"thstrm_amount": 90})
+    ttm = build_ttm("11011", current, annual_prev)
+    assert (ttm.get("net_income"), ttm.get_prev("net_income")) == (90, 80)
+
+
+def test_report_calendar():
+    assert previous_report(2024, "11013") == (2023, "11011")
+    assert previous_report(2024, "11014") == (2024, "11012")
+    assert latest_report(datetime.date(2024, 4, 10)) == (2023, "11011")
+    assert latest_report(datetime.date(2024, 5, 20)) == (2024, "11013")
+    assert latest_report(datetime.date(2024, 12, 1)) == (2024, "11014")
+    assert latest_report(datetime.date(2024, 2, 1)) == (2023, "11014")
@@ -0,0 +1,98 @@
+# ttm.py
+
+import datetime
+from typing import Optional, Tuple
+from metrics import SOURCES
+from snapshot import ACCOUNTS, FinancialSnapshot
+from statement_store import ANNUAL
+
+# reprt_code → 회계연도 내 분기 (사업보고서 = 4분기 누적)
+QUARTERS = {
+    "11013": 1,   # 1분기보고서
+    "11012": 2,   # 반기보고서
+    "11014": 3,   # 3분기보고서
+    "11011": 4,   # 사업보고서
+}
+
+# 보고서별 제출 기한 (회계연도 기준 연도 오프셋, 월, 일)
+FILING_DEADLINES = {
+    "11013": (0, 5, 15),
+    "11012": (0, 8, 14),
+    "11014": (0, 11, 14),
+    "11011": (1, 3, 31),
+}
+
+Report = Tuple[int, str]   # (year, reprt_code)
+
+
+def previous_report(year: int, reprt_code: str) -> Report:
+    """직전 분기 보고서 키 (1분기 → 전년도 사업보고서)."""
+    quarter = QUARTERS[reprt_code]
+    if quarter == 1:
+        return year - 1, ANNUAL
+    return year, next(code for code, q in QUARTERS.items() if q == quarter - 1)
+
+
+def latest_report(today: Optional[datetime.date] = None) -> Report:
+    """today 기준 제출 기한이 지난 가장 최근 정기보고서 키."""
+    today = today or datetime.date.today()
+    year, reprt_code = today.year, "11014"
+    while True:
+        offset, month, day = FILING_DEADLINES[reprt_code]
+        if datetime.date(year + offset, month, day) <= today:
+            return year, reprt_code
+        year, reprt_code = previous_report(year, reprt_code)
+
+
+def cumulative(snapshot: FinancialSnapshot, account: str) -> Optional[float]:
+    """당기 누적 금액. 손익계산서는 thstrm_add_amount, 현금흐름표·사업보고서는 thstrm_amount 가 누적값."""
+    value = snapshot.get(account, "thstrm_add_amount")
+    return snapshot.get(account) if value is None else value
+
+
+def prior_cumulative(snapshot: FinancialSnapshot, account: str) -> Optional[float]:
+    """전년 동기 누적 금액."""
+    value = snapshot.get(account, "frmtrm_add_amount")
+    return snapshot.get(account, "frmtrm_amount") if value is None else value
+
+
+def _roll(annual: Optional[float], cum: Optional[float], prior_cum: Optional[float]) -> Optional[float]:
+    """TTM = 직전 연간 + 당기 누적 - 전년 동기 누적."""
+    if annual is None or cum is None or prior_cum is None:
+        return None
+    return annual + cum - prior_cum
+
+
+def build_ttm(
+    reprt_code: str,
+    current: FinancialSnapshot,
+    annual_prev: FinancialSnapshot,
+    current_prev: Optional[FinancialSnapshot] = None,
+) -> FinancialSnapshot:
+    """
+    최근 4개 분기 합산(TTM) 스냅샷을 만듭니다.
+    - current:      (Y, q) 보고서
+    - annual_prev:  (Y-1) 사업보고서
+    - current_prev: (Y-1, q) 보고서 (전년 TTM → 성장 지표용, 없으면 성장 지표 None)
+    손익·현금흐름 계정은 thstrm_amount 에 TTM 을, prev 에 전년 TTM 을 담고,
+    재무상태표 계정은 (Y, q) 시점 잔액을 그대로 씁니다.
+    """
+    quarter = QUARTERS[reprt_code]
+    out = FinancialSnapshot.blank(current.corp_code or annual_prev.corp_code, current.year, reprt_code)
+    for account in ACCOUNTS:
+        if SOURCES[account] == "bs":
+            out.set(account, current.get(account))
+            continue
+        if quarter == 4:
+            # 사업보고서 자체가 TTM
+            out.set(account, current.get(account))
+            out.set_prev(account, annual_prev.get(account))
+            continue
+        out.set(account, _roll(annual_prev.get(account), cumulative(current, account), prior_cumulative(current, account)))
+        if current_prev is not None:
+            out.set_prev(account, _roll(
+                annual_prev.get(account, "frmtrm_amount"),
+                prior_cumulative(current, account),
+                prior_cumulative(current_prev, account),
+            ))
+    return out
@@ -1,12 +1,10 @@
 # utils.py
 
-import os
 import logging
-from OpenDartReader.dart import OpenDartReader
-from config import DART_API_KEY
+from http_session import dart_reader
 
 logger = logging.getLogger(__name__)
-_dart = OpenDartReader(os.getenv("DART_API_KEY", DART_API_KEY))
+_dart = dart_reader()
 
 
 def find_corp_info(query: str) -> dict: